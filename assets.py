@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import time
+import pygame
+from constants import ASSET_CACHE_DIR
+
+__all__ = ["display_ready", "to_display_format", "blit_cost", "AssetCache"]
+
+_FORMAT_VERSION = 1  # Bump to orphan cache files written by older code
+_BLIT_SAMPLES = 5  # Blits timed per asset; the fastest is reported
+
+
+def display_ready():
+    """True once a display mode is set, so surfaces can be converted"""
+    return pygame.display.get_init() and pygame.display.get_surface() is not None
+
+
+def to_display_format(surface, alpha=False):
+    """surface converted to the display's pixel format.
+
+    Blitting between matching formats skips per-pixel conversion. Without a
+    display (headless runs) the surface is returned unchanged.
+    """
+    if not display_ready():
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+class AssetCache:
+    """Generated surfaces, converted once and persisted on disk.
+
+    Each asset has a name and a params value that fully determines its
+    pixels (seed, resolution, font size, ...). The first run builds it and
+    saves a PNG; later runs load the PNG instead. params=None means the
+    asset is not reproducible and is only built, never saved. With
+    measure=True each load also times a few blits of the result.
+    """
+
+    def __init__(self, directory=ASSET_CACHE_DIR, persist=True, measure=False):
+        self.directory = directory
+        self.persist = persist
+        self.measure = measure
+        self.assets = {}  # label -> stats for the last load of that asset
+
+    def _path(self, name, params, suffix):
+        # pygame's version is part of the key: font and drawing output may change
+        key = json.dumps([_FORMAT_VERSION, pygame.version.ver, name, params], sort_keys=True)
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"{name}-{digest}{suffix}")
+
+    def _load(self, path):
+        if not os.path.exists(path):
+            return None
+        try:
+            return pygame.image.load(path)
+        except (pygame.error, OSError):
+            return None  # Unreadable cache file; rebuild and overwrite it
+
+    def _save(self, surface, path):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            pygame.image.save(surface, path)
+        except (pygame.error, OSError):
+            pass  # The cache is an optimisation; a read-only disk is fine
+
+    def surface(self, name, params, build, alpha=False):
+        """The asset's surface in display format, from disk or build()"""
+        start = time.perf_counter()
+        path = self._path(name, params, ".png") if self.persist and params is not None else None
+        surface = self._load(path) if path else None
+        source = "disk"
+        if surface is None:
+            surface = build()
+            source = "built"
+            if path:
+                self._save(surface, path)
+        surface = to_display_format(surface, alpha)
+        self._note(self._label(name, params), [surface], source, time.perf_counter() - start)
+        return surface
+
+    def atlas(self, name, params, build, alpha=True):
+        """Like surface() for a dict of str -> surface (e.g. glyphs). On
+        disk the surfaces are packed into one strip with a JSON index."""
+        start = time.perf_counter()
+        persist = self.persist and params is not None
+        path = self._path(name, params, ".png") if persist else None
+        index_path = self._path(name, params, ".json") if persist else None
+        surfaces = self._load_atlas(path, index_path) if persist else None
+        source = "disk"
+        if surfaces is None:
+            surfaces = build()
+            source = "built"
+            if persist:
+                self._save_atlas(surfaces, path, index_path)
+        surfaces = {key: to_display_format(s, alpha) for key, s in surfaces.items()}
+        self._note(self._label(name, params), list(surfaces.values()), source, time.perf_counter() - start)
+        return surfaces
+
+    def _load_atlas(self, path, index_path):
+        strip = self._load(path)
+        if strip is None or not os.path.exists(index_path):
+            return None
+        with open(index_path) as f:
+            index = json.load(f)
+        return {key: strip.subsurface(pygame.Rect(rect)).copy() for key, rect in index.items()}
+
+    def _save_atlas(self, surfaces, path, index_path):
+        width = sum(s.get_width() for s in surfaces.values())
+        height = max((s.get_height() for s in surfaces.values()), default=0)
+        if not width or not height:
+            return
+        strip = pygame.Surface((width, height), pygame.SRCALPHA)
+        index = {}
+        x = 0
+        for key, s in surfaces.items():
+            strip.blit(s, (x, 0))
+            index[key] = [x, 0, s.get_width(), s.get_height()]
+            x += s.get_width()
+        self._save(strip, path)
+        try:
+            with open(index_path, "w") as f:
+                json.dump(index, f)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _label(name, params):
+        if params is None:
+            return name
+        return name + ":" + ",".join(f"{key}={value}" for key, value in sorted(params.items()))
+
+    def _note(self, label, surfaces, source, seconds):
+        """Record size, origin, load time and, if measuring, blit cost"""
+        stats = {
+            "source": source,
+            "surfaces": len(surfaces),
+            "bytes": sum(s.get_width() * s.get_height() * s.get_bytesize() for s in surfaces),
+            "display_format": display_ready(),
+            "load_ms": round(seconds * 1000, 3),
+        }
+        if self.measure:
+            stats["blit_us"] = round(sum(blit_cost(s) for s in surfaces) * 1e6, 2)
+        self.assets[label] = stats
+
+    def stats(self):
+        return dict(self.assets)
+
+
+def blit_cost(surface):
+    """Seconds to blit surface onto a display-format target of its size"""
+    target = pygame.Surface(surface.get_size())
+    target = to_display_format(target)
+    best = float("inf")
+    for _ in range(_BLIT_SAMPLES):
+        start = time.perf_counter()
+        target.blit(surface, (0, 0))
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -1,36 +1,99 @@
 import pygame
-import random
 import math
+import random
+from functools import lru_cache
 from circleshape import CircleShape
-from constants import LINE_WIDTH, ASTEROID_MIN_RADIUS
-from logger import log_event
+from constants import (LINE_WIDTH, ASTEROID_MIN_RADIUS, ASTEROID_SPLIT_ANGLE_MIN,
+                       ASTEROID_SPLIT_ANGLE_MAX, ASTEROID_SPLIT_SPEEDUP, ASTEROID_OUTLINE_TEMPLATES)
+from logger import enabled, write_event
+from asteroid_store import AsteroidStore
+from pool import Pooled
+from ecs import StoredEntity, vector_column, scalar_column
+from rng import stream
+from sprite_cache import RotationCache
+
+_random = stream("asteroids")
+
+
+def _lumpy_template(index):
+    """Irregular polygon around (0, 0) with unit base radius. Seeded by the
+    template index alone, so every process builds the same outlines."""
+    rng = random.Random(index)
+    # More vertices for larger asteroids
+    num_vertices = rng.randint(7, 12)
+    points = []
+    for i in range(num_vertices):
+        # Angle for this vertex
+        angle = (2 * math.pi * i) / num_vertices
+        # Random variation in radius (70% to 100% of base radius)
+        vertex_radius = rng.uniform(0.7, 1.0)
+        points.append((math.cos(angle) * vertex_radius, math.sin(angle) * vertex_radius))
+    return tuple(points)
+
+
+# Asteroids share a small set of outlines, so the rotation cache holds a
+# bounded number of frames that every asteroid of a size reuses
+OUTLINE_TEMPLATES = tuple(_lumpy_template(i) for i in range(ASTEROID_OUTLINE_TEMPLATES))
+
+
+@lru_cache(maxsize=256)
+def outline_vertices(outline, radius):
+    """Vertices of template outline scaled to radius; shared, do not modify"""
+    return [pygame.Vector2(x * radius, y * radius) for x, y in OUTLINE_TEMPLATES[outline]]
+
 
 # Base class for asteroids
-class Asteroid(CircleShape):
+class Asteroid(StoredEntity, Pooled, CircleShape):
+    # Shared motion storage; main() swaps in one registered with `updatable`
+    store = AsteroidStore()
+    # Pre-rendered outlines shared by every asteroid
+    sprite_cache = RotationCache()
+    # Draw every nth outline vertex; raised by the frame governor under load
+    vertex_step = 1
+
     def __init__(self, x, y, radius):
+        self.index = self.store.allocate(self)
         super().__init__(x, y, radius)
+        self.previous_position = (x, y)
         self.color = (255, 0, 0)  # Red color for asteroids
-        self.vertices = self._generate_lumpy_shape()
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(-50, 50)  # Degrees per second
-
-    def _generate_lumpy_shape(self):
-        """Generate irregular polygon vertices based on radius"""
-        vertices = []
-        # More vertices for larger asteroids
-        num_vertices = random.randint(7, 12)
-
-        for i in range(num_vertices):
-            # Angle for this vertex
-            angle = (2 * math.pi * i) / num_vertices
-            # Random variation in radius (70% to 100% of base radius)
-            vertex_radius = self.radius * random.uniform(0.7, 1.0)
-            # Calculate vertex position relative to center (0, 0)
-            x = math.cos(angle) * vertex_radius
-            y = math.sin(angle) * vertex_radius
-            vertices.append(pygame.Vector2(x, y))
-
-        return vertices
+        self.outline = _random.randrange(len(OUTLINE_TEMPLATES))
+        self.rotation = _random.uniform(0, 360)
+        self.rotation_speed = _random.uniform(-50, 50)  # Degrees per second
+
+    def reset(self, x, y, radius):
+        """Re-initialise a pooled asteroid, keeping its outline template"""
+        self._rejoin()
+        self.position = (x, y)
+        self.previous_position = (x, y)
+        self.velocity = (0, 0)
+        self.radius = radius
+        self.rotation = _random.uniform(0, 360)
+        self.rotation_speed = _random.uniform(-50, 50)
+
+    @classmethod
+    def restored(cls, outline):
+        """Handle for a saved asteroid: takes the given outline template and
+        a zeroed store row for the caller to fill, without drawing on the RNG"""
+        asteroid = cls.__new__(cls)
+        pygame.sprite.Sprite.__init__(asteroid, *getattr(cls, "containers", ()))
+        asteroid.index = asteroid.store.allocate(asteroid)
+        asteroid.color = (255, 0, 0)
+        asteroid.outline = outline
+        return asteroid
+
+    # Motion state lives in the store; these properties keep the
+    # CircleShape interface so collisions, scoring and drawing are unchanged
+    position = vector_column("positions")
+    # Where the last move started; equals position until the asteroid first moves
+    previous_position = vector_column("previous_positions")
+    velocity = vector_column("velocities")
+    radius = scalar_column("radii")
+    rotation = scalar_column("rotations")
+    rotation_speed = scalar_column("rotation_speeds")
+
+    @property
+    def vertices(self):
+        return outline_vertices(self.outline, self.radius)
 
     def get_world_vertices(self):
         """Get vertices transformed to world position with rotation"""
@@ -43,25 +106,23 @@ class Asteroid(CircleShape):
         return world_verts
 
     def draw(self, screen):
-        # Draw lumpy polygon
-        world_verts = self.get_world_vertices()
-        points = [(int(v.x), int(v.y)) for v in world_verts]
-        pygame.draw.polygon(screen, "white", points, LINE_WIDTH)
-
-    def update(self, dt):
-        self.position += self.velocity * dt
-        self.rotation += self.rotation_speed * dt
-        self.wrap_position()
-        
+        # Blit the lumpy polygon pre-rendered at the nearest cached rotation
+        step = self.vertex_step
+        self.sprite_cache.blit(screen, self.position, (self.outline, self.radius, step),
+                               self.vertices[::step], self.rotation, "white", LINE_WIDTH)
+
     def split(self):
         if self.radius > ASTEROID_MIN_RADIUS:
-            log_event("asteroid_split", position=(self.position.x, self.position.y), radius=self.radius)
+            if enabled("asteroid_split"):
+                write_event("asteroid_split", position=(self.position.x, self.position.y), radius=self.radius)
             new_radius = self.radius / 2
-            offset = pygame.Vector2(random.uniform(-new_radius, new_radius), random.uniform(-new_radius, new_radius))
-            asteroid1 = Asteroid(self.position.x + offset.x, self.position.y + offset.y, new_radius)
-            asteroid1.velocity = self.velocity.rotate(random.uniform(20, 50)) * 1.2
-            asteroid2 = Asteroid(self.position.x - offset.x, self.position.y - offset.y, new_radius)
-            asteroid2.velocity = self.velocity.rotate(random.uniform(-50, -20)) * 1.2
+            offset = pygame.Vector2(_random.uniform(-new_radius, new_radius), _random.uniform(-new_radius, new_radius))
+            asteroid1 = Asteroid.acquire(self.position.x + offset.x, self.position.y + offset.y, new_radius)
+            asteroid1.velocity = self.velocity.rotate(
+                _random.uniform(ASTEROID_SPLIT_ANGLE_MIN, ASTEROID_SPLIT_ANGLE_MAX)) * ASTEROID_SPLIT_SPEEDUP
+            asteroid2 = Asteroid.acquire(self.position.x - offset.x, self.position.y - offset.y, new_radius)
+            asteroid2.velocity = self.velocity.rotate(
+                _random.uniform(-ASTEROID_SPLIT_ANGLE_MAX, -ASTEROID_SPLIT_ANGLE_MIN)) * ASTEROID_SPLIT_SPEEDUP
             return [asteroid1, asteroid2]
         else:
             return []
\ No newline at end of file
@@ -0,0 +1,55 @@
+import numpy as np
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, ASTEROID_STORE_CAPACITY
+from ecs import ComponentStore
+
+
+def wrap_positions(positions, radii):
+    """Vectorized CircleShape.wrap_position, in place, for positions
+    (..., 2) and radii (...). Returns the mask of wrapped entries."""
+    x = positions[..., 0]
+    y = positions[..., 1]
+    wrap_x = (x < -radii) | (x > SCREEN_WIDTH + radii)
+    wrap_y = (y < -radii) | (y > SCREEN_HEIGHT + radii)
+    x[:] = np.where(x < -radii, SCREEN_WIDTH + radii, np.where(x > SCREEN_WIDTH + radii, -radii, x))
+    y[:] = np.where(y < -radii, SCREEN_HEIGHT + radii, np.where(y > SCREEN_HEIGHT + radii, -radii, y))
+    return wrap_x | wrap_y
+
+
+class AsteroidStore(ComponentStore):
+    """Struct-of-arrays storage for asteroid motion state.
+
+    Each Asteroid is a thin handle holding a row index into these arrays.
+    The shared store is added to the `updatable` group and integrates and
+    wraps every row in one vectorized step, so asteroids need no
+    per-object update.
+    """
+
+    components = {
+        "positions": ((2,), np.float64),
+        "previous_positions": ((2,), np.float64),  # Start of the last move, for swept collisions
+        "velocities": ((2,), np.float64),
+        "radii": ((), np.float64),
+        "rotations": ((), np.float64),
+        "rotation_speeds": ((), np.float64),
+        "ages": ((), np.float64),  # Seconds since spawning, for population culling
+    }
+
+    def __init__(self, capacity=ASTEROID_STORE_CAPACITY):
+        super().__init__(capacity)
+
+    def update(self, dt):
+        n = self.count
+        if n == 0:
+            return
+        self.previous_positions[:n] = self.positions[:n]
+        self.positions[:n] += self.velocities[:n] * dt
+        self.rotations[:n] += self.rotation_speeds[:n] * dt
+        self.ages[:n] += dt
+        self.wrap()
+
+    def wrap(self):
+        """Wrap every row around the screen edges. A wrapped row's move
+        starts where it reappears, so it is not swept across the screen."""
+        n = self.count
+        wrapped = wrap_positions(self.positions[:n], self.radii[:n])
+        self.previous_positions[:n][wrapped] = self.positions[:n][wrapped]
@@ -1,7 +1,10 @@
 import pygame
-import random
 from asteroid import Asteroid
+from population import AsteroidPopulation
 from constants import *
+from rng import stream
+
+_random = stream("asteroid_field")
 
 
 class AsteroidField(pygame.sprite.Sprite):
@@ -31,21 +34,28 @@ class AsteroidField(pygame.sprite.Sprite):
     def __init__(self):
         pygame.sprite.Sprite.__init__(self, self.containers)
         self.spawn_timer = 0.0
+        self.population = AsteroidPopulation()
 
     def spawn(self, radius, position, velocity):
-        asteroid = Asteroid(position.x, position.y, radius)
+        asteroid = Asteroid.acquire(position.x, position.y, radius)
         asteroid.velocity = velocity
+        self.population.spawned()
 
     def update(self, dt):
+        store = Asteroid.store
+        self.population.cull(store)
         self.spawn_timer += dt
         if self.spawn_timer > ASTEROID_SPAWN_RATE_SECONDS:
             self.spawn_timer = 0
 
             # spawn a new asteroid at a random edge
-            edge = random.choice(self.edges)
-            speed = random.randint(40, 100)
+            edge = _random.choice(self.edges)
+            speed = _random.randint(40, 100)
             velocity = edge[0] * speed
-            velocity = velocity.rotate(random.randint(-30, 30))
-            position = edge[1](random.uniform(0, 1))
-            kind = random.randint(1, ASTEROID_KINDS)
-            self.spawn(ASTEROID_MIN_RADIUS * kind, position, velocity)
\ No newline at end of file
+            velocity = velocity.rotate(_random.randint(-30, 30))
+            position = edge[1](_random.uniform(0, 1))
+            kind = _random.randint(1, ASTEROID_KINDS)
+            # Random draws happen either way, so throttling never shifts the stream
+            if self.population.allows(store, ASTEROID_MIN_RADIUS * kind):
+                self.spawn(ASTEROID_MIN_RADIUS * kind, position, velocity)
+        self.population.observe(store)
\ No newline at end of file
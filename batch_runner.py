@@ -0,0 +1,162 @@
+import argparse
+import ast
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+import constants
+from constants import FIXED_TIMESTEP
+from headless import run_headless, PILOTS
+from logger import configure_events
+from weapons import WeaponType, WEAPON_CONFIGS
+
+__all__ = ["apply_overrides", "restore_overrides", "play_game", "make_jobs", "run_batch"]
+
+_REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _game_modules():
+    """This repo's imported modules (they hold copies of constants)"""
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == _REPO_DIR:
+            yield module
+
+
+def apply_overrides(overrides):
+    """Patch constants for this process; returns what restore_overrides needs.
+
+    Keys are constants.py names (e.g. "POWERUP_DROP_CHANCE") or weapon fields
+    as "weapon.<TYPE>.<field>" (e.g. "weapon.RAPID.cooldown"). Modules bind
+    constants with `from constants import ...`, so every game module holding
+    the original value is patched too. Values captured at import time, such
+    as default arguments and derived constants like ASTEROID_MAX_RADIUS, are
+    not recomputed.
+    """
+    saved = []
+    for key, value in overrides.items():
+        if key.startswith("weapon."):
+            _, weapon_name, field = key.split(".")
+            weapon = WeaponType[weapon_name]
+            saved.append((WEAPON_CONFIGS, weapon, WEAPON_CONFIGS[weapon]))
+            WEAPON_CONFIGS[weapon] = replace(WEAPON_CONFIGS[weapon], **{field: value})
+            continue
+        if not hasattr(constants, key):
+            raise KeyError(f"unknown constant {key}")
+        original = getattr(constants, key)
+        for module in _game_modules():
+            if getattr(module, key, None) is original:
+                saved.append((module, key, original))
+                setattr(module, key, value)
+    return saved
+
+
+def restore_overrides(saved):
+    for target, key, original in reversed(saved):
+        if isinstance(target, dict):
+            target[key] = original
+        else:
+            setattr(target, key, original)
+
+
+def play_game(job):
+    """Play one headless game for a job dict; runs in a worker process"""
+    saved = apply_overrides(job["overrides"])
+    try:
+        summary = run_headless(job["seconds"], job["dt"], PILOTS[job["pilot"]], seed=job["seed"])
+        lives_lost = constants.STARTING_LIVES - summary["lives"]
+    finally:
+        restore_overrides(saved)
+    return {
+        "job": job["id"],
+        "seed": job["seed"],
+        "pilot": job["pilot"],
+        "overrides": job["overrides"],
+        "score": summary["score"],
+        "lives_lost": lives_lost,
+        "survival_seconds": summary["game_seconds"],
+        "game_over": summary["game_over"],
+        "asteroids_destroyed": summary["asteroids_destroyed"],
+        "frame_ms_mean": summary["frame_ms_mean"],
+        "frame_ms_max": summary["frame_ms_max"],
+    }
+
+
+def make_jobs(sweep, games, seconds=120.0, dt=FIXED_TIMESTEP, pilot="gunner", first_seed=0):
+    """One job per game for every combination of the sweep's values.
+
+    sweep maps override keys to lists of values; each configuration plays
+    `games` games, and every game gets its own seed.
+    """
+    keys = list(sweep)
+    seeds = itertools.count(first_seed)
+    jobs = []
+    for values in itertools.product(*(sweep[key] for key in keys)):
+        overrides = dict(zip(keys, values))
+        for _ in range(games):
+            jobs.append({"id": len(jobs), "seed": next(seeds), "overrides": overrides,
+                         "seconds": seconds, "dt": dt, "pilot": pilot})
+    return jobs
+
+
+def _init_worker():
+    """Pool initializer: workers write no events. They share one working
+    directory, so each would open and truncate the same game_events.jsonl."""
+    configure_events("off")
+
+
+def run_batch(jobs, output, workers=None):
+    """Fan jobs out over a process pool, appending each result to output
+    as a JSON line as soon as it finishes. Returns the number written."""
+    written = 0
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                             initializer=_init_worker) as executor, \
+            open(output, "a") as f:
+        for future in as_completed(executor.submit(play_game, job) for job in jobs):
+            f.write(json.dumps(future.result()) + "\n")
+            f.flush()
+            written += 1
+    return written
+
+
+def _parse_sweep(items):
+    """["NAME=v1,v2", ...] -> {"NAME": [v1, v2]}, values as Python literals"""
+    sweep = {}
+    for item in items:
+        key, _, values = item.partition("=")
+        if not values:
+            raise ValueError(f"expected NAME=VALUE[,VALUE...], got {item!r}")
+        sweep[key] = [ast.literal_eval(value) for value in values.split(",")]
+    return sweep
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many headless Asteroids games in parallel")
+    parser.add_argument("--games", type=int, default=100, help="games per configuration")
+    parser.add_argument("--seconds", type=float, default=120.0, help="game time limit per game")
+    parser.add_argument("--dt", type=float, default=FIXED_TIMESTEP, help="seconds per simulation step")
+    parser.add_argument("--pilot", choices=sorted(PILOTS), default="gunner")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=V1[,V2...]",
+                        help="constant or weapon.<TYPE>.<field> values to sweep; repeatable")
+    parser.add_argument("--first-seed", type=int, default=0, help="seed of the first game; later games count up")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--output", default="batch_results.jsonl", help="JSON lines file results are appended to")
+    args = parser.parse_args()
+
+    try:
+        jobs = make_jobs(_parse_sweep(args.set), args.games, args.seconds, args.dt,
+                         args.pilot, args.first_seed)
+        # Fail fast on a bad key instead of in every worker
+        restore_overrides(apply_overrides(jobs[0]["overrides"]))
+    except (ValueError, KeyError) as e:
+        parser.error(str(e))
+    start = time.perf_counter()
+    written = run_batch(jobs, args.output, args.workers)
+    print(f"Wrote {written} results to {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import numpy as np
+import pygame
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, FIXED_TIMESTEP, ASTEROID_MIN_RADIUS,
+                       ASTEROID_KINDS, BOMB_FUSE_TIME)
+from controls import Controls
+from engine import GameWorld
+from bomb import Bomb
+from explosion import Explosion
+from asteroid import Asteroid
+from profiler import FrameProfiler
+from weapons import WeaponType
+from rng import stream
+
+__all__ = ["SCENES", "run_scene", "run_suite", "compare", "cache_misses", "DEFAULT_BASELINE",
+           "DEFAULT_THRESHOLD", "MIN_CACHE_HIT_RATE"]
+
+BENCHMARK_SEED = 1234
+WARMUP_FRAMES = 30  # Run but not measured (caches, pools, first allocations)
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.25  # Fail when a metric is this much slower than its baseline
+# Metrics compared against the baseline
+GATED_METRICS = ("sim_ms_mean", "sim_ms_p95", "render_ms_mean", "render_ms_p95")
+# Rendered scenes fail below this share of asteroid draws served from the
+# rotation cache, baseline or not
+MIN_CACHE_HIT_RATE = 0.9
+
+_random = stream("benchmark")
+
+
+def _invincible(world, seconds=3600.0):
+    """Keep the ship alive so a scene always runs its full length"""
+    world.player.invincible = True
+    world.player.invincibility_timer = seconds
+
+
+def _scatter_asteroids(world, count):
+    """Spawn count asteroids of every size at random, through AsteroidField"""
+    for _ in range(count):
+        position = pygame.Vector2(_random.uniform(0, SCREEN_WIDTH), _random.uniform(0, SCREEN_HEIGHT))
+        velocity = pygame.Vector2(_random.uniform(40, 100), 0).rotate(_random.uniform(0, 360))
+        radius = ASTEROID_MIN_RADIUS * _random.randint(1, ASTEROID_KINDS)
+        world.asteroid_field.spawn(radius, position, velocity)
+
+
+def _select_weapon(world, weapon):
+    while world.player.current_weapon != weapon:
+        world.player.switch_weapon()
+
+
+def _idle(frame, world):
+    return Controls()
+
+
+def _asteroids(count):
+    def setup(world):
+        _invincible(world)
+        _scatter_asteroids(world, count)
+        return _idle
+    return setup
+
+
+def _barrage(weapon):
+    """Hold fire with weapon while sweeping the ship round"""
+    def setup(world):
+        _invincible(world)
+        _scatter_asteroids(world, 300)
+        _select_weapon(world, weapon)
+        return lambda frame, world: Controls(fire=True, turn_right=True)
+    return setup
+
+
+def _bomb_chain(world):
+    """A grid of bombs whose fuses run out in a ripple across the screen"""
+    _invincible(world)
+    _scatter_asteroids(world, 600)
+    step = 150
+    for i, x in enumerate(range(step // 2, SCREEN_WIDTH, step)):
+        for j, y in enumerate(range(step // 2, SCREEN_HEIGHT, step)):
+            bomb = Bomb(x, y)
+            bomb.fuse_timer = BOMB_FUSE_TIME * 0.25 + (i + j) * 0.05
+    return _idle
+
+
+def _laser_sweep(world):
+    _invincible(world)
+    _scatter_asteroids(world, 600)
+    _select_weapon(world, WeaponType.LASER)
+    return lambda frame, world: Controls(fire=True, turn_right=True)
+
+
+def _explosions(world):
+    """Four large explosions per frame, for the particle system"""
+    _invincible(world)
+
+    def pilot(frame, world):
+        for _ in range(4):
+            Explosion.acquire(_random.uniform(0, SCREEN_WIDTH), _random.uniform(0, SCREEN_HEIGHT),
+                              ASTEROID_MIN_RADIUS * ASTEROID_KINDS)
+        return Controls()
+    return pilot
+
+
+# name -> (setup(world) returning a pilot, measured frames)
+SCENES = {
+    "asteroids_100": (_asteroids(100), 300),
+    "asteroids_1k": (_asteroids(1000), 300),
+    "asteroids_10k": (_asteroids(10000), 60),
+    "barrage_standard": (_barrage(WeaponType.STANDARD), 300),
+    "barrage_spread": (_barrage(WeaponType.SPREAD), 300),
+    "barrage_rapid": (_barrage(WeaponType.RAPID), 300),
+    "bomb_chain": (_bomb_chain, 300),
+    "laser_sweep": (_laser_sweep, 300),
+    "explosions": (_explosions, 300),
+}
+
+
+def _ms_stats(prefix, seconds):
+    ms = np.asarray(seconds) * 1000
+    return {
+        f"{prefix}_mean": round(float(ms.mean()), 4),
+        f"{prefix}_p50": round(float(np.percentile(ms, 50)), 4),
+        f"{prefix}_p95": round(float(np.percentile(ms, 95)), 4),
+        f"{prefix}_max": round(float(ms.max()), 4),
+    }
+
+
+def run_scene(name, frames=None, render=True, seed=BENCHMARK_SEED):
+    """Run one scene; returns simulation and render timings per frame in ms"""
+    setup, default_frames = SCENES[name]
+    frames = frames or default_frames
+    profiler = FrameProfiler(enabled=True)
+    world = GameWorld(seed=seed, profiler=profiler)
+    pilot = setup(world)
+    surface = pygame.display.get_surface() if render else None
+    sim_times, render_times = [], []
+    peak_asteroids = peak_particles = 0
+    cache = Asteroid.sprite_cache
+
+    for frame in range(WARMUP_FRAMES + frames):
+        measured = frame >= WARMUP_FRAMES
+        if frame == WARMUP_FRAMES:
+            profiler.durations.clear()
+            hits, misses = cache.hits, cache.misses
+
+        profiler.begin_frame()
+        start = time.perf_counter()
+        world.step(FIXED_TIMESTEP, pilot(frame, world))
+        sim_end = time.perf_counter()
+        if surface is not None:
+            surface.fill((0, 0, 20))
+            world.draw(surface)
+        render_end = time.perf_counter()
+        profiler.end_frame()
+
+        if measured:
+            sim_times.append(sim_end - start)
+            if surface is not None:
+                render_times.append(render_end - sim_end)
+            peak_asteroids = max(peak_asteroids, len(world.asteroids))
+            peak_particles = max(peak_particles, len(world.particles))
+
+    result = {"scene": name, "frames": frames}
+    result.update(_ms_stats("sim_ms", sim_times))
+    if render_times:
+        result.update(_ms_stats("render_ms", render_times))
+        lookups = cache.hits - hits + cache.misses - misses
+        if lookups:
+            result["rotation_cache_hit_rate"] = round((cache.hits - hits) / lookups, 4)
+    result["phases_ms_p50"] = {phase: round(p50, 4) for phase, (p50, _, _) in profiler.percentiles().items()}
+    result["peak_asteroids"] = peak_asteroids
+    result["peak_particles"] = peak_particles
+    result["asteroids_destroyed"] = world.asteroids_destroyed
+    return result
+
+
+def run_suite(names=None, render=True):
+    """Run the named scenes (all by default) under the dummy video driver"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    try:
+        results = {name: run_scene(name, render=render) for name in (names or SCENES)}
+    finally:
+        pygame.quit()
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "scenes": results,
+    }
+
+
+def cache_misses(results, floor=MIN_CACHE_HIT_RATE):
+    """(scene, hit rate) for scenes whose rotation cache hit rate is below floor"""
+    return [(name, scene["rotation_cache_hit_rate"]) for name, scene in results["scenes"].items()
+            if scene.get("rotation_cache_hit_rate", 1.0) < floor]
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Regressions as (scene, metric, baseline ms, current ms) tuples"""
+    regressions = []
+    for name, current in results["scenes"].items():
+        previous = baseline.get("scenes", {}).get(name)
+        if previous is None:
+            continue
+        for metric in GATED_METRICS:
+            if metric in current and metric in previous:
+                if current[metric] > previous[metric] * (1 + threshold):
+                    regressions.append((name, metric, previous[metric], current[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Asteroids stress scenes")
+    parser.add_argument("scenes", nargs="*", metavar="SCENE",
+                        help=f"scenes to run (default all: {', '.join(SCENES)})")
+    parser.add_argument("--output", metavar="PATH", help="write results JSON here as well as stdout")
+    parser.add_argument("--baseline", metavar="PATH", default=DEFAULT_BASELINE,
+                        help="results to compare against (default %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (default %(default)s)")
+    parser.add_argument("--no-render", action="store_true", help="time the simulation only")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenes if name not in SCENES]
+    if unknown:
+        parser.error(f"unknown scene(s): {', '.join(unknown)}")
+
+    results = run_suite(args.scenes, render=not args.no_render)
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+    low_hit_rates = cache_misses(results)
+    for name, rate in low_hit_rates:
+        print(f"CACHE {name} rotation cache hit rate {rate:.1%} is below {MIN_CACHE_HIT_RATE:.0%}",
+              file=sys.stderr)
+    if low_hit_rates:
+        raise SystemExit(1)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            f.write(text)
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one", file=sys.stderr)
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    for name, metric, before, after in regressions:
+        print(f"REGRESSION {name} {metric}: {before:.3f} -> {after:.3f} ms", file=sys.stderr)
+    if regressions:
+        raise SystemExit(1)
+    print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
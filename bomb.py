@@ -24,6 +24,10 @@ class Bomb(CircleShape):
                              (int(self.position.x), int(self.position.y)),
                              3)
 
+    def bounding_rect(self):
+        # Pulses up to 1.3x radius as the fuse runs down
+        return self._rect_around(self.position.x, self.position.y, self.radius * 1.3 + 2)
+
     def update(self, dt):
         self.fuse_timer -= dt
         if self.fuse_timer <= 0:
@@ -1,5 +1,5 @@
 import pygame
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, LINE_WIDTH
 
 # Base class for game objects
 class CircleShape(pygame.sprite.Sprite):
@@ -14,10 +14,27 @@ class CircleShape(pygame.sprite.Sprite):
         self.velocity = pygame.Vector2(0, 0)
         self.radius = radius
 
+    def reset(self, x, y, radius):
+        """Re-initialise a recycled shape in place and re-join its containers"""
+        if hasattr(self, "containers"):
+            self.add(self.containers)
+        self.position.update(x, y)
+        self.velocity.update(0, 0)
+        self.radius = radius
+
     def draw(self, screen):
         # must override
         pass
 
+    def bounding_rect(self):
+        """Screen area touched by draw(), for dirty-rect rendering"""
+        return self._rect_around(self.position.x, self.position.y, self.radius + LINE_WIDTH)
+
+    @staticmethod
+    def _rect_around(x, y, extent):
+        extent = int(extent) + 2
+        return pygame.Rect(int(x) - extent, int(y) - extent, extent * 2, extent * 2)
+
     def update(self, dt):
         # must override
         pass
@@ -0,0 +1,332 @@
+import argparse
+import socket
+import time
+from collections import deque
+import pygame
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, NET_PORT, NET_INTERPOLATION_DELAY,
+                       NET_SNAPSHOT_HISTORY, BOMB_FUSE_TIME)
+from asteroid import Asteroid
+from asteroid_store import AsteroidStore
+from bomb import Bomb
+from controls import read_keyboard
+from explosion import Explosion
+from game_state import GameState
+from laser import Laser
+from particles import ParticleSystem
+from player import Player
+from pool import collect_pools
+from powerup import PowerUp, ShieldPowerUp, SpeedPowerUp
+from shot import Shot
+from shot_store import ShotStore
+from ui import UI
+from weapons import WEAPON_CONFIGS
+from netcode import (JOIN, INPUT, LEAVE, WELCOME, SNAPSHOT, ASTEROID, SHOT, BOMB, POWERUP,
+                     EXPLOSION, PLAYER, VISIBLE, SHIELDED, LASER_ON, POWERUP_KINDS,
+                     SHIP_ROTATION_STEPS, ASTEROID_ROTATION_STEPS, SnapshotHistory,
+                     decode_snapshot, dequantise_position, dequantise_rotation, pack, unpack)
+
+__all__ = ["GameClient", "RemoteScene", "interpolate"]
+
+_MAX_DATAGRAM = 65507
+_JOIN_RETRY_SECONDS = 0.5
+_OTHER_SHIP_COLOR = (120, 200, 255)
+# Fields interpolated per kind: positions always, plus rotation where it has one
+_ROTATION_FIELD = {ASTEROID: (2, ASTEROID_ROTATION_STEPS), PLAYER: (2, SHIP_ROTATION_STEPS)}
+
+
+def _lerp_wrapped(a, b, alpha, extent):
+    # A jump of more than half the screen is a wrap, not motion: snap
+    if abs(b - a) > extent / 2:
+        return b
+    return a + (b - a) * alpha
+
+
+def _lerp_angle(a, b, alpha, steps):
+    delta = (b - a + steps / 2) % steps - steps / 2
+    return a + delta * alpha
+
+
+def interpolate(older, newer, alpha):
+    """Entities of newer with positions and rotations blended from older.
+
+    Values stay in quantised units. Entities that only exist in newer are
+    taken as they are; entities missing from newer are gone.
+    """
+    extent_x = SCREEN_WIDTH * 4
+    extent_y = SCREEN_HEIGHT * 4
+    entities = {}
+    for net_id, (kind, values) in newer.items():
+        old = older.get(net_id)
+        if old is None or old[0] != kind:
+            entities[net_id] = (kind, values)
+            continue
+        old_values = old[1]
+        values = list(values)
+        values[0] = _lerp_wrapped(old_values[0], values[0], alpha, extent_x)
+        values[1] = _lerp_wrapped(old_values[1], values[1], alpha, extent_y)
+        rotation = _ROTATION_FIELD.get(kind)
+        if rotation is not None:
+            field, steps = rotation
+            values[field] = _lerp_angle(old_values[field], values[field], alpha, steps)
+        entities[net_id] = (kind, values)
+    return entities
+
+
+class RemoteScene:
+    """Local sprites mirroring the server's entities, for drawing only.
+
+    Each network id gets a sprite of the matching class, so the game's own
+    draw() code renders it; nothing here is simulated except cosmetic
+    effects: explosion rings and particles start when an explosion first
+    appears, and asteroid outlines are generated locally. Sprite classes
+    register through class-level `containers`, like in GameWorld.
+    """
+
+    def __init__(self):
+        self.drawable = pygame.sprite.Group()
+        self.effects = pygame.sprite.Group()
+        self.shots = pygame.sprite.Group()
+        Asteroid.containers = (self.drawable,)
+        Asteroid.store = AsteroidStore()
+        # Shots are drawn by their store, which the scene never updates
+        Shot.containers = (self.shots,)
+        Shot.store = ShotStore()
+        self.drawable.add(Shot.store)
+        for cls in (Bomb, Player, PowerUp, ShieldPowerUp, SpeedPowerUp):
+            cls.containers = (self.drawable,)
+        Explosion.containers = (self.effects, self.drawable)
+        self.particles = Explosion.particles = ParticleSystem()
+        self.effects.add(self.particles)
+        self.drawable.add(self.particles)
+        for cls in (Shot, Asteroid, Explosion):
+            cls.pool.clear()
+        self.sprites = {}  # net id -> sprite
+        self.lasers = {}  # player net id -> Laser
+        self.weapon_colors = [config.color for config in WEAPON_CONFIGS.values()]
+
+    def _create(self, kind, values):
+        x, y = dequantise_position(values[0]), dequantise_position(values[1])
+        if kind == ASTEROID:
+            return Asteroid.acquire(x, y, values[3])
+        if kind == SHOT:
+            return Shot.acquire(x, y, values[2], self.weapon_colors[values[3]])
+        if kind == BOMB:
+            return Bomb(x, y)
+        if kind == POWERUP:
+            return POWERUP_KINDS[values[2]](x, y)
+        if kind == EXPLOSION:
+            return Explosion.acquire(x, y, values[2])
+        return Player(x, y)
+
+    def sync(self, entities, own_id, dt):
+        """Create, move and remove sprites to match entities"""
+        for net_id in [net_id for net_id in self.sprites if net_id not in entities]:
+            sprite = self.sprites.pop(net_id)
+            if not isinstance(sprite, Explosion):
+                sprite.kill()  # Explosions fade out on their own
+            laser = self.lasers.pop(net_id, None)
+            if laser is not None:
+                laser.kill()
+
+        for net_id, (kind, values) in entities.items():
+            sprite = self.sprites.get(net_id)
+            if sprite is None:
+                sprite = self.sprites[net_id] = self._create(kind, values)
+            if kind == EXPLOSION:
+                continue
+            sprite.position = pygame.Vector2(dequantise_position(values[0]), dequantise_position(values[1]))
+            if kind == ASTEROID:
+                sprite.rotation = dequantise_rotation(values[2], ASTEROID_ROTATION_STEPS)
+            elif kind == BOMB:
+                sprite.fuse_timer = values[2] / 255 * BOMB_FUSE_TIME
+            elif kind == POWERUP:
+                sprite.lifetime = values[3] / 10
+                sprite.animate(dt)
+            elif kind == PLAYER:
+                self._sync_player(net_id, sprite, values, net_id == own_id, dt)
+
+        self.effects.update(dt)
+        collect_pools()
+
+    def _sync_player(self, net_id, player, values, own, dt):
+        player.rotation = dequantise_rotation(values[2], SHIP_ROTATION_STEPS)
+        flags = values[3]
+        player.visible = bool(flags & VISIBLE)
+        player.shield_active = bool(flags & SHIELDED)
+        player.weapon_index = values[4]
+        player.current_weapon = player.available_weapons[values[4]]
+        player.bomb_count = values[5]
+        player.outline_color = "white" if own else _OTHER_SHIP_COLOR
+        laser = self.lasers.get(net_id)
+        if laser is None:
+            laser = self.lasers[net_id] = Laser(player)
+        laser.active = bool(flags & LASER_ON)
+        laser.update(dt)
+
+    def draw(self, screen):
+        for sprite in self.drawable:
+            sprite.draw(screen)
+        for laser in self.lasers.values():
+            laser.draw(screen)
+
+
+class GameClient:
+    """UDP connection to a GameServer plus the snapshot interpolation buffer.
+
+    Inputs go out every frame tagged with the newest snapshot received,
+    which the server uses as the next delta baseline. Snapshots are
+    rendered interpolation_delay seconds in the past, so there is normally
+    a received snapshot on each side of the render time.
+    """
+
+    def __init__(self, host="127.0.0.1", port=NET_PORT, interpolation_delay=NET_INTERPOLATION_DELAY):
+        self.server = (host, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.interpolation_delay = interpolation_delay
+        self.player_id = None
+        self.tick_rate = 60
+        self.snapshot_interval = 1
+        self.baselines = SnapshotHistory()
+        self.buffer = deque(maxlen=NET_SNAPSHOT_HISTORY)  # (tick, game state, entities), oldest first
+        self.latest_id = 0
+        self.latest_received_at = 0.0
+        self.input_sequence = 0
+        self.bytes_received = 0
+        self.snapshots_received = 0
+        self.undecodable = 0  # Deltas whose baseline was already forgotten
+
+    def join(self, timeout=5.0):
+        """Send JOIN until the server answers; False if it never does"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self.sock.sendto(pack(JOIN), self.server)
+            retry = time.monotonic() + _JOIN_RETRY_SECONDS
+            while time.monotonic() < retry:
+                self.receive()
+                if self.player_id is not None:
+                    return True
+                time.sleep(0.01)
+        return False
+
+    def leave(self):
+        self.sock.sendto(pack(LEAVE), self.server)
+        self.sock.close()
+
+    def receive(self):
+        """Handle every datagram waiting on the socket"""
+        while True:
+            try:
+                data, address = self.sock.recvfrom(_MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError, ConnectionResetError):
+                return
+            packet = unpack(data)
+            if packet is None:
+                continue
+            packet_type, fields, payload = packet
+            if packet_type == WELCOME:
+                self.player_id, self.snapshot_interval, self.tick_rate = fields
+            elif packet_type == SNAPSHOT:
+                self.bytes_received += len(data)
+                if fields[0] <= self.latest_id:
+                    continue  # Out of order; a newer one has been applied
+                decoded = decode_snapshot(fields, payload, self.baselines)
+                if decoded is None:
+                    self.undecodable += 1
+                else:
+                    snapshot_id, tick, game_state, entities = decoded
+                    self.baselines.add(snapshot_id, entities)
+                    self.latest_id = snapshot_id
+                    self.latest_received_at = time.monotonic()
+                    self.buffer.append((tick, game_state, entities))
+                    self.snapshots_received += 1
+
+    def send_input(self, controls):
+        self.input_sequence += 1
+        self.sock.sendto(pack(INPUT, self.input_sequence, self.latest_id, controls.to_bits()), self.server)
+
+    def render_tick(self):
+        """Server tick to show now: the newest one, extrapolated by the time
+        since it arrived, minus the interpolation delay"""
+        if not self.buffer:
+            return None
+        newest_tick = self.buffer[-1][0]
+        since = time.monotonic() - self.latest_received_at
+        return newest_tick + (since - self.interpolation_delay) * self.tick_rate
+
+    def sample(self):
+        """(game state tuple, entities) interpolated at render_tick()"""
+        target = self.render_tick()
+        if target is None:
+            return None
+        buffer = self.buffer
+        if target <= buffer[0][0]:
+            return buffer[0][1], buffer[0][2]
+        for older, newer in zip(buffer, list(buffer)[1:]):
+            if older[0] <= target <= newer[0]:
+                alpha = (target - older[0]) / (newer[0] - older[0])
+                return newer[1], interpolate(older[2], newer[2], alpha)
+        return buffer[-1][1], buffer[-1][2]  # Snapshots are late; hold the newest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Asteroids co-op client")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=NET_PORT)
+    parser.add_argument("--delay", type=float, default=NET_INTERPOLATION_DELAY,
+                        help="interpolation delay in seconds")
+    parser.add_argument("--frames", type=int, help="quit after this many frames")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Asteroids (online)")
+    clock = pygame.time.Clock()
+    client = GameClient(args.host, args.port, args.delay)
+    if not client.join():
+        print(f"No answer from {args.host}:{args.port}")
+        pygame.quit()
+        return
+    print(f"Joined {args.host}:{args.port} as player {client.player_id}")
+
+    scene = RemoteScene()
+    ui = UI(screen)
+    game_state = GameState()
+    dt = 0
+    frame = 0
+    last_report = time.monotonic()
+    while args.frames is None or frame < args.frames:
+        events = pygame.event.get()
+        if any(event.type == pygame.QUIT for event in events):
+            break
+        client.send_input(read_keyboard(events))
+        client.receive()
+
+        screen.fill((0, 0, 20))
+        sample = client.sample()
+        if sample is not None:
+            (game_state.score, game_state.lives, game_state.combo_multiplier,
+             game_state.game_over) = sample[0]
+            scene.sync(sample[1], client.player_id, dt)
+            scene.draw(screen)
+            ui.draw(game_state, scene.sprites.get(client.player_id))
+            if game_state.game_over:
+                ui.draw_game_over(game_state.score)
+        pygame.display.flip()
+
+        now = time.monotonic()
+        if now - last_report >= 5.0:
+            kbps = client.bytes_received * 8 / 1000 / (now - last_report)
+            print(f"{kbps:.1f} kbps, {client.snapshots_received} snapshots, "
+                  f"{client.undecodable} undecodable")
+            client.bytes_received = client.snapshots_received = 0
+            last_report = now
+        frame += 1
+        dt = clock.tick(60) / 1000
+
+    client.leave()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
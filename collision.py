@@ -1,3 +1,4 @@
+import numpy as np
 import pygame
 
 
@@ -60,3 +61,100 @@ def circle_intersects_triangle(center, radius, triangle):
             return True
 
     return False
+
+
+class TriangleHitbox:
+    """A triangle prepared once for many circle tests.
+
+    Holds plain float vertices, a NumPy copy for batched tests, and a
+    bounding circle used to reject far-away circles before the exact test.
+    """
+
+    def __init__(self, triangle):
+        self.points = [(float(v[0]), float(v[1])) for v in triangle]
+        self.array = np.array(self.points)
+        self.center = self.array.mean(axis=0)
+        self.radius = float(np.sqrt(((self.array - self.center) ** 2).sum(axis=1).max()))
+
+    def intersects_circle(self, center, radius):
+        dx = center[0] - self.center[0]
+        dy = center[1] - self.center[1]
+        reach = self.radius + radius
+        if dx * dx + dy * dy >= reach * reach:
+            return False
+        return circle_intersects_triangle(center, radius, self.points)
+
+    def intersects_circles(self, centers, radii):
+        """Hit mask for arrays of circle centres (N, 2) and radii (N,)"""
+        centers = np.asarray(centers, dtype=float)
+        radii = np.asarray(radii, dtype=float)
+        reach = self.radius + radii
+        near = ((centers - self.center) ** 2).sum(axis=-1) < reach * reach
+        mask = np.zeros(len(radii), dtype=bool)
+        if near.any():
+            mask[near] = circles_intersect_triangle(centers[near], radii[near], self.array)
+        return mask
+
+
+def _segment_distance_sq(points, seg_start, seg_end):
+    ab = seg_end - seg_start
+    ap = points - seg_start
+    ab_len_sq = (ab * ab).sum(axis=-1)
+    t = (ap * ab).sum(axis=-1) / np.where(ab_len_sq == 0, 1, ab_len_sq)
+    t = np.clip(t, 0, 1)
+    closest = seg_start + ab * t[..., None]
+    return ((points - closest) ** 2).sum(axis=-1)
+
+
+def circles_intersect_triangle(centers, radii, triangle):
+    """Batched circle_intersects_triangle.
+
+    centers is (..., 2), radii (...,) and triangle (3, 2) or (..., 3, 2)
+    broadcastable against them. Returns a boolean hit mask.
+    """
+    centers = np.asarray(centers, dtype=float)
+    radii = np.asarray(radii, dtype=float)
+    triangle = np.asarray(triangle, dtype=float)
+    a, b, c = triangle[..., 0, :], triangle[..., 1, :], triangle[..., 2, :]
+
+    def sign(p1, p2, p3):
+        return ((p1[..., 0] - p3[..., 0]) * (p2[..., 1] - p3[..., 1])
+                - (p2[..., 0] - p3[..., 0]) * (p1[..., 1] - p3[..., 1]))
+
+    d1 = sign(centers, a, b)
+    d2 = sign(centers, b, c)
+    d3 = sign(centers, c, a)
+    has_neg = (d1 < 0) | (d2 < 0) | (d3 < 0)
+    has_pos = (d1 > 0) | (d2 > 0) | (d3 > 0)
+    inside = ~(has_neg & has_pos)
+
+    radii_sq = radii * radii
+    return (inside
+            | (_segment_distance_sq(centers, a, b) < radii_sq)
+            | (_segment_distance_sq(centers, b, c) < radii_sq)
+            | (_segment_distance_sq(centers, c, a) < radii_sq))
+
+
+def swept_circles_toi(starts, ends, radii):
+    """Time of impact for pairs of moving circles over one step.
+
+    starts and ends (..., 2) are the relative centre offset (first circle
+    minus second) at the start and end of the step; radii (...,) are the
+    summed radii. Both circles move in straight lines, so the offset does
+    too. Returns the earliest fraction of the step in [0, 1] at which the
+    circles touch, 0 if they already overlap, and NaN if they never meet.
+    """
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    radii = np.asarray(radii, dtype=float)
+    d = ends - starts
+    a = (d * d).sum(axis=-1)
+    b = 2 * (starts * d).sum(axis=-1)
+    c = (starts * starts).sum(axis=-1) - radii * radii
+    disc = b * b - 4 * a * c
+    moving = (a > 0) & (disc >= 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # First root of |starts + t * d| = radii
+        t = (-b - np.sqrt(np.where(moving, disc, 0))) / np.where(moving, 2 * a, 1)
+    hit = moving & (t >= 0) & (t <= 1)
+    return np.where(c < 0, 0.0, np.where(hit, t, np.nan))
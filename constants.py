@@ -11,10 +11,26 @@ ASTEROID_MIN_RADIUS = 20
 ASTEROID_KINDS = 3
 ASTEROID_SPAWN_RATE_SECONDS = 0.8
 ASTEROID_MAX_RADIUS = ASTEROID_MIN_RADIUS * ASTEROID_KINDS
+ASTEROID_OUTLINE_TEMPLATES = 8  # Distinct outlines shared by all asteroids
+ASTEROID_STORE_CAPACITY = 256  # Initial rows; the store doubles as needed
+ASTEROID_POPULATION_MAX = 150  # Live asteroids above which the field stops spawning
+ASTEROID_AREA_BUDGET = 0.5  # Summed asteroid area, as a fraction of the screen, above which spawns stop
+ASTEROID_CULL_AGE = 60.0  # Seconds before an off-screen asteroid is despawned; None keeps them
+ASTEROID_SPLIT_ANGLE_MIN = 20  # Degrees each fragment turns away from the parent's heading
+ASTEROID_SPLIT_ANGLE_MAX = 50
+ASTEROID_SPLIT_SPEEDUP = 1.2  # Fragment speed relative to the parent
 SHOT_RADIUS = 5
+SHOT_STORE_CAPACITY = 128  # Initial rows; the store doubles as needed
 PLAYER_SHOOT_SPEED = 500
 PLAYER_SHOOT_COOLDOWN_SECONDS = 0.3
 
+# Simulation
+FIXED_TIMESTEP = 1 / 60  # Seconds per step in deterministic mode
+MAX_STEPS_PER_FRAME = 5  # Drop simulation time beyond this many steps per frame
+
+# Broadphase
+SPATIAL_HASH_CELL_SIZE = 128  # Roughly one large asteroid diameter
+
 # Scoring
 SCORE_SMALL = 100    # Smallest asteroids (ASTEROID_MIN_RADIUS)
 SCORE_MEDIUM = 50    # Medium asteroids
@@ -37,6 +53,42 @@ BOMB_STARTING_COUNT = 3
 LASER_MAX_LENGTH = 800
 LASER_WIDTH = 3
 LASER_DAMAGE_INTERVAL = 0.1  # Damage tick rate in seconds
+LASER_PIERCING = False  # True: each damage tick hits every asteroid on the beam
+
+# Rendering
+ROTATION_CACHE_STEPS = 64  # Pre-rendered rotations per asteroid outline
+ROTATION_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Surface memory for cached outlines
+DIRTY_RECT_MAX_COVERAGE = 0.35  # Dirty area fraction above which a full flip is cheaper
+ASSET_CACHE_DIR = ".asset_cache"  # Generated backgrounds and glyph atlases, reused across runs
+
+# Profiling
+PROFILER_HISTORY_FRAMES = 300  # Samples per phase behind the rolling percentiles
+PROFILER_TRACE_FRAMES = 600  # Most recent frames kept for the Chrome trace export
+
+# Frame-budget governor
+FRAME_BUDGET_MS = 16.6  # Work per frame the governor aims to stay under
+GOVERNOR_WINDOW_FRAMES = 20  # Frames averaged before each quality decision
+GOVERNOR_RESTORE_RATIO = 0.6  # Raise quality only below this fraction of the budget
+GOVERNOR_RESTORE_FRAMES = 120  # Frames at one level before quality may rise again
+
+# Save states
+QUICKSAVE_PATH = "quicksave.state"  # F5 writes it, F9 loads it
+
+# Networking
+NET_PORT = 7777  # Default UDP port of server.py
+NET_SNAPSHOT_RATE = 20  # Snapshots per second sent to each client
+NET_SNAPSHOT_HISTORY = 32  # Snapshots kept per client as delta baselines
+NET_CLIENT_TIMEOUT = 5.0  # Seconds of silence before a client is dropped
+NET_INTERPOLATION_DELAY = 0.1  # Seconds clients render behind the newest snapshot
+NET_RESTART_DELAY = 3.0  # Seconds the server shows game over before a new round
+
+# Particles
+PARTICLE_CAPACITY = 4096  # Live explosion particles, preallocated
+PARTICLE_FRICTION = 0.95  # Velocity kept per frame
+PARTICLE_DIRTY_TILE = 64  # Tile size particles report for dirty-rect rendering
+
+# Object pools
+POOL_MAX_SIZE = 512  # Recycled instances kept per pooled class
 
 # Power-ups
 POWERUP_RADIUS = 15
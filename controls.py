@@ -0,0 +1,70 @@
+import pygame
+from dataclasses import dataclass
+
+
+@dataclass
+class Controls:
+    """One frame of player input, independent of where it came from"""
+    thrust: bool = False
+    reverse: bool = False
+    turn_left: bool = False
+    turn_right: bool = False
+    fire: bool = False
+    switch_weapon: bool = False  # Edge-triggered: true only on the press frame
+    drop_bomb: bool = False      # Edge-triggered: true only on the press frame
+
+    # Bit layout of the one-byte-per-frame input record
+    BITS = ("thrust", "reverse", "turn_left", "turn_right", "fire",
+            "switch_weapon", "drop_bomb")
+
+    def to_bits(self):
+        """Pack into one byte, one bit per field in BITS order"""
+        bits = 0
+        for i, name in enumerate(self.BITS):
+            if getattr(self, name):
+                bits |= 1 << i
+        return bits
+
+    @classmethod
+    def from_bits(cls, bits):
+        return cls(**{name: bool(bits >> i & 1) for i, name in enumerate(cls.BITS)})
+
+
+def read_keyboard(events):
+    """Build Controls from held keys plus this frame's KEYDOWN events"""
+    keys = pygame.key.get_pressed()
+    controls = Controls(
+        thrust=keys[pygame.K_w],
+        reverse=keys[pygame.K_s],
+        turn_left=keys[pygame.K_a],
+        turn_right=keys[pygame.K_d],
+        fire=keys[pygame.K_SPACE],
+    )
+    for event in events:
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_q:
+                controls.switch_weapon = True
+            if event.key == pygame.K_b:
+                controls.drop_bomb = True
+    return controls
+
+
+class ScriptedInput:
+    """Input source that plays back a list of Controls, one per frame.
+
+    Input sources are callables taking (frame, world) and returning Controls;
+    past the end of the script this returns idle input, or wraps if loop.
+    """
+
+    def __init__(self, frames, loop=False):
+        self.frames = list(frames)
+        self.loop = loop
+
+    def __call__(self, frame, world):
+        if not self.frames:
+            return Controls()
+        if self.loop:
+            return self.frames[frame % len(self.frames)]
+        if frame < len(self.frames):
+            return self.frames[frame]
+        return Controls()
@@ -0,0 +1,130 @@
+import numpy as np
+import pygame
+
+__all__ = ["ComponentStore", "StoredEntity", "vector_column", "scalar_column"]
+
+
+class ComponentStore(pygame.sprite.Sprite):
+    """Archetype table: one NumPy column per component, one dense row per entity.
+
+    Subclasses declare `components` as {name: (per-row shape, dtype)}; each
+    becomes an array attribute of that name. Handles (the sprite objects)
+    hold their row index; removing a row moves the last row into the gap
+    and updates that row's handle. `sequence` records spawn order, so
+    systems working on columns can visit rows in the same order as the
+    sprite groups. Added to `updatable`, a store runs its systems once per
+    frame for every row at once.
+    """
+
+    components = {}
+
+    def __init__(self, capacity):
+        super().__init__()
+        self.count = 0
+        self.handles = []
+        self.spawned = 0
+        for name, (shape, dtype) in self.components.items():
+            setattr(self, name, np.zeros((capacity,) + shape, dtype=dtype))
+        self.sequence = np.zeros(capacity, dtype=np.int64)
+
+    def _columns(self):
+        return [getattr(self, name) for name in self.components] + [self.sequence]
+
+    def _grow(self):
+        """Double capacity, keeping existing rows"""
+        capacity = max(1, len(self.sequence) * 2)
+        for name in list(self.components) + ["sequence"]:
+            column = getattr(self, name)
+            grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+
+    def allocate(self, handle):
+        """Reserve a zeroed row for handle and return its index"""
+        if self.count == len(self.sequence):
+            self._grow()
+        index = self.count
+        for column in self._columns():
+            column[index] = 0
+        self.sequence[index] = self.spawned
+        self.spawned += 1
+        self.handles.append(handle)
+        self.count += 1
+        return index
+
+    def release(self, index):
+        """Free a row by moving the last row into it"""
+        last = self.count - 1
+        if index != last:
+            for column in self._columns():
+                column[index] = column[last]
+            moved = self.handles[last]
+            self.handles[index] = moved
+            moved.index = index
+        self.handles.pop()
+        self.count = last
+
+    def transfer(self, index, target):
+        """Move a row into another store, returning its new index there"""
+        new_index = target.allocate(self.handles[index])
+        for src, dst in zip(self._columns(), target._columns()):
+            dst[new_index] = src[index]
+        self.release(index)
+        return new_index
+
+    def spawn_order(self):
+        """Row indices sorted by spawn order (the order sprites joined their groups)"""
+        return np.argsort(self.sequence[:self.count], kind="stable")
+
+    def __len__(self):
+        return self.count
+
+
+class StoredEntity:
+    """Mixin for sprites whose state lives in a row of the class's `store`.
+
+    kill() parks the row in a private one-row store, so a killed handle
+    stays readable for the rest of the frame while the shared store stays
+    dense. A pooled reuse calls _rejoin() to move back into the shared one.
+    """
+
+    def kill(self):
+        if "store" not in self.__dict__:
+            parked = getattr(self, "_parked", None)
+            if parked is None:
+                parked = self._parked = type(self.store)(capacity=1)
+            self.index = self.store.transfer(self.index, parked)
+            self.store = parked
+        super().kill()
+
+    def _rejoin(self):
+        """Leave the parked row for a fresh one in the shared store and
+        re-join the containers"""
+        self.store.release(self.index)
+        del self.store
+        self.index = self.store.allocate(self)
+        if hasattr(self, "containers"):
+            self.add(self.containers)
+
+
+def vector_column(name):
+    """Property exposing a (2,) column row as a pygame.Vector2 copy"""
+    def get(self):
+        row = getattr(self.store, name)[self.index]
+        return pygame.Vector2(float(row[0]), float(row[1]))
+
+    def set(self, value):
+        getattr(self.store, name)[self.index] = (value[0], value[1])
+
+    return property(get, set)
+
+
+def scalar_column(name):
+    """Property exposing a float column row"""
+    def get(self):
+        return float(getattr(self.store, name)[self.index])
+
+    def set(self, value):
+        getattr(self.store, name)[self.index] = value
+
+    return property(get, set)
@@ -0,0 +1,358 @@
+import numpy as np
+import pygame
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, POWERUP_DROP_CHANCE, POWERUP_SPAWN_RATE
+from logger import log_event, enabled, write_event, register_group, register_object
+from player import Player
+from asteroid import Asteroid
+from asteroid_store import AsteroidStore
+from asteroidfield import AsteroidField
+from shot import Shot
+from shot_store import ShotStore
+from game_state import GameState
+from explosion import Explosion
+from particles import ParticleSystem
+from bomb import Bomb
+from laser import Laser
+from weapons import WeaponType
+from powerup import PowerUp, ShieldPowerUp, SpeedPowerUp
+from spatial_hash import SpatialHash
+from collision import swept_circles_toi
+from pool import collect_pools
+from controls import Controls
+from rng import stream, seed_all
+from profiler import FrameProfiler
+
+_random = stream("powerups")
+
+
+def spawn_random_powerup(x, y):
+    """Spawn a random power-up at the given position"""
+    powerup_types = [ShieldPowerUp, SpeedPowerUp]
+    powerup_class = _random.choice(powerup_types)
+    return powerup_class(x, y)
+
+
+class GameWorld:
+    """All game entities and rules, with no window, clock or keyboard.
+
+    step() advances one frame for a given dt and Controls; draw() renders
+    onto any surface and is optional. Sprite classes register through
+    class-level `containers`, so only one world can be live per process.
+
+    Passing a seed reseeds every RNG stream, so the same seed and the same
+    Controls per step reproduce a run exactly.
+
+    The world starts with `players` ships; add_player()/remove_player()
+    change that later (e.g. for network clients). All ships share one
+    GameState, so score and lives are cooperative. `player` and `laser` are
+    the first ship and its beam.
+    """
+
+    def __init__(self, seed=None, profiler=None, players=1):
+        if seed is not None:
+            seed_all(seed)
+        self.updatable = pygame.sprite.Group()
+        self.drawable = pygame.sprite.Group()
+        self.asteroids = pygame.sprite.Group()
+        self.shots = pygame.sprite.Group()
+        self.explosions = pygame.sprite.Group()
+        self.bombs = pygame.sprite.Group()
+        self.powerups = pygame.sprite.Group()
+        Player.containers = (self.updatable, self.drawable)
+        # Asteroids are moved in bulk by their store, not per object
+        Asteroid.containers = (self.asteroids, self.drawable)
+        self.asteroid_store = Asteroid.store = AsteroidStore()
+        self.updatable.add(self.asteroid_store)
+        # Shots are moved, culled and drawn by their store. It updates ahead
+        # of the ships, so shots fired this frame first move next frame.
+        Shot.containers = (self.shots,)
+        self.shot_store = Shot.store = ShotStore()
+        self.updatable.add(self.shot_store)
+        self.drawable.add(self.shot_store)
+        self.particles = Explosion.particles = ParticleSystem()
+        self.updatable.add(self.particles)
+        self.drawable.add(self.particles)
+        AsteroidField.containers = (self.updatable,)
+        Explosion.containers = (self.explosions, self.updatable, self.drawable)
+        Bomb.containers = (self.bombs, self.updatable, self.drawable)
+        PowerUp.containers = (self.powerups, self.updatable, self.drawable)
+        ShieldPowerUp.containers = (self.powerups, self.updatable, self.drawable)
+        SpeedPowerUp.containers = (self.powerups, self.updatable, self.drawable)
+        # Pools may hold sprites from a previous world's groups
+        for cls in (Shot, Asteroid, Explosion):
+            cls.pool.clear()
+
+        self.asteroid_field = AsteroidField()
+        self.players = []
+        self.lasers = {}  # Player -> its Laser
+        for _ in range(players):
+            self.add_player()
+        self.player = self.players[0] if self.players else None
+        self.game_state = GameState()
+        self.laser = self.lasers.get(self.player)
+        self.powerup_spawn_timer = 0.0
+        self.asteroid_grid = SpatialHash()
+        self.powerup_grid = SpatialHash()
+        # Timings for the phases of step(); a disabled profiler is a no-op
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+
+        # Run totals
+        self.frame = 0
+        self.elapsed = 0.0
+        self.asteroids_destroyed = 0
+
+    def register_snapshots(self):
+        """Tell logger.log_state() which groups and objects to capture"""
+        register_group("updatable", self.updatable)
+        register_group("drawable", self.drawable)
+        register_group("asteroids", self.asteroids)
+        register_group("shots", self.shots)
+        register_group("explosions", self.explosions)
+        register_group("bombs", self.bombs)
+        register_group("powerups", self.powerups)
+        if self.player is not None:
+            register_object("player", self.player)
+
+    def add_player(self, x=SCREEN_WIDTH / 2, y=SCREEN_HEIGHT / 2):
+        """Add a ship (and its laser) to the world"""
+        player = Player(x, y)
+        self.players.append(player)
+        self.lasers[player] = Laser(player)
+        return player
+
+    def remove_player(self, player):
+        player.kill()
+        self.players.remove(player)
+        del self.lasers[player]
+
+    def entity_counts(self):
+        """Live entities per group, for the profiler"""
+        return {
+            "asteroids": len(self.asteroids),
+            "shots": len(self.shots),
+            "explosions": len(self.explosions),
+            "particles": len(self.particles),
+            "bombs": len(self.bombs),
+            "powerups": len(self.powerups),
+        }
+
+    def step(self, dt, controls=None):
+        """Advance the simulation by dt seconds.
+
+        controls is the first ship's Controls, or a dict of Player ->
+        Controls; ships without an entry get no input.
+        """
+        if self.game_state.game_over:
+            return
+        game_state = self.game_state
+        if not isinstance(controls, dict):
+            controls = {self.player: controls} if controls is not None else {}
+        self.frame += 1
+        self.elapsed += dt
+
+        for player in self.players:
+            player_controls = controls.get(player) or Controls()
+            if player_controls.switch_weapon:
+                player.switch_weapon()
+            if player_controls.drop_bomb:
+                player.drop_bomb()
+            player.controls = player_controls
+
+        profiler = self.profiler
+        # Update game state (combo timer)
+        with profiler.phase("game_state"):
+            game_state.update(dt)
+
+        with profiler.phase("update"):
+            for obj in self.updatable:
+                obj.update(dt)
+
+        with profiler.phase("collide"):
+            if self._collide(game_state):
+                return
+            # Only now, so shots are swept over the step that takes them off-screen
+            self.shot_store.cull()
+
+        # Handle bomb explosions
+        with profiler.phase("bombs"):
+            for bomb in self.bombs:
+                if bomb.exploded:
+                    pos, radius = bomb.get_explosion_area()
+                    # Create visual explosion
+                    Explosion.acquire(pos.x, pos.y, radius)
+                    # Destroy all asteroids in radius
+                    spawned = []
+                    for asteroid in self.asteroid_grid.query_circle(pos, radius):
+                        if not asteroid.alive():
+                            continue
+                        distance = pos.distance_to(asteroid.position)
+                        if distance < radius + asteroid.radius:
+                            spawned.extend(self._destroy_asteroid(asteroid))
+                    self.asteroid_grid.insert_all(spawned)
+                    bomb.kill()
+
+        # Handle laser weapon
+        with profiler.phase("laser"):
+            for player in self.players:
+                laser = self.lasers[player]
+                if player.current_weapon == WeaponType.LASER and player.controls.fire:
+                    laser.active = True
+                    laser.update(dt)
+                    # Check laser-asteroid collisions
+                    if laser.can_damage():
+                        hits = [asteroid for _, asteroid in self.asteroid_grid.raycast(laser.start_pos, laser.end_pos)
+                                if asteroid.alive()]
+                        if hits:
+                            # Nearest asteroid first; piercing beams hit everything on the line
+                            for asteroid in (hits if laser.piercing else hits[:1]):
+                                self._destroy_asteroid(asteroid, combo=True)
+                            laser.reset_damage_timer()
+                else:
+                    laser.active = False
+
+        # Handle power-up collection
+        with profiler.phase("powerups"):
+            for player in self.players:
+                for powerup in self.powerup_grid.query_circle(player.position, player.radius):
+                    if powerup.alive() and player.collide_with(powerup):
+                        powerup.apply(player)
+                        powerup.kill()
+                        log_event("powerup_collected", powerup_type=powerup.__class__.__name__)
+
+            # Timed power-up spawning
+            self.powerup_spawn_timer += dt
+            if self.powerup_spawn_timer >= POWERUP_SPAWN_RATE:
+                self.powerup_spawn_timer = 0
+                x = _random.uniform(100, SCREEN_WIDTH - 100)
+                y = _random.uniform(100, SCREEN_HEIGHT - 100)
+                spawn_random_powerup(x, y)
+
+        collect_pools()
+
+    def _collide(self, game_state):
+        """Player and shot collisions; returns True if the game ended"""
+        # Broadphase: bucket asteroids and power-ups once per frame
+        # Asteroids are bucketed straight from the store's columns, in
+        # spawn order so every cell lists them as the group would
+        store = self.asteroid_store
+        rows = store.spawn_order()
+        self.asteroid_grid.rebuild_columns([store.handles[i] for i in rows.tolist()],
+                                           store.positions[rows], store.radii[rows])
+        self.powerup_grid.rebuild(self.powerups)
+        # Split fragments are not collidable until the phase after they spawn
+        spawned = []
+
+        # Player-asteroid collision (using triangular hitbox), tested in one
+        # batch straight from the asteroid store's arrays. An invincible,
+        # unshielded ship cannot interact with asteroids at all.
+        for player in self.players:
+            if player.invincible and not player.is_shielded():
+                nearby = []
+            else:
+                nearby = self.asteroid_grid.query_circle(player.position, player.bounding_radius())
+            if nearby:
+                rows = [obj.index for obj in nearby]
+                hits = player.hitbox().intersects_circles(store.positions[rows], store.radii[rows]).tolist()
+            else:
+                hits = []
+            for obj, hit in zip(nearby, hits):
+                if not hit or not obj.alive():
+                    continue
+                if not player.invincible and not player.is_shielded():
+                    if enabled("player_hit"):
+                        write_event("player_hit", player_pos=[player.position.x, player.position.y],
+                                    asteroid_pos=[obj.position.x, obj.position.y])
+                    game_state.lose_life()
+                    game_state.reset_combo()
+
+                    if game_state.game_over:
+                        return True
+                    # Respawn player
+                    player.respawn(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+                    log_event("player_respawn", lives=game_state.lives)
+                # Shield destroys asteroids on contact
+                elif player.is_shielded():
+                    spawned.extend(self._destroy_asteroid(obj, drop_powerup=True))
+
+        # Shot-asteroid collision, swept over the step so fast shots and
+        # large timesteps cannot tunnel through small asteroids. Each shot
+        # destroys the first live asteroid it reaches.
+        for shot, contacts in self._shot_contacts():
+            for toi, obj in contacts:
+                if obj.alive():
+                    if enabled("asteroid_shot"):
+                        write_event("asteroid_shot", asteroid_pos=[obj.position.x, obj.position.y],
+                                    shot_pos=[shot.position.x, shot.position.y], time_of_impact=toi)
+                    spawned.extend(self._destroy_asteroid(obj, combo=True, drop_powerup=True))
+                    shot.kill()
+                    break
+
+        self.asteroid_grid.insert_all(spawned)
+
+        return False
+
+    def _shot_contacts(self):
+        """(shot, [(time of impact, asteroid), ...]) for every shot that
+        touches an asteroid during the step, in shot order, with the
+        asteroids sorted by time of impact"""
+        shots = self.shot_store
+        asteroids = self.asteroid_store
+        n = len(asteroids)
+        if not self.shots or n == 0:
+            return []
+        # Asteroids moved too, so widen each shot's query by the farthest
+        # any asteroid travelled this step
+        moves = asteroids.positions[:n] - asteroids.previous_positions[:n]
+        travel = float(np.sqrt((moves ** 2).sum(axis=-1).max()))
+        pairs = []
+        for shot in self.shots:
+            reach = shot.radius + travel
+            for obj in self.asteroid_grid.query_segment(shot.previous_position, shot.position, reach):
+                if obj.alive():
+                    pairs.append((shot, obj))
+        if not pairs:
+            return []
+
+        shot_rows = [shot.index for shot, _ in pairs]
+        rows = [obj.index for _, obj in pairs]
+        starts = shots.previous_positions[shot_rows] - asteroids.previous_positions[rows]
+        ends = shots.positions[shot_rows] - asteroids.positions[rows]
+        tois = swept_circles_toi(starts, ends, shots.radii[shot_rows] + asteroids.radii[rows]).tolist()
+
+        contacts = {}
+        for (shot, obj), toi in zip(pairs, tois):
+            if toi <= 1:  # False for NaN, a miss
+                contacts.setdefault(shot, []).append((toi, obj))
+        for hits in contacts.values():
+            hits.sort(key=lambda hit: hit[0])
+        return list(contacts.items())
+
+    def _destroy_asteroid(self, asteroid, combo=False, drop_powerup=False):
+        """Score, explode and split an asteroid; returns the fragments"""
+        self.game_state.add_score(asteroid.radius)
+        if combo:
+            self.game_state.increment_combo()
+        Explosion.acquire(asteroid.position.x, asteroid.position.y, asteroid.radius)
+        # Chance to spawn power-up
+        if drop_powerup and _random.random() < POWERUP_DROP_CHANCE:
+            spawn_random_powerup(asteroid.position.x, asteroid.position.y)
+        fragments = asteroid.split()
+        asteroid.kill()
+        self.asteroids_destroyed += 1
+        return fragments
+
+    def bounding_rects(self):
+        """Areas every drawable will touch this frame"""
+        rects = [obj.bounding_rect() for obj in self.drawable]
+        rects.extend(laser.bounding_rect() for laser in self.lasers.values())
+        rects.extend(self.shot_store.rects())
+        rects.extend(self.particles.tile_rects())
+        return [rect for rect in rects if rect is not None]
+
+    def draw(self, screen):
+        for obj in self.drawable:
+            obj.draw(screen)
+
+        # Draw lasers (on top of other objects)
+        for laser in self.lasers.values():
+            laser.draw(screen)
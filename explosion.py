@@ -1,41 +1,15 @@
 import pygame
-import random
-import math
+from particles import ParticleSystem
+from pool import Pooled
 
 
-class Particle:
-    """Individual explosion particle"""
-    def __init__(self, x, y, angle, speed, lifetime):
-        self.position = pygame.Vector2(x, y)
-        self.velocity = pygame.Vector2(
-            math.cos(angle) * speed,
-            math.sin(angle) * speed
-        )
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.size = random.randint(2, 5)
-
-    def update(self, dt):
-        self.position += self.velocity * dt
-        self.velocity *= 0.95  # Friction/slowdown
-        self.lifetime -= dt
-        return self.lifetime > 0
-
-    def draw(self, screen):
-        # Fade out as lifetime decreases
-        alpha_ratio = self.lifetime / self.max_lifetime
-        color = (
-            int(255 * alpha_ratio),
-            int(200 * alpha_ratio),
-            int(100 * alpha_ratio)
-        )
-        pygame.draw.circle(screen, color,
-                          (int(self.position.x), int(self.position.y)),
-                          max(1, int(self.size * alpha_ratio)))
-
+class Explosion(Pooled, pygame.sprite.Sprite):
+    """Expanding ring plus a burst emitted into the shared particle system"""
 
-class Explosion(pygame.sprite.Sprite):
-    """Particle explosion effect"""
+    # Shared particle storage; main() swaps in one registered with the groups
+    particles = ParticleSystem()
+    # Cleared by the frame governor to skip the rings under load
+    draw_rings = True
 
     def __init__(self, x, y, radius):
         if hasattr(self, "containers"):
@@ -44,21 +18,22 @@ class Explosion(pygame.sprite.Sprite):
             super().__init__()
 
         self.position = pygame.Vector2(x, y)
-        self.particles = []
+        self._start(radius)
+
+    def reset(self, x, y, radius):
+        if hasattr(self, "containers"):
+            self.add(self.containers)
+        self.position.update(x, y)
+        self._start(radius)
+
+    def _start(self, radius):
         self.expanding_ring_radius = 0
         self.ring_max_radius = radius * 1.5
         self.ring_speed = radius * 3  # Expands faster for bigger asteroids
         self.lifetime = 0.5  # Total explosion duration
 
-        # Create particles
-        num_particles = int(radius / 3) + 5
-        for _ in range(num_particles):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(50, 150)
-            particle_lifetime = random.uniform(0.3, 0.6)
-            self.particles.append(
-                Particle(x, y, angle, speed, particle_lifetime)
-            )
+        # Emit particles
+        self.particles.emit(self.position.x, self.position.y, int(radius / 3) + 5)
 
     def update(self, dt):
         self.lifetime -= dt
@@ -66,16 +41,18 @@ class Explosion(pygame.sprite.Sprite):
         # Expand ring
         self.expanding_ring_radius += self.ring_speed * dt
 
-        # Update particles
-        self.particles = [p for p in self.particles if p.update(dt)]
-
-        # Remove when done
-        if self.lifetime <= 0 and len(self.particles) == 0:
+        # Remove when done (particles live on in the particle system)
+        if self.lifetime <= 0:
             self.kill()
 
+    def bounding_rect(self):
+        extent = int(min(self.expanding_ring_radius, self.ring_max_radius)) + 4
+        return pygame.Rect(int(self.position.x) - extent, int(self.position.y) - extent,
+                           extent * 2, extent * 2)
+
     def draw(self, screen):
         # Draw expanding ring (fades out)
-        if self.expanding_ring_radius < self.ring_max_radius:
+        if self.draw_rings and self.expanding_ring_radius < self.ring_max_radius:
             alpha_ratio = 1 - (self.expanding_ring_radius / self.ring_max_radius)
             ring_color = (
                 int(255 * alpha_ratio),
@@ -85,7 +62,3 @@ class Explosion(pygame.sprite.Sprite):
             pygame.draw.circle(screen, ring_color,
                              (int(self.position.x), int(self.position.y)),
                              int(self.expanding_ring_radius), 2)
-
-        # Draw particles
-        for particle in self.particles:
-            particle.draw(screen)
@@ -1,6 +1,20 @@
 from constants import (SCORE_SMALL, SCORE_MEDIUM, SCORE_LARGE, COMBO_TIMEOUT,
                        COMBO_MAX, STARTING_LIVES, ASTEROID_MIN_RADIUS)
 
+def score_bands():
+    """(largest radius, points) from small to large; bigger asteroids
+    score SCORE_LARGE"""
+    return ((ASTEROID_MIN_RADIUS, SCORE_SMALL), (ASTEROID_MIN_RADIUS * 2, SCORE_MEDIUM))
+
+
+def base_score(asteroid_radius):
+    """Points for destroying an asteroid, before the combo multiplier"""
+    # Smaller asteroids = more points
+    for max_radius, points in score_bands():
+        if asteroid_radius <= max_radius:
+            return points
+    return SCORE_LARGE
+
 
 class GameState:
     def __init__(self):
@@ -12,15 +26,7 @@ class GameState:
 
     def add_score(self, asteroid_radius):
         """Calculate and add score based on asteroid size with combo multiplier"""
-        # Smaller asteroids = more points
-        if asteroid_radius <= ASTEROID_MIN_RADIUS:
-            base_score = SCORE_SMALL
-        elif asteroid_radius <= ASTEROID_MIN_RADIUS * 2:
-            base_score = SCORE_MEDIUM
-        else:
-            base_score = SCORE_LARGE
-
-        self.score += base_score * self.combo_multiplier
+        self.score += base_score(asteroid_radius) * self.combo_multiplier
 
     def increment_combo(self):
         """Increase combo multiplier and reset timer"""
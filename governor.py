@@ -0,0 +1,105 @@
+from collections import deque
+from dataclasses import dataclass
+from constants import (FRAME_BUDGET_MS, GOVERNOR_WINDOW_FRAMES, GOVERNOR_RESTORE_RATIO,
+                       GOVERNOR_RESTORE_FRAMES, PARTICLE_CAPACITY)
+from asteroid import Asteroid
+from explosion import Explosion
+from logger import log_event, pause_snapshots
+
+__all__ = ["QualityLevel", "QUALITY_LEVELS", "QualityGovernor"]
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    particle_limit: int        # Live particles the particle system accepts
+    particle_lifetime: float   # Scale on new particles' lifetimes
+    explosion_rings: bool      # Draw the expanding explosion rings
+    asteroid_vertex_step: int  # Draw every nth outline vertex
+    log_state: bool            # Keep logger.log_state() snapshots running
+
+
+# Level 0 is full quality; each later level trades more detail for time
+QUALITY_LEVELS = (
+    QualityLevel(PARTICLE_CAPACITY, 1.0, True, 1, True),
+    QualityLevel(1024, 0.75, True, 1, False),
+    QualityLevel(512, 0.5, False, 1, False),
+    QualityLevel(128, 0.5, False, 2, False),
+)
+
+
+class QualityGovernor:
+    """Adapts render quality to keep frame work inside a budget.
+
+    record() takes each frame's work time. Once a window of frames
+    averages over the budget, quality drops one level. It rises again only
+    after a level has held for GOVERNOR_RESTORE_FRAMES and a window
+    averages under GOVERNOR_RESTORE_RATIO of the budget, so it does not
+    flip back and forth around the limit. The knobs only change how
+    effects are drawn and logged, never the game rules.
+    """
+
+    def __init__(self, world, budget_ms=FRAME_BUDGET_MS, levels=QUALITY_LEVELS):
+        self.world = world
+        self.budget_ms = budget_ms
+        self.levels = levels
+        self.level = 0
+        self.samples = deque(maxlen=GOVERNOR_WINDOW_FRAMES)
+        self.frames_at_level = 0
+        # Stats
+        self.downgrades = 0
+        self.upgrades = 0
+        self.frames_per_level = [0] * len(levels)
+        self.apply()
+
+    @property
+    def quality(self):
+        return self.levels[self.level]
+
+    def set_world(self, world):
+        """Point at a new world (e.g. after a quick-load) and reapply"""
+        self.world = world
+        self.apply()
+
+    def record(self, frame_ms):
+        """Account one frame's work time; returns True if the level changed"""
+        self.samples.append(frame_ms)
+        self.frames_at_level += 1
+        self.frames_per_level[self.level] += 1
+        if len(self.samples) < self.samples.maxlen:
+            return False
+        mean = sum(self.samples) / len(self.samples)
+        if mean > self.budget_ms and self.level < len(self.levels) - 1:
+            self.downgrades += 1
+            self._change(self.level + 1, mean)
+            return True
+        if (mean < self.budget_ms * GOVERNOR_RESTORE_RATIO and self.level > 0
+                and self.frames_at_level >= GOVERNOR_RESTORE_FRAMES):
+            self.upgrades += 1
+            self._change(self.level - 1, mean)
+            return True
+        return False
+
+    def _change(self, level, mean):
+        self.level = level
+        self.samples.clear()  # Judge the new level on its own frames
+        self.frames_at_level = 0
+        self.apply()
+        log_event("quality_changed", level=level, frame_ms=round(mean, 2))
+
+    def apply(self):
+        quality = self.quality
+        particles = self.world.particles
+        particles.limit = min(quality.particle_limit, particles.capacity)
+        particles.lifetime_scale = quality.particle_lifetime
+        Explosion.draw_rings = quality.explosion_rings
+        Asteroid.vertex_step = quality.asteroid_vertex_step
+        pause_snapshots(not quality.log_state)
+
+    def stats(self):
+        return {
+            "level": self.level,
+            "budget_ms": self.budget_ms,
+            "downgrades": self.downgrades,
+            "upgrades": self.upgrades,
+            "frames_per_level": list(self.frames_per_level),
+        }
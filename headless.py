@@ -0,0 +1,115 @@
+import argparse
+import json
+import time
+import pygame
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, FIXED_TIMESTEP
+from controls import Controls
+from engine import GameWorld
+from replay import InputRecorder, new_seed
+
+__all__ = ["run_headless", "idle_pilot", "gunner_pilot", "PILOTS"]
+
+
+def idle_pilot(frame, world):
+    """Never touches the controls"""
+    return Controls()
+
+
+def gunner_pilot(frame, world):
+    """Turns toward the nearest asteroid and holds fire, cycling weapons
+    every ten seconds and dropping a bomb when one is close"""
+    player = world.player
+    controls = Controls(fire=True)
+    controls.switch_weapon = frame > 0 and frame % 600 == 0
+
+    nearest = None
+    nearest_distance = float("inf")
+    for asteroid in world.asteroids:
+        distance = player.position.distance_squared_to(asteroid.position)
+        if distance < nearest_distance:
+            nearest, nearest_distance = asteroid, distance
+    if nearest is None:
+        return controls
+
+    forward = pygame.Vector2(0, 1).rotate(player.rotation)
+    angle = forward.angle_to(nearest.position - player.position)
+    angle = (angle + 180) % 360 - 180
+    controls.turn_right = angle > 5
+    controls.turn_left = angle < -5
+    controls.drop_bomb = nearest_distance < 80 ** 2
+    return controls
+
+
+PILOTS = {
+    "idle": idle_pilot,
+    "gunner": gunner_pilot,
+}
+
+
+def run_headless(seconds=60.0, dt=FIXED_TIMESTEP, pilot=gunner_pilot, render=False,
+                 world=None, seed=None, record_path=None):
+    """Run the game rules as fast as possible for `seconds` of game time.
+
+    Stops early on game over. Returns a summary of the run; with render=True
+    every frame is also drawn to an offscreen surface. With record_path the
+    pilot's inputs are saved for replay.py (a seed is picked if none given).
+    """
+    if record_path and seed is None:
+        seed = new_seed()
+    world = world if world is not None else GameWorld(seed=seed)
+    recorder = InputRecorder(seed, dt) if record_path else None
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)) if render else None
+    frames = int(round(seconds / dt))
+    frame_times = []
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        frame_start = time.perf_counter()
+        controls = pilot(frame, world)
+        world.step(dt, controls)
+        if recorder is not None:
+            recorder.record(controls)
+        if surface is not None:
+            surface.fill((0, 0, 20))
+            world.draw(surface)
+        frame_times.append(time.perf_counter() - frame_start)
+        if world.game_state.game_over:
+            break
+    wall_seconds = time.perf_counter() - start
+    if recorder is not None:
+        recorder.save(record_path, world)
+
+    frame_times.sort()
+    return {
+        "seed": seed,
+        "frames": world.frame,
+        "game_seconds": round(world.elapsed, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "speedup": round(world.elapsed / wall_seconds, 1) if wall_seconds else None,
+        "score": world.game_state.score,
+        "lives": world.game_state.lives,
+        "game_over": world.game_state.game_over,
+        "asteroids_destroyed": world.asteroids_destroyed,
+        "asteroid_population": world.asteroid_field.population.stats(),
+        "frame_ms_mean": round(1000 * sum(frame_times) / len(frame_times), 4) if frame_times else 0,
+        "frame_ms_max": round(1000 * frame_times[-1], 4) if frame_times else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Asteroids without a window")
+    parser.add_argument("--seconds", type=float, default=60.0, help="game time to simulate")
+    parser.add_argument("--dt", type=float, default=FIXED_TIMESTEP, help="seconds per simulation step")
+    parser.add_argument("--seed", type=int, help="seed every RNG stream for a reproducible run")
+    parser.add_argument("--record", metavar="PATH", help="save the pilot's inputs for replay.py")
+    parser.add_argument("--pilot", choices=sorted(PILOTS), default="gunner")
+    parser.add_argument("--render", action="store_true", help="also draw each frame offscreen")
+    args = parser.parse_args()
+
+    summary = run_headless(args.seconds, args.dt, PILOTS[args.pilot], args.render,
+                           seed=args.seed, record_path=args.record)
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
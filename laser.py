@@ -1,5 +1,5 @@
 import pygame
-from constants import LASER_MAX_LENGTH, LASER_WIDTH, SCREEN_WIDTH, SCREEN_HEIGHT
+from constants import LASER_MAX_LENGTH, LASER_WIDTH, LASER_PIERCING, SCREEN_WIDTH, SCREEN_HEIGHT
 
 
 class Laser(pygame.sprite.Sprite):
@@ -17,6 +17,7 @@ class Laser(pygame.sprite.Sprite):
         self.end_pos = None
         self.active = False
         self.damage_timer = 0
+        self.piercing = LASER_PIERCING
 
     def update(self, dt):
         if not self.active:
@@ -42,6 +43,14 @@ class Laser(pygame.sprite.Sprite):
             pygame.draw.line(screen, (255, 100, 100),
                            self.start_pos, self.end_pos, LASER_WIDTH + 2)
 
+    def bounding_rect(self):
+        """Screen area covered by the beam, or None when not drawn"""
+        if not (self.active and self.start_pos and self.end_pos):
+            return None
+        rect = pygame.Rect(self.start_pos, (0, 0))
+        rect.union_ip(pygame.Rect(self.end_pos, (0, 0)))
+        return rect.inflate(LASER_WIDTH * 2 + 4, LASER_WIDTH * 2 + 4)
+
     def check_collision(self, asteroid):
         """Check if laser intersects with asteroid circle"""
         if not self.active or not self.start_pos or not self.end_pos:
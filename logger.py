@@ -1,123 +1,407 @@
-import inspect
+import atexit
 import json
 import math
+import os
+import queue
+import sys
+import threading
+import time
 from datetime import datetime
 
-__all__ = ["log_state", "log_event"]
+__all__ = ["log_state", "log_event", "write_event", "enabled", "configure_events",
+           "DEBUG", "INFO", "WARNING", "OFF", "flush_logs", "log_writer_stats",
+           "register_group", "register_object", "register_value",
+           "clear_snapshots", "configure_snapshots", "pause_snapshots"]
 
 _FPS = 60
-_MAX_SECONDS = 16
-_SPRITE_SAMPLE_LIMIT = 10  # Maximum number of sprites to log per group
+_SPRITE_SAMPLE_LIMIT = 10  # Default number of sprites to log per group
+
+# Background writer settings
+_QUEUE_SIZE = 8192       # Entries buffered before the overflow policy applies
+_BATCH_SIZE = 256        # Entries written per file write
+_FLUSH_INTERVAL = 0.25   # Seconds a partial batch may wait before writing
+_OVERFLOW_POLICY = "drop_oldest"  # "drop_oldest", "drop_newest" or "block"
+_CLOSE_TIMEOUT = 5.0     # Seconds close() waits for the writer thread
+
+# Event levels: an event is written when its level is at least the threshold
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100  # As a threshold: no events at all
+_LEVEL_NAMES = {"debug": DEBUG, "info": INFO, "warning": WARNING, "off": OFF}
+# Per-frame events are DEBUG, so even at the INFO threshold they stay off
+_EVENT_LEVELS = {
+    "asteroid_shot": DEBUG,
+    "asteroid_split": DEBUG,
+    "asteroid_culled": DEBUG,
+    "player_hit": INFO,
+    "player_respawn": INFO,
+    "powerup_collected": INFO,
+    "quality_changed": INFO,
+}
+_DEFAULT_EVENT_LEVEL = INFO
 
 _frame_count = 0
-_state_log_initialized = False
-_event_log_initialized = False
 _start_time = datetime.now()
 
+# Event filter settings; see configure_events(). Events are off unless a
+# level is set, so cabinet builds write no event log
+_event_threshold = OFF
+_enabled_events = set()  # Written whatever their level
+_disabled_events = set()  # Never written
+_sample_every = {}  # event type -> write one in every n
+# event type -> 0 (off), 1 (on) or n (one in n); filled lazily by enabled()
+_event_decisions = {}
+_sample_counts = {}
+
+# Snapshot registry: name -> (kind, target, sample_limit)
+_snapshot_targets = {}
+_snapshot_interval = _FPS  # Frames between snapshots, approx. once per second
+_snapshots_paused = False  # Frames still count while paused
+
+
+class _LogWriter:
+    """Appends JSON lines to one file from a background thread.
+
+    The game thread only enqueues dicts. The writer thread serialises them
+    and writes in batches, when a batch fills or _FLUSH_INTERVAL passes.
+    The file is truncated when the first entry arrives, so each run starts
+    a new log; after close() a later entry reopens it for appending.
+    Entries that cannot be serialised or written are counted as dropped,
+    and the thread keeps draining the queue so the game never blocks on it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.queue = queue.Queue(maxsize=_QUEUE_SIZE)
+        self.dropped = 0
+        self.written = 0
+        self._opened = False
+        self._warned = False
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def put(self, entry):
+        if self._thread is None:
+            self._start()
+        if _OVERFLOW_POLICY == "block":
+            if not self._thread.is_alive():
+                self.dropped += 1  # Nothing would ever make room
+                return
+            self.queue.put(entry)
+            return
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+            if _OVERFLOW_POLICY == "drop_oldest":
+                try:
+                    self.queue.get_nowait()
+                    self.queue.put_nowait(entry)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"log-writer:{self.path}", daemon=True)
+                self._thread.start()
+
+    def _warn(self, error):
+        if not self._warned:
+            self._warned = True
+            print(f"Log writer for {self.path} is dropping entries: {error}", file=sys.stderr)
+
+    def _open(self):
+        mode = "a" if self._opened else "w"
+        self._opened = True
+        try:
+            return open(self.path, mode)
+        except OSError as error:
+            self._warn(error)
+            return None  # Entries are still drained, and counted as dropped
+
+    def _next_batch(self):
+        """Serialised entries up to a full batch or the flush deadline, and
+        whether close() asked the thread to stop"""
+        batch = []
+        deadline = time.monotonic() + _FLUSH_INTERVAL
+        while len(batch) < _BATCH_SIZE:
+            try:
+                entry = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if entry is None:
+                return batch, True
+            try:
+                batch.append(json.dumps(entry))
+            except (TypeError, ValueError, RecursionError) as error:
+                self.dropped += 1
+                self._warn(error)
+        return batch, False
+
+    def _write(self, f, batch):
+        if f is None:
+            self.dropped += len(batch)
+            return
+        try:
+            f.write("\n".join(batch) + "\n")
+            f.flush()
+        except OSError as error:
+            self.dropped += len(batch)
+            self._warn(error)
+            return
+        self.written += len(batch)
+
+    def _run(self):
+        f = self._open()
+        try:
+            while True:
+                batch, stop = self._next_batch()
+                if batch:
+                    self._write(f, batch)
+                if stop:
+                    return
+        finally:
+            if f is not None:
+                try:
+                    f.close()
+                except OSError as error:
+                    self._warn(error)
+
+    def close(self):
+        """Write everything queued so far and stop the thread"""
+        if self._thread is None:
+            return
+        try:
+            if self._thread.is_alive():
+                self.queue.put(None, timeout=_CLOSE_TIMEOUT)
+                self._thread.join(_CLOSE_TIMEOUT)
+        except queue.Full:
+            pass
+        if self._thread.is_alive():
+            return  # Still busy; a later close() tries again
+        self._thread = None
+        # Anything the thread left behind would otherwise be written by the
+        # next run, or fill the queue
+        while True:
+            try:
+                entry = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not None:
+                self.dropped += 1
+
+
+_state_writer = _LogWriter("game_state.jsonl")
+_event_writer = _LogWriter("game_events.jsonl")
+
+
+@atexit.register
+def flush_logs():
+    """Block until every queued entry is on disk; logging may resume after"""
+    _state_writer.close()
+    _event_writer.close()
+
+
+def log_writer_stats():
+    return {
+        writer.path: {"queued": writer.queue.qsize(), "written": writer.written,
+                      "dropped": writer.dropped}
+        for writer in (_state_writer, _event_writer)
+    }
 
-def log_state():
-    global _frame_count, _state_log_initialized
 
-    # Stop logging after `_MAX_SECONDS` seconds
-    if _frame_count > _FPS * _MAX_SECONDS:
-        return
+def register_group(name, group, sample_limit=_SPRITE_SAMPLE_LIMIT):
+    """Capture a sprite group under `name` in every state snapshot.
 
-    # Take a snapshot approx. once per second
-    _frame_count += 1
-    if _frame_count % _FPS != 0:
-        return
+    Each snapshot records the group's size and up to sample_limit sprites
+    (None for all of them). Registering a name again replaces it.
+    """
+    _snapshot_targets[name] = ("group", group, sample_limit)
 
-    now = datetime.now()
 
-    frame = inspect.currentframe()
-    if frame is None:
-        return
+def register_object(name, obj):
+    """Capture one sprite-like object under `name` in every state snapshot"""
+    _snapshot_targets[name] = ("object", obj, None)
 
-    frame_back = frame.f_back
-    if frame_back is None:
-        return
 
-    local_vars = frame_back.f_locals.copy()
+def register_value(name, getter):
+    """Capture getter() under `name` in every state snapshot"""
+    _snapshot_targets[name] = ("value", getter, None)
 
-    screen_size = []
-    game_state = {}
 
-    for key, value in local_vars.items():
-        if "pygame" in str(type(value)) and hasattr(value, "get_size"):
-            screen_size = value.get_size()
+def clear_snapshots():
+    _snapshot_targets.clear()
 
-        if hasattr(value, "__class__") and "Group" in value.__class__.__name__:
-            sprites_data = []
 
-            for i, sprite in enumerate(value):
-                if i >= _SPRITE_SAMPLE_LIMIT:
-                    break
+def configure_snapshots(interval_frames=None, sample_limit=None):
+    """Change how often log_state() samples and the default group sample limit"""
+    global _snapshot_interval
+    if interval_frames is not None:
+        _snapshot_interval = max(1, int(interval_frames))
+    if sample_limit is not None:
+        for name, (kind, target, limit) in _snapshot_targets.items():
+            if kind == "group":
+                _snapshot_targets[name] = (kind, target, sample_limit)
 
-                sprite_info = {"type": sprite.__class__.__name__}
 
-                if hasattr(sprite, "position"):
-                    sprite_info["pos"] = [
-                        round(sprite.position.x, 2),
-                        round(sprite.position.y, 2),
-                    ]
+def pause_snapshots(paused=True):
+    """Skip log_state() snapshots (e.g. while frames are over budget)"""
+    global _snapshots_paused
+    _snapshots_paused = paused
 
-                if hasattr(sprite, "velocity"):
-                    sprite_info["vel"] = [
-                        round(sprite.velocity.x, 2),
-                        round(sprite.velocity.y, 2),
-                    ]
 
-                if hasattr(sprite, "radius"):
-                    sprite_info["rad"] = sprite.radius
+def _sprite_info(sprite):
+    sprite_info = {"type": sprite.__class__.__name__}
 
-                if hasattr(sprite, "rotation"):
-                    sprite_info["rot"] = round(sprite.rotation, 2)
+    if hasattr(sprite, "position"):
+        sprite_info["pos"] = [
+            round(sprite.position.x, 2),
+            round(sprite.position.y, 2),
+        ]
 
-                sprites_data.append(sprite_info)
+    if hasattr(sprite, "velocity"):
+        sprite_info["vel"] = [
+            round(sprite.velocity.x, 2),
+            round(sprite.velocity.y, 2),
+        ]
 
-            game_state[key] = {"count": len(value), "sprites": sprites_data}
+    if hasattr(sprite, "radius"):
+        sprite_info["rad"] = sprite.radius
 
-        if len(game_state) == 0 and hasattr(value, "position"):
-            sprite_info = {"type": value.__class__.__name__}
+    if hasattr(sprite, "rotation"):
+        sprite_info["rot"] = round(sprite.rotation, 2)
 
-            sprite_info["pos"] = [
-                round(value.position.x, 2),
-                round(value.position.y, 2),
-            ]
+    return sprite_info
 
-            if hasattr(value, "velocity"):
-                sprite_info["vel"] = [
-                    round(value.velocity.x, 2),
-                    round(value.velocity.y, 2),
-                ]
 
-            if hasattr(value, "radius"):
-                sprite_info["rad"] = value.radius
+def log_state():
+    """Call once per frame; writes a snapshot of the registered targets
+    every `_snapshot_interval` frames"""
+    global _frame_count
 
-            if hasattr(value, "rotation"):
-                sprite_info["rot"] = round(value.rotation, 2)
+    _frame_count += 1
+    if _snapshots_paused or _frame_count % _snapshot_interval != 0:
+        return
 
-            game_state[key] = sprite_info
+    now = datetime.now()
 
     entry = {
         "timestamp": now.strftime("%H:%M:%S.%f")[:-3],
         "elapsed_s": math.floor((now - _start_time).total_seconds()),
         "frame": _frame_count,
-        "screen_size": screen_size,
-        **game_state,
     }
 
-    # New log file on each run
-    mode = "w" if not _state_log_initialized else "a"
-    with open("game_state.jsonl", mode) as f:
-        f.write(json.dumps(entry) + "\n")
-
-    _state_log_initialized = True
+    for name, (kind, target, sample_limit) in _snapshot_targets.items():
+        if kind == "group":
+            sprites = target.sprites()
+            if sample_limit is not None:
+                sprites = sprites[:sample_limit]
+            entry[name] = {
+                "count": len(target),
+                "sprites": [_sprite_info(sprite) for sprite in sprites],
+            }
+        elif kind == "object":
+            entry[name] = _sprite_info(target)
+        else:
+            entry[name] = target()
+
+    _state_writer.put(entry)
+
+
+def configure_events(level=None, enable=None, disable=None, sample=None, levels=None):
+    """Set which events log_event() writes.
+
+    level is the threshold (DEBUG, INFO, WARNING, OFF or their lowercase
+    names); enable and disable name event types that bypass it either way;
+    sample maps event types to n to write only one in every n; levels
+    changes the level of event types. Arguments left as None keep their
+    current setting.
+    """
+    global _event_threshold
+    if level is not None:
+        _event_threshold = _parse_level(level)
+    if enable is not None:
+        _enabled_events.clear()
+        _enabled_events.update(enable)
+    if disable is not None:
+        _disabled_events.clear()
+        _disabled_events.update(disable)
+    if sample is not None:
+        _sample_every.clear()
+        _sample_every.update((event_type, max(1, int(n))) for event_type, n in sample.items())
+    if levels is not None:
+        _EVENT_LEVELS.update((event_type, _parse_level(value)) for event_type, value in levels.items())
+    _event_decisions.clear()
+    _sample_counts.clear()
+
+
+def _parse_level(level):
+    if isinstance(level, str):
+        if level.lower() not in _LEVEL_NAMES:
+            raise ValueError(f"unknown log level {level!r}; expected one of {', '.join(_LEVEL_NAMES)}")
+        return _LEVEL_NAMES[level.lower()]
+    return int(level)
+
+
+def _configure_from_environment():
+    """ASTEROIDS_LOG_LEVEL=debug|info|warning|off, ASTEROIDS_LOG_ENABLE and
+    ASTEROIDS_LOG_DISABLE=type,type, ASTEROIDS_LOG_SAMPLE=type=n,type=n.
+    Invalid settings are reported and the defaults kept."""
+    def names(variable):
+        value = os.environ.get(variable)
+        return None if value is None else {name.strip() for name in value.split(",") if name.strip()}
+
+    try:
+        sample = os.environ.get("ASTEROIDS_LOG_SAMPLE")
+        if sample is not None:
+            sample = {key.strip(): int(n) for key, _, n in
+                      (item.partition("=") for item in sample.split(",") if item.strip())}
+        configure_events(level=os.environ.get("ASTEROIDS_LOG_LEVEL"), enable=names("ASTEROIDS_LOG_ENABLE"),
+                         disable=names("ASTEROIDS_LOG_DISABLE"), sample=sample)
+    except ValueError as error:
+        print(f"Ignoring ASTEROIDS_LOG_* settings: {error}", file=sys.stderr)
+        configure_events(level=OFF, enable=(), disable=(), sample={})
+
+
+def _decide(event_type):
+    if event_type in _disabled_events:
+        every = 0
+    elif event_type in _enabled_events or _EVENT_LEVELS.get(event_type, _DEFAULT_EVENT_LEVEL) >= _event_threshold:
+        every = _sample_every.get(event_type, 1)
+    else:
+        every = 0
+    _event_decisions[event_type] = every
+    return every
+
+
+def enabled(event_type):
+    """Whether the next event of this type would be written.
+
+    Guard hot call sites with it so a filtered event costs one dict lookup
+    and builds no arguments; follow a True with write_event(). Each call
+    counts towards the type's sampling.
+    """
+    every = _event_decisions.get(event_type)
+    if every is None:
+        every = _decide(event_type)
+    if every <= 1:
+        return every == 1
+    count = _sample_counts.get(event_type, 0)
+    _sample_counts[event_type] = count + 1
+    return count % every == 0
 
 
 def log_event(event_type, **details):
-    global _event_log_initialized
+    """Write an event if the filters let it through"""
+    if enabled(event_type):
+        write_event(event_type, **details)
+
 
+def write_event(event_type, **details):
+    """Write an event unconditionally (after enabled() said yes)"""
     now = datetime.now()
 
     event = {
@@ -128,8 +412,7 @@ def log_event(event_type, **details):
         **details,
     }
 
-    mode = "w" if not _event_log_initialized else "a"
-    with open("game_events.jsonl", mode) as f:
-        f.write(json.dumps(event) + "\n")
+    _event_writer.put(event)
+
 
-    _event_log_initialized = True
\ No newline at end of file
+_configure_from_environment()
@@ -1,20 +1,23 @@
+import argparse
 import pygame
 import sys
-import random
-from constants import SCREEN_HEIGHT, SCREEN_WIDTH
-from logger import log_state, log_event
-from player import Player
-from asteroid import Asteroid
-from asteroidfield import AsteroidField
-from shot import Shot
-from game_state import GameState
+from dataclasses import replace
+from functools import partial
+from constants import (SCREEN_HEIGHT, SCREEN_WIDTH, FIXED_TIMESTEP, MAX_STEPS_PER_FRAME, QUICKSAVE_PATH,
+                       FRAME_BUDGET_MS)
+from logger import log_state, register_value
+from engine import GameWorld
+from controls import read_keyboard
 from ui import UI
-from explosion import Explosion
-from bomb import Bomb
-from laser import Laser
-from weapons import WeaponType
-from powerup import PowerUp, ShieldPowerUp, SpeedPowerUp
-from constants import POWERUP_DROP_CHANCE, POWERUP_SPAWN_RATE
+from renderer import DirtyRectRenderer
+from replay import InputRecorder, load_recording, new_seed, world_digest
+from rng import stream
+from profiler import FrameProfiler
+from governor import QualityGovernor
+from assets import AssetCache
+import savestate
+
+_random = stream("starfield")
 
 
 def create_starfield(screen_size):
@@ -24,186 +27,187 @@ def create_starfield(screen_size):
 
     # Add random stars
     for _ in range(150):
-        x = random.randint(0, screen_size[0])
-        y = random.randint(0, screen_size[1])
-        brightness = random.randint(100, 255)
+        x = _random.randint(0, screen_size[0])
+        y = _random.randint(0, screen_size[1])
+        brightness = _random.randint(100, 255)
         color = (brightness, brightness, brightness)
-        size = random.choice([1, 1, 1, 2])  # Most stars are small
+        size = _random.choice([1, 1, 1, 2])  # Most stars are small
         pygame.draw.circle(surface, color, (x, y), size)
 
     return surface
 
 
-def spawn_random_powerup(x, y):
-    """Spawn a random power-up at the given position"""
-    powerup_types = [ShieldPowerUp, SpeedPowerUp]
-    powerup_class = random.choice(powerup_types)
-    return powerup_class(x, y)
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Asteroids")
+    parser.add_argument("--seed", type=int, help="deterministic fixed-step run with this seed")
+    parser.add_argument("--record", metavar="PATH", help="record inputs for bit-identical replay")
+    parser.add_argument("--replay", metavar="PATH", help="play back a recording instead of the keyboard")
+    parser.add_argument("--dirty-rects", action="store_true", help="only redraw and present changed areas")
+    parser.add_argument("--profile", action="store_true", help="time frame phases and show them (toggle with F3)")
+    parser.add_argument("--asset-stats", action="store_true", help="print asset load and blit costs on exit")
+    parser.add_argument("--trace", metavar="PATH", help="write a Chrome trace of the last frames on exit (implies --profile)")
+    parser.add_argument("--frame-budget", type=float, default=FRAME_BUDGET_MS, metavar="MS",
+                        help="lower effect quality when frames take longer than this (0, or a seeded run, keeps full quality)")
+    return parser.parse_args(argv)
+
 
-def main():
+def main(argv=None):
+    args = parse_args(argv)
     print(f"Starting Asteroids with pygame version: {pygame.version.ver}")
     print(f"Screen width: {SCREEN_WIDTH} \nScreen height: {SCREEN_HEIGHT}")
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     clock = pygame.time.Clock()
     dt = 0
-    background = create_starfield((SCREEN_WIDTH, SCREEN_HEIGHT))
-    updatable = pygame.sprite.Group()
-    drawable = pygame.sprite.Group()
-    asteroids = pygame.sprite.Group()
-    shots = pygame.sprite.Group()
-    explosions = pygame.sprite.Group()
-    bombs = pygame.sprite.Group()
-    powerups = pygame.sprite.Group()
-    Player.containers = (updatable, drawable)
-    Asteroid.containers = (asteroids, updatable, drawable)
-    AsteroidField.containers = (updatable,)
-    Shot.containers = (shots, updatable, drawable)
-    Explosion.containers = (explosions, updatable, drawable)
-    Bomb.containers = (bombs, updatable, drawable)
-    PowerUp.containers = (powerups, updatable, drawable)
-    ShieldPowerUp.containers = (powerups, updatable, drawable)
-    SpeedPowerUp.containers = (powerups, updatable, drawable)
-    asteroid_field = AsteroidField()
-    player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-    game_state = GameState()
-    ui = UI(screen)
-    player_laser = Laser(player)
-    powerup_spawn_timer = 0.0
+
+    # Deterministic mode: seeded RNG streams and a fixed simulation step
+    recording = load_recording(args.replay) if args.replay else None
+    seed = recording.seed if recording else args.seed
+    if args.record and seed is None:
+        seed = new_seed()
+    deterministic = seed is not None
+    recorder = InputRecorder(seed) if args.record else None
+    input_source = recording.input_source() if recording else None
+    accumulator = 0.0
+    pending_switch = pending_bomb = False
+
+    profiler = FrameProfiler(enabled=args.profile or args.trace is not None)
+    show_profile = args.profile
+    profile_font = pygame.font.Font(None, 20)
+    overlay = partial(profiler.draw_overlay, font=profile_font)
+
+    world = GameWorld(seed=seed, profiler=profiler)
+    # Particle state is in the replay digest and save states, and the level
+    # depends on this machine's frame times, so seeded runs keep full quality
+    governor = (QualityGovernor(world, args.frame_budget)
+                if args.frame_budget > 0 and not deterministic else None)
+    # Built after GameWorld has seeded the starfield stream; only a seeded
+    # starfield is reproducible, so only that one is cached on disk
+    assets = AssetCache(measure=args.asset_stats)
+    size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+    background = assets.surface("starfield", {"seed": seed, "size": list(size)} if deterministic else None,
+                                lambda: create_starfield(size))
+    ui = UI(screen, assets)
+    renderer = DirtyRectRenderer(screen, background) if args.dirty_rects else None
+    world.register_snapshots()
+    register_value("screen_size", screen.get_size)
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_q:
-                    player.switch_weapon()
-                if event.key == pygame.K_b:
-                    player.drop_bomb()
-        
-        log_state()
-        screen.blit(background, (0, 0))
-
-        # Update game state (combo timer)
-        game_state.update(dt)
-
-        for obj in updatable:
-            obj.update(dt)
-
-        for obj in asteroids:
-            # Player-asteroid collision (using triangular hitbox)
-            if not player.invincible and not player.is_shielded() and player.collide_with_circle(obj):
-                log_event("player_hit", player_pos=[player.position.x, player.position.y], asteroid_pos=[obj.position.x, obj.position.y])
-                game_state.lose_life()
-                game_state.reset_combo()
-
-                if game_state.game_over:
-                    print(f"Game over! Final score: {game_state.score}")
-                    # Draw game over screen
-                    for draw_obj in drawable:
-                        draw_obj.draw(screen)
-                    ui.draw_game_over(game_state.score)
-                    pygame.display.flip()
-                    pygame.time.wait(3000)
+        profiler.begin_frame()
+        with profiler.phase("events"):
+            events = pygame.event.get()
+            for event in events:
+                if event.type == pygame.QUIT:
+                    finish_session(world, recorder, recording, args, profiler, assets, governor)
                     pygame.quit()
                     return
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and profiler.enabled:
+                    show_profile = not show_profile
+                    if renderer is not None:
+                        renderer.invalidate()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                    size = savestate.save(QUICKSAVE_PATH, world)
+                    print(f"Saved {size} bytes to {QUICKSAVE_PATH}")
+                # Loading would break an input recording or a replay
+                if (event.type == pygame.KEYDOWN and event.key == pygame.K_F9
+                        and recorder is None and recording is None):
+                    try:
+                        world = savestate.load(QUICKSAVE_PATH, profiler)
+                    except (OSError, ValueError) as error:
+                        print(f"Could not load {QUICKSAVE_PATH}: {error}")
+                    else:
+                        world.register_snapshots()
+                        if governor is not None:
+                            governor.set_world(world)
+                        accumulator = 0.0
+                        if renderer is not None:
+                            renderer.invalidate()
+            controls = read_keyboard(events)
+
+        with profiler.phase("log_state"):
+            log_state()
+
+        if deterministic:
+            # Key presses wait for the next fixed step if none runs this frame
+            controls.switch_weapon |= pending_switch
+            controls.drop_bomb |= pending_bomb
+            accumulator = min(accumulator + dt, FIXED_TIMESTEP * MAX_STEPS_PER_FRAME)
+            while accumulator >= FIXED_TIMESTEP and not world.game_state.game_over:
+                if input_source is not None:
+                    if world.frame >= len(recording.inputs):
+                        finish_session(world, recorder, recording, args, profiler, assets, governor)
+                        pygame.quit()
+                        return
+                    step_controls = input_source(world.frame, world)
                 else:
-                    # Respawn player
-                    player.respawn(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-                    log_event("player_respawn", lives=game_state.lives)
-            # Shield destroys asteroids on contact (using triangular hitbox)
-            elif player.is_shielded() and player.collide_with_circle(obj):
-                game_state.add_score(obj.radius)
-                Explosion(obj.position.x, obj.position.y, obj.radius)
-                # Chance to spawn power-up
-                if random.random() < POWERUP_DROP_CHANCE:
-                    spawn_random_powerup(obj.position.x, obj.position.y)
-                obj.split()
-                obj.kill()
-
-            # Shot-asteroid collision
-            for shot in shots:
-                if shot.collide_with(obj):
-                    log_event("asteroid_shot", asteroid_pos=[obj.position.x, obj.position.y], shot_pos=[shot.position.x, shot.position.y])
-                    game_state.add_score(obj.radius)
-                    game_state.increment_combo()
-                    # Create explosion at asteroid position
-                    Explosion(obj.position.x, obj.position.y, obj.radius)
-                    # Chance to spawn power-up
-                    if random.random() < POWERUP_DROP_CHANCE:
-                        spawn_random_powerup(obj.position.x, obj.position.y)
-                    obj.split()
-                    obj.kill()
-                    shot.kill()
-                    break
-
-        # Handle bomb explosions
-        for bomb in bombs:
-            if bomb.exploded:
-                pos, radius = bomb.get_explosion_area()
-                # Create visual explosion
-                Explosion(pos.x, pos.y, radius)
-                # Destroy all asteroids in radius
-                for asteroid in asteroids:
-                    distance = pos.distance_to(asteroid.position)
-                    if distance < radius + asteroid.radius:
-                        game_state.add_score(asteroid.radius)
-                        Explosion(asteroid.position.x, asteroid.position.y, asteroid.radius)
-                        asteroid.split()
-                        asteroid.kill()
-                bomb.kill()
-
-        # Handle laser weapon
-        keys = pygame.key.get_pressed()
-        if player.current_weapon == WeaponType.LASER and keys[pygame.K_SPACE]:
-            player_laser.active = True
-            player_laser.update(dt)
-            # Check laser-asteroid collisions
-            if player_laser.can_damage():
-                for asteroid in asteroids:
-                    if player_laser.check_collision(asteroid):
-                        game_state.add_score(asteroid.radius)
-                        game_state.increment_combo()
-                        Explosion(asteroid.position.x, asteroid.position.y, asteroid.radius)
-                        asteroid.split()
-                        asteroid.kill()
-                        player_laser.reset_damage_timer()
-                        break  # Only hit one asteroid per damage tick
+                    step_controls = controls
+                world.step(FIXED_TIMESTEP, step_controls)
+                if recorder is not None:
+                    recorder.record(step_controls)
+                controls = replace(controls, switch_weapon=False, drop_bomb=False)
+                accumulator -= FIXED_TIMESTEP
+            pending_switch, pending_bomb = controls.switch_weapon, controls.drop_bomb
         else:
-            player_laser.active = False
-
-        # Handle power-up collection
-        for powerup in powerups:
-            if player.collide_with(powerup):
-                powerup.apply(player)
-                powerup.kill()
-                log_event("powerup_collected", powerup_type=powerup.__class__.__name__)
-
-        # Timed power-up spawning
-        powerup_spawn_timer += dt
-        if powerup_spawn_timer >= POWERUP_SPAWN_RATE:
-            powerup_spawn_timer = 0
-            x = random.uniform(100, SCREEN_WIDTH - 100)
-            y = random.uniform(100, SCREEN_HEIGHT - 100)
-            spawn_random_powerup(x, y)
-
-        for obj in drawable:
-            obj.draw(screen)
-
-        # Draw laser (on top of other objects)
-        player_laser.draw(screen)
-
-        # Draw UI
-        ui.draw(game_state, player)
-
-        pygame.display.flip()
+            world.step(dt, controls)
+
+        if world.game_state.game_over:
+            print(f"Game over! Final score: {world.game_state.score}")
+            finish_session(world, recorder, recording, args, profiler, assets, governor)
+            # Draw game over screen
+            screen.blit(background, (0, 0))
+            world.draw(screen)
+            ui.draw_game_over(world.game_state.score)
+            pygame.display.flip()
+            pygame.time.wait(3000)
+            pygame.quit()
+            return
+
+        if renderer is not None:
+            with profiler.phase("render"):
+                renderer.render(world, ui, world.game_state, world.player,
+                                overlay if show_profile else None)
+        else:
+            with profiler.phase("draw"):
+                screen.blit(background, (0, 0))
+                world.draw(screen)
+
+            # Draw UI
+            with profiler.phase("ui"):
+                ui.draw(world.game_state, world.player)
+                if show_profile:
+                    overlay(screen)
+
+            with profiler.phase("flip"):
+                pygame.display.flip()
+        if profiler.enabled:
+            counts = world.entity_counts()
+            if governor is not None:
+                counts["quality"] = governor.level
+            profiler.end_frame(counts)
         dt = clock.tick(60) / 1000  # Delta time in seconds
-        #print(f"Frame Time: {dt:.4f} seconds")
-    #print(f"Event logged: {event_type} with details {details}")
-    import json
-    
+        if governor is not None:
+            # Work time of the frame, without the wait for the frame cap
+            governor.record(clock.get_rawtime())
+
+
+def finish_session(world, recorder, recording, args, profiler, assets, governor=None):
+    """Save the input recording, check a replay against its digest, write
+    the profiler trace and report asset costs, whichever were asked for"""
+    if args.trace:
+        events = profiler.export_chrome_trace(args.trace)
+        print(f"Wrote {events} trace events to {args.trace}")
+    if profiler.enabled and governor is not None:
+        print(f"Quality governor: {governor.stats()}")
+    if args.asset_stats:
+        for label, stats in assets.stats().items():
+            print(f"{label}: {stats}")
+    if recorder is not None:
+        recorder.save(args.record, world)
+        print(f"Recorded {len(recorder.inputs)} steps (seed {recorder.seed}) to {args.record}")
+    if recording is not None:
+        matched = world.frame == len(recording.inputs) and world_digest(world) == recording.digest
+        print("Replay matches recording" if matched else "Replay diverged from recording")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,277 @@
+import struct
+import zlib
+from collections import OrderedDict
+from constants import BOMB_FUSE_TIME, NET_SNAPSHOT_HISTORY
+from powerup import ShieldPowerUp, SpeedPowerUp
+from weapons import WEAPON_CONFIGS
+
+__all__ = ["JOIN", "INPUT", "LEAVE", "WELCOME", "SNAPSHOT", "ASTEROID", "SHOT", "BOMB",
+           "POWERUP", "EXPLOSION", "PLAYER", "FIELDS", "EntityIds", "capture",
+           "capture_game_state", "encode_snapshot", "decode_snapshot", "pack", "unpack",
+           "dequantise_position", "dequantise_rotation", "SnapshotHistory",
+           "POSITION_SCALE", "SHIP_ROTATION_STEPS", "ASTEROID_ROTATION_STEPS",
+           "VISIBLE", "SHIELDED", "LASER_ON", "POWERUP_KINDS"]
+
+# Wire format: every packet starts with magic, protocol version and type
+_MAGIC = b"ASTN"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBB")
+
+# Client -> server
+JOIN = 1
+INPUT = 2  # input sequence, last snapshot id received (0 = none), Controls bits
+LEAVE = 3
+# Server -> client
+WELCOME = 10  # the client's player entity id, snapshot interval in ticks, tick rate
+SNAPSHOT = 11  # snapshot id, baseline id (0 = full), server tick, flags, entity delta
+
+_BODIES = {
+    JOIN: struct.Struct("<"),
+    INPUT: struct.Struct("<IIB"),
+    LEAVE: struct.Struct("<"),
+    WELCOME: struct.Struct("<IHH"),
+    SNAPSHOT: struct.Struct("<IIIB"),
+}
+_COMPRESSED = 1  # SNAPSHOT flag: payload is zlib-compressed
+_COMPRESS_MIN_BYTES = 96  # Smaller payloads are sent as they are
+
+# Quantisation: positions in 1/4 px (int16 covers -8192..8191 px),
+# ship rotation in 1/65536 turns, asteroid rotation in 1/256 turns
+POSITION_SCALE = 4
+SHIP_ROTATION_STEPS = 65536
+ASTEROID_ROTATION_STEPS = 256
+
+# Entity kinds and their fields, one struct code per field
+ASTEROID = 1  # x, y, rotation, radius
+SHOT = 2  # x, y, radius, weapon index
+BOMB = 3  # x, y, fuse left in 1/255ths
+POWERUP = 4  # x, y, kind, lifetime in 1/10 s
+EXPLOSION = 5  # x, y, radius
+PLAYER = 6  # x, y, rotation, flags, weapon index, bombs
+FIELDS = {
+    ASTEROID: "hhBB",
+    SHOT: "hhBB",
+    BOMB: "hhB",
+    POWERUP: "hhBB",
+    EXPLOSION: "hhB",
+    PLAYER: "hhHBBB",
+}
+_FIELD_STRUCTS = {kind: [struct.Struct("<" + code) for code in codes] for kind, codes in FIELDS.items()}
+_ENTITY = struct.Struct("<IBB")  # id, kind, mask of fields present
+_REMOVED = struct.Struct("<I")
+_COUNT = struct.Struct("<H")
+_GAME_STATE = struct.Struct("<iBBB")  # score, lives, combo, game over
+
+# PLAYER flag bits
+VISIBLE = 1
+SHIELDED = 2
+LASER_ON = 4
+POWERUP_KINDS = (ShieldPowerUp, SpeedPowerUp)
+
+
+def pack(packet_type, *fields, payload=b""):
+    return _HEADER.pack(_MAGIC, _VERSION, packet_type) + _BODIES[packet_type].pack(*fields) + payload
+
+
+def unpack(data):
+    """(type, fields, payload), or None for a packet that is not ours"""
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, packet_type = _HEADER.unpack_from(data)
+    body = _BODIES.get(packet_type)
+    if magic != _MAGIC or version != _VERSION or body is None:
+        return None
+    end = _HEADER.size + body.size
+    if len(data) < end:
+        return None
+    return packet_type, body.unpack_from(data, _HEADER.size), data[end:]
+
+
+def _position(value):
+    return max(-32768, min(32767, round(value * POSITION_SCALE)))
+
+
+def dequantise_position(value):
+    return value / POSITION_SCALE
+
+
+def _rotation(degrees, steps):
+    return round(degrees % 360 * steps / 360) % steps
+
+
+def dequantise_rotation(value, steps):
+    return value * 360 / steps
+
+
+class EntityIds:
+    """Stable network ids for live sprites.
+
+    Pooled sprites are reused, so an object only keeps its id while it stays
+    alive: sync() once per simulation step forgets killed objects, and a
+    recycled one gets a fresh id.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.next_id = 1
+
+    def id_of(self, obj):
+        net_id = self.ids.get(obj)
+        if net_id is None:
+            net_id = self.ids[obj] = self.next_id
+            self.next_id += 1
+        return net_id
+
+    def reset(self):
+        """Forget every object (a new world) but keep ids unique"""
+        self.ids.clear()
+
+    def sync(self, world):
+        for obj in [obj for obj in self.ids if not obj.alive()]:
+            del self.ids[obj]
+        for group in (world.asteroids, world.shots, world.bombs, world.powerups, world.explosions):
+            for obj in group:
+                self.id_of(obj)
+        for player in world.players:
+            self.id_of(player)
+
+
+def capture(world, ids):
+    """Quantised state of every networked entity: id -> (kind, fields)"""
+    state = {}
+    weapons = {config.color: i for i, config in enumerate(WEAPON_CONFIGS.values())}
+    for asteroid in world.asteroids:
+        position = asteroid.position
+        state[ids.id_of(asteroid)] = (ASTEROID, (
+            _position(position.x), _position(position.y),
+            _rotation(asteroid.rotation, ASTEROID_ROTATION_STEPS), round(asteroid.radius)))
+    for shot in world.shots:
+        state[ids.id_of(shot)] = (SHOT, (
+            _position(shot.position.x), _position(shot.position.y), round(shot.radius),
+            weapons.get(shot.color, 0)))
+    for bomb in world.bombs:
+        fuse = round(max(0.0, min(1.0, bomb.fuse_timer / BOMB_FUSE_TIME)) * 255)
+        state[ids.id_of(bomb)] = (BOMB, (_position(bomb.position.x), _position(bomb.position.y), fuse))
+    for powerup in world.powerups:
+        kind = POWERUP_KINDS.index(type(powerup))
+        state[ids.id_of(powerup)] = (POWERUP, (
+            _position(powerup.position.x), _position(powerup.position.y), kind,
+            max(0, min(255, round(powerup.lifetime * 10)))))
+    for explosion in world.explosions:
+        radius = max(0, min(255, round(explosion.ring_max_radius / 1.5)))
+        state[ids.id_of(explosion)] = (EXPLOSION, (
+            _position(explosion.position.x), _position(explosion.position.y), radius))
+    for player in world.players:
+        flags = ((VISIBLE if player.visible else 0)
+                 | (SHIELDED if player.is_shielded() else 0)
+                 | (LASER_ON if world.lasers[player].active else 0))
+        state[ids.id_of(player)] = (PLAYER, (
+            _position(player.position.x), _position(player.position.y),
+            _rotation(player.rotation, SHIP_ROTATION_STEPS), flags,
+            player.weapon_index, max(0, min(255, player.bomb_count))))
+    return state
+
+
+def capture_game_state(game_state):
+    return (game_state.score, max(0, min(255, game_state.lives)),
+            min(255, game_state.combo_multiplier), int(game_state.game_over))
+
+
+def encode_snapshot(snapshot_id, tick, game_state, state, baseline=None, baseline_id=0):
+    """SNAPSHOT packet for state, as a delta against baseline.
+
+    Entities missing from state are listed as removed, new ones are sent in
+    full, and existing ones only with the fields that changed; unchanged
+    entities cost nothing. Large payloads are zlib-compressed.
+    """
+    baseline = baseline or {}
+    removed = [net_id for net_id in baseline if net_id not in state]
+    parts = [_GAME_STATE.pack(*game_state), _COUNT.pack(len(removed))]
+    parts.extend(_REMOVED.pack(net_id) for net_id in removed)
+
+    records = []
+    for net_id, (kind, fields) in state.items():
+        old = baseline.get(net_id)
+        structs = _FIELD_STRUCTS[kind]
+        if old is None or old[0] != kind:
+            mask = (1 << len(fields)) - 1
+        else:
+            mask = 0
+            for i, (value, previous) in enumerate(zip(fields, old[1])):
+                if value != previous:
+                    mask |= 1 << i
+            if not mask:
+                continue
+        record = [_ENTITY.pack(net_id, kind, mask)]
+        record.extend(structs[i].pack(value) for i, value in enumerate(fields) if mask >> i & 1)
+        records.append(b"".join(record))
+    parts.append(_COUNT.pack(len(records)))
+    parts.extend(records)
+
+    payload = b"".join(parts)
+    flags = 0
+    if len(payload) >= _COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(payload, 1)
+        if len(compressed) < len(payload):
+            payload, flags = compressed, _COMPRESSED
+    return pack(SNAPSHOT, snapshot_id, baseline_id, tick, flags, payload=payload)
+
+
+def decode_snapshot(fields, payload, baselines):
+    """Apply a SNAPSHOT to its baseline.
+
+    baselines maps snapshot id -> decoded state. Returns (snapshot id,
+    tick, game state tuple, state), or None if the baseline is unknown.
+    """
+    snapshot_id, baseline_id, tick, flags = fields
+    if baseline_id:
+        baseline = baselines.get(baseline_id)
+        if baseline is None:
+            return None
+    else:
+        baseline = {}
+    if flags & _COMPRESSED:
+        payload = zlib.decompress(payload)
+
+    offset = 0
+    game_state = _GAME_STATE.unpack_from(payload, offset)
+    offset += _GAME_STATE.size
+    state = dict(baseline)
+    (count,) = _COUNT.unpack_from(payload, offset)
+    offset += _COUNT.size
+    for _ in range(count):
+        (net_id,) = _REMOVED.unpack_from(payload, offset)
+        offset += _REMOVED.size
+        state.pop(net_id, None)
+
+    (count,) = _COUNT.unpack_from(payload, offset)
+    offset += _COUNT.size
+    for _ in range(count):
+        net_id, kind, mask = _ENTITY.unpack_from(payload, offset)
+        offset += _ENTITY.size
+        old = baseline.get(net_id)
+        values = list(old[1]) if old is not None and old[0] == kind else [0] * len(FIELDS[kind])
+        for i, field in enumerate(_FIELD_STRUCTS[kind]):
+            if mask >> i & 1:
+                (values[i],) = field.unpack_from(payload, offset)
+                offset += field.size
+        state[net_id] = (kind, tuple(values))
+    return snapshot_id, tick, game_state, state
+
+
+class SnapshotHistory(OrderedDict):
+    """Recent snapshot states by id, oldest first, capped at limit"""
+
+    def __init__(self, limit=NET_SNAPSHOT_HISTORY):
+        super().__init__()
+        self.limit = limit
+
+    def add(self, snapshot_id, state):
+        self[snapshot_id] = state
+        while len(self) > self.limit:
+            self.popitem(last=False)
+
+    def drop_before(self, snapshot_id):
+        """Forget snapshots older than snapshot_id (once it is acknowledged)"""
+        for old in [old for old in self if old < snapshot_id]:
+            del self[old]
@@ -0,0 +1,116 @@
+import math
+import numpy as np
+import pygame
+from constants import PARTICLE_CAPACITY, PARTICLE_FRICTION, PARTICLE_DIRTY_TILE
+from rng import numpy_stream
+
+
+class ParticleSystem(pygame.sprite.Sprite):
+    """Every live explosion particle, stored in preallocated arrays.
+
+    Emitters append rows in batches; update() integrates, applies friction
+    and expires all rows at once, then compacts survivors to the front so
+    the live particles always occupy rows [0, count).
+    """
+
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        super().__init__()
+        self.capacity = capacity
+        # Quality knobs the frame governor lowers under load
+        self.limit = capacity
+        self.lifetime_scale = 1.0
+        self.count = 0
+        self.positions = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.lifetimes = np.zeros(capacity)
+        self.max_lifetimes = np.ones(capacity)
+        self.sizes = np.zeros(capacity, dtype=np.int32)
+        self.rng = numpy_stream("particles")
+        self.dropped = 0  # Particles refused because the arrays were full or over limit
+        self.peak = 0
+
+    def _columns(self):
+        return (self.positions, self.velocities, self.lifetimes,
+                self.max_lifetimes, self.sizes)
+
+    def emit(self, x, y, count, speed=(50, 150), lifetime=(0.3, 0.6), size=(2, 5)):
+        """Spawn count particles at (x, y) flying out in random directions"""
+        start = self.count
+        n = max(0, min(count, self.limit - start))
+        self.dropped += count - n
+        if n == 0:
+            return
+        end = start + n
+
+        angles = self.rng.uniform(0, 2 * math.pi, n)
+        speeds = self.rng.uniform(speed[0], speed[1], n)
+        self.positions[start:end] = (x, y)
+        self.velocities[start:end, 0] = np.cos(angles) * speeds
+        self.velocities[start:end, 1] = np.sin(angles) * speeds
+        lifetimes = self.rng.uniform(lifetime[0], lifetime[1], n) * self.lifetime_scale
+        self.lifetimes[start:end] = lifetimes
+        self.max_lifetimes[start:end] = lifetimes
+        self.sizes[start:end] = self.rng.integers(size[0], size[1] + 1, n)
+        self.count = end
+        self.peak = max(self.peak, end)
+
+    def update(self, dt):
+        n = self.count
+        if n == 0:
+            return
+        self.positions[:n] += self.velocities[:n] * dt
+        self.velocities[:n] *= PARTICLE_FRICTION
+        self.lifetimes[:n] -= dt
+
+        # Compact survivors to the front of every column
+        alive = self.lifetimes[:n] > 0
+        survivors = int(np.count_nonzero(alive))
+        if survivors < n:
+            for column in self._columns():
+                column[:survivors] = column[:n][alive]
+            self.count = survivors
+
+    def draw(self, screen):
+        n = self.count
+        if n == 0:
+            return
+        # Fade out as lifetime decreases
+        ratio = self.lifetimes[:n] / self.max_lifetimes[:n]
+        reds = (255 * ratio).astype(np.int32).tolist()
+        greens = (200 * ratio).astype(np.int32).tolist()
+        blues = (100 * ratio).astype(np.int32).tolist()
+        radii = np.maximum(1, (self.sizes[:n] * ratio).astype(np.int32)).tolist()
+        points = self.positions[:n].astype(np.int32).tolist()
+        draw_circle = pygame.draw.circle
+        for i in range(n):
+            draw_circle(screen, (reds[i], greens[i], blues[i]), points[i], radii[i])
+
+    def stats(self):
+        """Pool-style stats; the arrays are the particle pool"""
+        return {
+            "capacity": self.capacity,
+            "live": self.count,
+            "peak": self.peak,
+            "dropped": self.dropped,
+        }
+
+    def bounding_rect(self):
+        # Particles report coarse tiles through tile_rects() instead
+        return None
+
+    def tile_rects(self, tile=PARTICLE_DIRTY_TILE):
+        """Rects of the tile-aligned cells holding live particles"""
+        n = self.count
+        if n == 0:
+            return []
+        # Largest particle radius is 5, so pad each tile on every side
+        cells = np.unique((self.positions[:n] // tile).astype(np.int64), axis=0)
+        pad = 6
+        return [pygame.Rect(int(cx) * tile - pad, int(cy) * tile - pad, tile + pad * 2, tile + pad * 2)
+                for cx, cy in cells.tolist()]
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
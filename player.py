@@ -1,3 +1,4 @@
+import math
 import pygame
 from circleshape import CircleShape
 from constants import (PLAYER_RADIUS, LINE_WIDTH, PLAYER_TURN_SPEED, PLAYER_ACCELERATION,
@@ -6,12 +7,14 @@ from constants import (PLAYER_RADIUS, LINE_WIDTH, PLAYER_TURN_SPEED, PLAYER_ACCE
 from shot import Shot
 from weapons import WeaponType, WEAPON_CONFIGS
 from bomb import Bomb
-from collision import circle_intersects_triangle
+from collision import TriangleHitbox
+from controls import Controls
 
 class Player(CircleShape):
     def __init__(self, x, y):
         super().__init__(x, y, PLAYER_RADIUS)
         self.color = (0, 255, 0)  # Green color for the player
+        self.outline_color = "white"  # Network clients tint the other ships
         self.rotation = 0  # Initial rotation angle
         self.player_shot_cooldown = 0
         # Invincibility state
@@ -32,24 +35,47 @@ class Player(CircleShape):
         self.shield_timer = 0.0
         # Speed boost state
         self.speed_multiplier = 1.0
-        self.speed_boost_timer = 0.0 
+        self.speed_boost_timer = 0.0
+        # Input for the next update; set each frame by whoever drives the ship
+        self.controls = Controls()
+        # Hitbox cache, rebuilt only when the ship moves or turns
+        self._triangle_key = None
+        self._triangle = None
+        self._hitbox = None
 
     # in the Player class
     def triangle(self):
-        forward = pygame.Vector2(0, 1).rotate(self.rotation)
-        right = pygame.Vector2(0, 1).rotate(self.rotation + 90) * self.radius / 1.5
-        a = self.position + forward * self.radius
-        b = self.position - forward * self.radius - right
-        c = self.position - forward * self.radius + right
-        return [a, b, c]
+        key = (self.position.x, self.position.y, self.rotation, self.radius)
+        if key != self._triangle_key:
+            forward = pygame.Vector2(0, 1).rotate(self.rotation)
+            right = pygame.Vector2(0, 1).rotate(self.rotation + 90) * self.radius / 1.5
+            a = self.position + forward * self.radius
+            b = self.position - forward * self.radius - right
+            c = self.position - forward * self.radius + right
+            self._triangle = [a, b, c]
+            self._triangle_key = key
+            self._hitbox = None
+        return self._triangle
+
+    def hitbox(self):
+        """Triangle prepared for repeated circle tests (cached)"""
+        triangle = self.triangle()
+        if self._hitbox is None:
+            self._hitbox = TriangleHitbox(triangle)
+        return self._hitbox
+
+    def bounding_radius(self):
+        """Radius of the circle that encloses the triangular hitbox"""
+        return self.radius * math.hypot(1, 1 / 1.5)
+
+    def bounding_rect(self):
+        # Covers the triangle and the shield ring
+        extent = max(self.bounding_radius(), self.radius + 10) + LINE_WIDTH
+        return self._rect_around(self.position.x, self.position.y, extent)
 
     def collide_with_circle(self, other):
         """Check if player triangle collides with a circle (asteroid/powerup)"""
-        return circle_intersects_triangle(
-            other.position,
-            other.radius,
-            self.triangle()
-        )
+        return self.hitbox().intersects_circle(other.position, other.radius)
 
     def draw(self, screen):
         if self.visible:
@@ -60,7 +86,7 @@ class Player(CircleShape):
                                  (int(self.position.x), int(self.position.y)),
                                  int(shield_radius), 2)
             # Draw player triangle
-            pygame.draw.polygon(screen, "white", self.triangle(), LINE_WIDTH)
+            pygame.draw.polygon(screen, self.outline_color, self.triangle(), LINE_WIDTH)
 
     def rotate(self, dt):
         return PLAYER_TURN_SPEED * dt
@@ -91,17 +117,17 @@ class Player(CircleShape):
             if self.speed_boost_timer <= 0:
                 self.speed_multiplier = 1.0
 
-        keys = pygame.key.get_pressed()
+        controls = self.controls
 
-        if keys[pygame.K_a]:
+        if controls.turn_left:
             self.rotation -= self.rotate(dt)
-        if keys[pygame.K_d]:
+        if controls.turn_right:
             self.rotation += self.rotate(dt)
-        if keys[pygame.K_w]:
+        if controls.thrust:
             self.thrust(dt)
-        if keys[pygame.K_s]:
+        if controls.reverse:
             self.thrust(-dt)
-        if keys[pygame.K_SPACE]:
+        if controls.fire:
             return self.shoot()
 
         # Apply friction and update position
@@ -178,7 +204,7 @@ class Player(CircleShape):
 
         if config.shot_count == 1:
             # Single shot
-            shot = Shot(self.position.x, self.position.y, config.shot_radius, config.color)
+            shot = Shot.acquire(self.position.x, self.position.y, config.shot_radius, config.color)
             shot.velocity = base_direction * config.shot_speed
             shots.append(shot)
         else:
@@ -189,7 +215,7 @@ class Player(CircleShape):
             for i in range(config.shot_count):
                 angle_offset = start_angle + (angle_step * i)
                 shot_direction = base_direction.rotate(angle_offset)
-                shot = Shot(self.position.x, self.position.y, config.shot_radius, config.color)
+                shot = Shot.acquire(self.position.x, self.position.y, config.shot_radius, config.color)
                 shot.velocity = shot_direction * config.shot_speed
                 shots.append(shot)
 
@@ -0,0 +1,101 @@
+from constants import POOL_MAX_SIZE
+
+__all__ = ["Pool", "Pooled", "collect_pools", "pool_stats"]
+
+_pools = []
+
+
+class Pool:
+    """Free list of killed sprites that can be re-initialised instead of allocated.
+
+    Released sprites are held back until collect() runs at the end of the
+    frame, so a sprite killed mid-frame is never handed out again while
+    collision loops may still hold a reference to it.
+    """
+
+    def __init__(self, cls, max_size=POOL_MAX_SIZE):
+        self.cls = cls
+        self.max_size = max_size
+        self.free = []
+        self.pending = []
+        # Stats
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self.discarded = 0
+        self.peak_free = 0
+        _pools.append(self)
+
+    def acquire(self, *args, **kwargs):
+        """Return a live sprite, recycling a released one when available"""
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            sprite = self.cls(*args, **kwargs)
+            self.created += 1
+        return sprite
+
+    def release(self, sprite):
+        """Queue a killed sprite for reuse, dropping it if the pool is full"""
+        if len(self.free) + len(self.pending) >= self.max_size:
+            self.discarded += 1
+            return
+        self.pending.append(sprite)
+        self.released += 1
+
+    def collect(self):
+        """Make sprites released since the last call available again"""
+        if self.pending:
+            self.free.extend(self.pending)
+            self.pending.clear()
+            self.peak_free = max(self.peak_free, len(self.free))
+
+    def clear(self):
+        self.free.clear()
+        self.pending.clear()
+
+    def stats(self):
+        return {
+            "free": len(self.free),
+            "pending": len(self.pending),
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "discarded": self.discarded,
+            "peak_free": self.peak_free,
+        }
+
+
+class Pooled:
+    """Mixin giving a sprite class its own Pool.
+
+    Create instances with `cls.acquire(...)`; kill() hands the sprite back to
+    the pool. Pooled classes implement reset() with the same arguments as
+    __init__ to re-initialise a recycled instance and re-join its containers.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.pool = Pool(cls)
+
+    @classmethod
+    def acquire(cls, *args, **kwargs):
+        return cls.pool.acquire(*args, **kwargs)
+
+    def kill(self):
+        was_alive = self.alive()
+        super().kill()
+        if was_alive:
+            self.pool.release(self)
+
+
+def collect_pools():
+    """End-of-frame hook: recycle everything released this frame"""
+    for pool in _pools:
+        pool.collect()
+
+
+def pool_stats():
+    return {pool.cls.__name__: pool.stats() for pool in _pools}
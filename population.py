@@ -0,0 +1,85 @@
+import math
+import numpy as np
+import constants
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from logger import enabled, write_event
+
+__all__ = ["AsteroidPopulation"]
+
+
+class AsteroidPopulation:
+    """Entity budget for the asteroid field.
+
+    AsteroidField asks allows() before each timed spawn: spawning stops
+    while the live count or the summed asteroid area is at its budget.
+    cull() despawns asteroids older than cull_age while they are fully
+    off-screen, i.e. as they wrap, so a field nobody clears stays bounded.
+    Counters record spawns, throttled spawns, culls and peak population.
+    Budgets left as None are read from constants when the population is
+    created, so batch_runner overrides apply.
+    """
+
+    def __init__(self, max_count=None, max_area=None, cull_age=None):
+        if max_count is None:
+            max_count = constants.ASTEROID_POPULATION_MAX
+        if max_area is None:
+            max_area = constants.ASTEROID_AREA_BUDGET * SCREEN_WIDTH * SCREEN_HEIGHT
+        if cull_age is None:
+            cull_age = constants.ASTEROID_CULL_AGE
+        self.max_count = max_count
+        self.max_area = max_area
+        self.cull_age = cull_age  # ASTEROID_CULL_AGE = None disables culling
+        # Stats
+        self.spawns = 0
+        self.throttled = 0
+        self.culls = 0
+        self.peak = 0
+
+    def area(self, store):
+        """Summed area of the asteroids in store"""
+        n = store.count
+        return math.pi * float((store.radii[:n] ** 2).sum())
+
+    def allows(self, store, radius):
+        """Whether one more asteroid of radius fits the budget; counts the
+        refusals"""
+        if (store.count >= self.max_count
+                or self.area(store) + math.pi * radius * radius > self.max_area):
+            self.throttled += 1
+            return False
+        return True
+
+    def spawned(self):
+        self.spawns += 1
+
+    def cull(self, store):
+        """Despawn old off-screen asteroids; returns how many"""
+        n = store.count
+        if self.cull_age is None or n == 0:
+            return 0
+        x, y, r = store.positions[:n, 0], store.positions[:n, 1], store.radii[:n]
+        offscreen = (x + r <= 0) | (x - r >= SCREEN_WIDTH) | (y + r <= 0) | (y - r >= SCREEN_HEIGHT)
+        rows = np.flatnonzero(offscreen & (store.ages[:n] > self.cull_age))
+        if len(rows) == 0:
+            return 0
+        # Kill in spawn order so the pool's free list is reproducible
+        rows = rows[np.argsort(store.sequence[rows], kind="stable")]
+        for asteroid in [store.handles[i] for i in rows.tolist()]:
+            if enabled("asteroid_culled"):
+                write_event("asteroid_culled", position=(asteroid.position.x, asteroid.position.y),
+                            radius=asteroid.radius)
+            asteroid.kill()
+        self.culls += len(rows)
+        return len(rows)
+
+    def observe(self, store):
+        """Track the peak live count"""
+        self.peak = max(self.peak, store.count)
+
+    def stats(self):
+        return {
+            "spawns": self.spawns,
+            "throttled": self.throttled,
+            "culls": self.culls,
+            "peak": self.peak,
+        }
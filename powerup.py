@@ -12,6 +12,7 @@ class PowerUp(CircleShape):
         super().__init__(x, y, POWERUP_RADIUS)
         self.lifetime = POWERUP_LIFETIME
         self.bob_offset = 0  # For visual bobbing effect
+        self.age = 0.0  # Drives the bobbing from game time, not the wall clock
         self.bob_speed = 3
         self.color = (255, 255, 255)  # Override in subclasses
 
@@ -19,8 +20,16 @@ class PowerUp(CircleShape):
         self.lifetime -= dt
         if self.lifetime <= 0:
             self.kill()
-        # Bobbing animation
-        self.bob_offset = math.sin(pygame.time.get_ticks() / 200) * 3
+        self.animate(dt)
+
+    def animate(self, dt):
+        """Bobbing animation (network clients run only this part)"""
+        self.age += dt
+        self.bob_offset = math.sin(self.age * 5) * 3
+
+    def bounding_rect(self):
+        # Bobs up to 3px either way
+        return self._rect_around(self.position.x, self.position.y, self.radius + 5)
 
     def apply(self, player):
         """Override in subclasses to apply effect"""
@@ -0,0 +1,131 @@
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+import numpy as np
+import pygame
+from constants import PROFILER_HISTORY_FRAMES, PROFILER_TRACE_FRAMES
+from assets import to_display_format
+
+# Shared no-op context handed out while profiling is off, so a disabled
+# phase() costs one attribute check and no allocation
+_NULL_PHASE = nullcontext()
+
+OVERLAY_COLOR = (120, 255, 120)
+OVERLAY_BACKGROUND = (0, 0, 0, 160)
+OVERLAY_REFRESH_FRAMES = 30  # Percentiles are recomputed this often
+
+
+class FrameProfiler:
+    """Wall-clock timings for the named phases of each frame.
+
+    Wrap work in `with profiler.phase("name"):`; begin_frame()/end_frame()
+    bracket a frame. Keeps a rolling window of per-phase durations for
+    percentiles and the most recent frames as Chrome trace events (open the
+    exported file in chrome://tracing or Perfetto).
+    """
+
+    def __init__(self, enabled=False, history=PROFILER_HISTORY_FRAMES,
+                 trace_frames=PROFILER_TRACE_FRAMES):
+        self.enabled = enabled
+        self.history = history
+        self.durations = {}  # phase name -> deque of seconds
+        self.counts = {}  # entity counts from the last frame
+        self.frames = 0
+        self._stack = []
+        self._pending = None
+        self._frame_start = 0.0
+        self._origin = time.perf_counter()
+        # One list of trace events per frame, oldest dropped first
+        self._trace = deque(maxlen=trace_frames)
+        self._frame_events = []
+        self._summary = {}
+        self._panel = None
+
+    def phase(self, name):
+        """Context manager timing one phase; no-op while disabled"""
+        if not self.enabled:
+            return _NULL_PHASE
+        self._pending = name
+        return self
+
+    def __enter__(self):
+        self._stack.append((self._pending, time.perf_counter()))
+        return self
+
+    def __exit__(self, *exc):
+        name, start = self._stack.pop()
+        self._record(name, start, time.perf_counter())
+        return False
+
+    def _record(self, name, start, end):
+        samples = self.durations.get(name)
+        if samples is None:
+            samples = self.durations[name] = deque(maxlen=self.history)
+        samples.append(end - start)
+        self._frame_events.append({
+            "name": name, "ph": "X", "pid": 1, "tid": 1,
+            "ts": (start - self._origin) * 1e6, "dur": (end - start) * 1e6,
+        })
+
+    def begin_frame(self):
+        if self.enabled:
+            self._frame_start = time.perf_counter()
+            self._frame_events = []
+
+    def end_frame(self, counts=None):
+        """Close the frame; counts maps group name -> entity count"""
+        if not self.enabled:
+            return
+        end = time.perf_counter()
+        self._record("frame", self._frame_start, end)
+        if counts is not None:
+            self.counts = counts
+            self._frame_events.append({
+                "name": "entities", "ph": "C", "pid": 1, "tid": 1,
+                "ts": (end - self._origin) * 1e6, "args": dict(counts),
+            })
+        self._trace.append(self._frame_events)
+        self.frames += 1
+        if self.frames % OVERLAY_REFRESH_FRAMES == 1:
+            self._summary = self.percentiles()
+            self._panel = None
+
+    def percentiles(self):
+        """{phase: (p50, p95, p99)} in milliseconds over the rolling window"""
+        summary = {}
+        for name, samples in self.durations.items():
+            if samples:
+                p50, p95, p99 = np.percentile(np.fromiter(samples, float), (50, 95, 99))
+                summary[name] = (p50 * 1000, p95 * 1000, p99 * 1000)
+        return summary
+
+    def export_chrome_trace(self, path):
+        """Write the retained frames as Chrome trace-event JSON"""
+        events = [event for frame in self._trace for event in frame]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+    def draw_overlay(self, screen, font):
+        """Percentile table and entity counts at the top-right; returns the rect"""
+        if self._panel is None:
+            self._panel = self._render_panel(font)
+        return screen.blit(self._panel, (screen.get_width() - self._panel.get_width() - 10, 45))
+
+    def _render_panel(self, font):
+        lines = ["phase        p50    p95    p99 ms"]
+        for name, (p50, p95, p99) in self._summary.items():
+            lines.append(f"{name:<11}{p50:6.2f} {p95:6.2f} {p99:6.2f}")
+        if self.counts:
+            lines.append(" ".join(f"{name}={count}" for name, count in self.counts.items()))
+        surfaces = [font.render(line, True, OVERLAY_COLOR) for line in lines]
+        width = max(surface.get_width() for surface in surfaces) + 8
+        height = sum(surface.get_height() for surface in surfaces) + 8
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill(OVERLAY_BACKGROUND)
+        y = 4
+        for surface in surfaces:
+            panel.blit(surface, (4, y))
+            y += surface.get_height()
+        return to_display_format(panel, alpha=True)
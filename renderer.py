@@ -0,0 +1,60 @@
+import pygame
+from constants import DIRTY_RECT_MAX_COVERAGE
+
+
+class DirtyRectRenderer:
+    """Redraws and presents only the parts of the screen that changed.
+
+    Each frame the areas drawn last frame and the areas about to be drawn are
+    restored from the background, everything is drawn again, and only those
+    rects are pushed with pygame.display.update(). When the dirty area passes
+    max_coverage of the screen, it falls back to a full blit and flip.
+    """
+
+    def __init__(self, screen, background, max_coverage=DIRTY_RECT_MAX_COVERAGE):
+        self.screen = screen
+        self.background = background
+        self.screen_rect = screen.get_rect()
+        self.max_area = self.screen_rect.width * self.screen_rect.height * max_coverage
+        self.previous = []
+        self.full_redraw = True
+        # Stats for the last frame
+        self.last_rect_count = 0
+        self.last_dirty_area = 0
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def invalidate(self):
+        """Force the next frame to redraw and flip the whole screen"""
+        self.full_redraw = True
+
+    def render(self, world, ui=None, game_state=None, player=None, overlay=None):
+        """overlay, if given, is called with the screen after the HUD and
+        returns the rect it drew to"""
+        current = [rect.clip(self.screen_rect) for rect in world.bounding_rects()]
+        dirty = [rect for rect in self.previous + current if rect.width and rect.height]
+        area = sum(rect.width * rect.height for rect in dirty)
+        full = self.full_redraw or area > self.max_area
+
+        if full:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in dirty:
+                self.screen.blit(self.background, rect, rect)
+
+        world.draw(self.screen)
+        hud = ui.draw(game_state, player) if ui is not None else []
+        if overlay is not None:
+            hud.append(overlay(self.screen))
+
+        if full:
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(dirty + hud)
+            self.partial_frames += 1
+
+        self.previous = current + hud
+        self.full_redraw = False
+        self.last_rect_count = len(dirty) + len(hud)
+        self.last_dirty_area = area
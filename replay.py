@@ -0,0 +1,137 @@
+import argparse
+import hashlib
+import os
+import struct
+from array import array
+from dataclasses import dataclass
+from constants import FIXED_TIMESTEP
+from controls import Controls, ScriptedInput
+from engine import GameWorld
+
+__all__ = ["Recording", "InputRecorder", "load_recording", "world_digest",
+           "replay", "new_seed"]
+
+# magic, format version, seed, timestep, frame count
+_HEADER = struct.Struct("<4sHqdI")
+_MAGIC = b"ASTR"
+_VERSION = 1
+_DIGEST_SIZE = 32
+
+
+def new_seed():
+    """Fresh random seed for a session that wants to be recorded"""
+    return int.from_bytes(os.urandom(4), "little")
+
+
+@dataclass
+class Recording:
+    seed: int
+    timestep: float
+    inputs: bytes  # One Controls.to_bits() byte per simulation step
+    digest: bytes  # world_digest() after the last step
+
+    def input_source(self):
+        return ScriptedInput(Controls.from_bits(bits) for bits in self.inputs)
+
+
+class InputRecorder:
+    """Collects one input byte per fixed simulation step"""
+
+    def __init__(self, seed, timestep=FIXED_TIMESTEP):
+        self.seed = seed
+        self.timestep = timestep
+        self.inputs = bytearray()
+
+    def record(self, controls):
+        self.inputs.append(controls.to_bits())
+
+    def save(self, path, world):
+        """Write header, inputs and the final state digest of world"""
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self.seed, self.timestep, len(self.inputs)))
+            f.write(self.inputs)
+            f.write(world_digest(world))
+
+
+def load_recording(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, seed, timestep, frames = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"{path} is not a version {_VERSION} input recording")
+    start = _HEADER.size
+    inputs = data[start:start + frames]
+    digest = data[start + frames:start + frames + _DIGEST_SIZE]
+    if len(inputs) != frames or len(digest) != _DIGEST_SIZE:
+        raise ValueError(f"{path} is truncated")
+    return Recording(seed, timestep, bytes(inputs), digest)
+
+
+def world_digest(world):
+    """SHA-256 over the exact simulation state of a GameWorld.
+
+    Floats are hashed as raw doubles, so two runs only match if they are
+    bit-identical.
+    """
+    values = array("d")
+    player = world.player
+    game_state = world.game_state
+    values.extend((world.frame, world.elapsed, world.powerup_spawn_timer,
+                   world.asteroid_field.spawn_timer, world.laser.damage_timer))
+    values.extend((game_state.score, game_state.combo_multiplier,
+                   game_state.combo_timer, game_state.lives, game_state.game_over))
+    values.extend((player.position.x, player.position.y,
+                   player.velocity.x, player.velocity.y, player.rotation,
+                   player.player_shot_cooldown, player.invincibility_timer,
+                   player.shield_timer, player.speed_boost_timer,
+                   player.speed_multiplier, player.weapon_index, player.bomb_count))
+
+    for asteroid in world.asteroids:
+        values.extend((asteroid.position.x, asteroid.position.y,
+                       asteroid.velocity.x, asteroid.velocity.y,
+                       asteroid.radius, asteroid.rotation, asteroid.rotation_speed))
+        for v in asteroid.vertices:
+            values.extend((v.x, v.y))
+    for shot in world.shots:
+        values.extend((shot.position.x, shot.position.y,
+                       shot.velocity.x, shot.velocity.y, shot.radius))
+    for bomb in world.bombs:
+        values.extend((bomb.position.x, bomb.position.y, bomb.fuse_timer))
+    kinds = []
+    for powerup in world.powerups:
+        values.extend((powerup.position.x, powerup.position.y, powerup.lifetime))
+        kinds.append(powerup.__class__.__name__)
+
+    digest = hashlib.sha256(values.tobytes())
+    digest.update(",".join(kinds).encode())
+    particles = world.particles
+    n = particles.count
+    for column in (particles.positions, particles.velocities,
+                   particles.lifetimes, particles.sizes):
+        digest.update(column[:n].tobytes())
+    return digest.digest()
+
+
+def replay(recording):
+    """Re-run a recording headless; returns (world, matched)"""
+    world = GameWorld(seed=recording.seed)
+    source = recording.input_source()
+    for frame in range(len(recording.inputs)):
+        world.step(recording.timestep, source(frame, world))
+    return world, world_digest(world) == recording.digest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify an Asteroids input recording")
+    parser.add_argument("recording", help="file written by --record")
+    args = parser.parse_args()
+
+    recording = load_recording(args.recording)
+    world, matched = replay(recording)
+    print(f"seed={recording.seed} steps={len(recording.inputs)} score={world.game_state.score}")
+    print("replay matches recording" if matched else "REPLAY DIVERGED from recording")
+    raise SystemExit(0 if matched else 1)
+
+
+if __name__ == "__main__":
+    main()
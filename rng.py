@@ -0,0 +1,74 @@
+import random
+import zlib
+import numpy as np
+
+__all__ = ["seed_all", "current_seed", "stream", "numpy_stream", "get_state", "set_state"]
+
+# One independent stream per subsystem, so e.g. extra particles never shift
+# asteroid spawns. Streams are reseeded in place: modules may hold them.
+_seed = None
+_streams = {}
+_numpy_streams = {}
+
+
+def _derive(name):
+    """Stable per-stream seed from the master seed and the stream name.
+
+    Masked to 64 bits so negative and huge master seeds work too; PCG64
+    only takes non-negative seeds.
+    """
+    return ((_seed << 32) ^ zlib.crc32(name.encode())) & 0xFFFF_FFFF_FFFF_FFFF
+
+
+def seed_all(seed):
+    """Reseed every stream from one master seed (None for OS entropy)"""
+    global _seed
+    _seed = seed
+    for name, generator in _streams.items():
+        generator.seed(None if seed is None else _derive(name))
+    for name, generator in _numpy_streams.items():
+        seed_value = None if seed is None else _derive(name)
+        generator.bit_generator.state = np.random.PCG64(seed_value).state
+
+
+def current_seed():
+    return _seed
+
+
+def stream(name):
+    """The random.Random stream for a subsystem"""
+    generator = _streams.get(name)
+    if generator is None:
+        generator = random.Random(None if _seed is None else _derive(name))
+        _streams[name] = generator
+    return generator
+
+
+def numpy_stream(name):
+    """The NumPy Generator stream for a vectorized subsystem"""
+    generator = _numpy_streams.get(name)
+    if generator is None:
+        seed_value = None if _seed is None else _derive(name)
+        generator = np.random.Generator(np.random.PCG64(seed_value))
+        _numpy_streams[name] = generator
+    return generator
+
+
+def get_state():
+    """Master seed and the state of every stream, for save states"""
+    return {
+        "seed": _seed,
+        "streams": {name: generator.getstate() for name, generator in _streams.items()},
+        "numpy_streams": {name: generator.bit_generator.state
+                          for name, generator in _numpy_streams.items()},
+    }
+
+
+def set_state(state):
+    """Restore what get_state() returned; streams are updated in place"""
+    global _seed
+    _seed = state["seed"]
+    for name, generator_state in state["streams"].items():
+        stream(name).setstate(generator_state)
+    for name, generator_state in state["numpy_streams"].items():
+        numpy_stream(name).bit_generator.state = generator_state
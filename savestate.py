@@ -0,0 +1,374 @@
+import json
+import random
+import struct
+import zlib
+from itertools import chain
+import numpy as np
+from asteroid import Asteroid, OUTLINE_TEMPLATES
+from bomb import Bomb
+from constants import PARTICLE_CAPACITY
+from engine import GameWorld
+from explosion import Explosion
+from pool import collect_pools
+from powerup import ShieldPowerUp, SpeedPowerUp
+from rng import get_state, set_state
+from shot import Shot
+from weapons import WeaponType
+
+__all__ = ["dumps", "loads", "save", "load"]
+
+# magic, format version, flags; then the metadata JSON and the arrays
+_HEADER = struct.Struct("<4sHH")
+_MAGIC = b"ASTS"
+_VERSION = 3
+_COMPRESSED = 1
+_META = struct.Struct("<I")  # metadata JSON length
+_ARRAY = struct.Struct("<BBB")  # name length, dtype length, number of dimensions
+_DIM = struct.Struct("<I")
+
+_POWERUP_KINDS = (ShieldPowerUp, SpeedPowerUp)
+# Per-ship float and int columns, in array column order
+_PLAYER_FLOATS = ("rotation", "player_shot_cooldown", "invincibility_timer", "blink_timer",
+                  "shield_timer", "speed_boost_timer", "speed_multiplier")
+_PLAYER_INTS = ("invincible", "visible", "weapon_index", "laser_active", "bomb_count", "shield_active")
+_EXPLOSION_FLOATS = ("expanding_ring_radius", "ring_max_radius", "ring_speed", "lifetime")
+# Every array loads() reads: name -> (entity group, shape after the row axis).
+# Arrays in one group have one row per entity.
+_ARRAYS = {
+    "asteroid_positions": ("asteroids", (2,)),
+    "asteroid_velocities": ("asteroids", (2,)),
+    "asteroid_radii": ("asteroids", ()),
+    "asteroid_rotations": ("asteroids", ()),
+    "asteroid_rotation_speeds": ("asteroids", ()),
+    "asteroid_ages": ("asteroids", ()),
+    "asteroid_outlines": ("asteroids", ()),
+    "free_asteroid_radii": ("free_asteroids", ()),
+    "free_asteroid_outlines": ("free_asteroids", ()),
+    "shot_positions": ("shots", (2,)),
+    "shot_velocities": ("shots", (2,)),
+    "shot_radii": ("shots", ()),
+    "shot_colors": ("shots", (3,)),
+    "bomb_positions": ("bombs", (2,)),
+    "bomb_velocities": ("bombs", (2,)),
+    "bomb_fuse_timers": ("bombs", ()),
+    "bomb_exploded": ("bombs", ()),
+    "powerup_kinds": ("powerups", ()),
+    "powerup_positions": ("powerups", (2,)),
+    "powerup_velocities": ("powerups", (2,)),
+    "powerup_timers": ("powerups", (2,)),
+    "explosion_positions": ("explosions", (2,)),
+    "explosion_floats": ("explosions", (len(_EXPLOSION_FLOATS),)),
+    "player_positions": ("players", (2,)),
+    "player_velocities": ("players", (2,)),
+    "player_floats": ("players", (len(_PLAYER_FLOATS) + 1,)),
+    "player_ints": ("players", (len(_PLAYER_INTS) + 1,)),
+    "particle_positions": ("particles", (2,)),
+    "particle_velocities": ("particles", (2,)),
+    "particle_lifetimes": ("particles", ()),
+    "particle_max_lifetimes": ("particles", ()),
+    "particle_sizes": ("particles", ()),
+    "rng_words": ("rng_streams", (625,)),
+}
+_META_NUMBERS = ("frame", "elapsed", "powerup_spawn_timer", "asteroid_spawn_timer", "asteroids_destroyed")
+_META_DICTS = {
+    "game_state": {"score", "combo_multiplier", "combo_timer", "lives", "game_over"},
+    "asteroid_population": {"spawns", "throttled", "culls", "peak"},
+    "particles": {"dropped", "peak"},
+}
+# What a truncated or corrupt state can raise while being parsed
+_CORRUPT_ERRORS = (struct.error, zlib.error, KeyError, IndexError, TypeError,
+                   AttributeError, OverflowError, UnicodeDecodeError)
+
+
+def _vectors(vectors):
+    return np.fromiter(chain.from_iterable(vectors), dtype=np.float64).reshape(-1, 2)
+
+
+def _outlines(asteroids):
+    """Outline template of each asteroid"""
+    return np.array([a.outline for a in asteroids], dtype=np.uint8)
+
+
+def _capture(world):
+    """(metadata, {name: array}) for everything a GameWorld simulates"""
+    arrays = {}
+    asteroids = list(world.asteroids)
+    store = world.asteroid_store
+    rows = [a.index for a in asteroids]
+    for column in ("positions", "velocities", "radii", "rotations", "rotation_speeds", "ages"):
+        arrays["asteroid_" + column] = getattr(store, column)[rows]
+    arrays["asteroid_outlines"] = _outlines(asteroids)
+    # Recycled asteroids keep their outline and draw less randomness than
+    # new ones, so the free list is part of the deterministic state
+    free = Asteroid.pool.free
+    arrays["free_asteroid_radii"] = np.array([a.radius for a in free], dtype=np.float64)
+    arrays["free_asteroid_outlines"] = _outlines(free)
+
+    shots = list(world.shots)
+    arrays["shot_positions"] = _vectors(s.position for s in shots)
+    arrays["shot_velocities"] = _vectors(s.velocity for s in shots)
+    arrays["shot_radii"] = np.array([s.radius for s in shots], dtype=np.float64)
+    arrays["shot_colors"] = np.array([s.color for s in shots], dtype=np.uint8).reshape(-1, 3)
+
+    bombs = list(world.bombs)
+    arrays["bomb_positions"] = _vectors(b.position for b in bombs)
+    arrays["bomb_velocities"] = _vectors(b.velocity for b in bombs)
+    arrays["bomb_fuse_timers"] = np.array([b.fuse_timer for b in bombs], dtype=np.float64)
+    arrays["bomb_exploded"] = np.array([b.exploded for b in bombs], dtype=np.uint8)
+
+    powerups = list(world.powerups)
+    arrays["powerup_kinds"] = np.array([_POWERUP_KINDS.index(type(p)) for p in powerups], dtype=np.uint8)
+    arrays["powerup_positions"] = _vectors(p.position for p in powerups)
+    arrays["powerup_velocities"] = _vectors(p.velocity for p in powerups)
+    arrays["powerup_timers"] = np.array([(p.lifetime, p.age) for p in powerups], dtype=np.float64).reshape(-1, 2)
+
+    explosions = list(world.explosions)
+    arrays["explosion_positions"] = _vectors(e.position for e in explosions)
+    arrays["explosion_floats"] = np.array([[getattr(e, name) for name in _EXPLOSION_FLOATS] for e in explosions],
+                                          dtype=np.float64).reshape(-1, len(_EXPLOSION_FLOATS))
+
+    players = world.players
+    arrays["player_positions"] = _vectors(p.position for p in players)
+    arrays["player_velocities"] = _vectors(p.velocity for p in players)
+    arrays["player_floats"] = np.array(
+        [[getattr(p, name) for name in _PLAYER_FLOATS] + [world.lasers[p].damage_timer] for p in players],
+        dtype=np.float64).reshape(-1, len(_PLAYER_FLOATS) + 1)
+    arrays["player_ints"] = np.array(
+        [[getattr(p, name) for name in _PLAYER_INTS] + [world.lasers[p].active] for p in players],
+        dtype=np.int64).reshape(-1, len(_PLAYER_INTS) + 1)
+
+    particles = world.particles
+    n = particles.count
+    for column in ("positions", "velocities", "lifetimes", "max_lifetimes", "sizes"):
+        arrays["particle_" + column] = getattr(particles, column)[:n]
+
+    # Mersenne Twister streams as uint32 words; the rest goes in the metadata
+    rng = get_state()
+    names = sorted(rng["streams"])
+    arrays["rng_words"] = np.array([rng["streams"][name][1] for name in names], dtype=np.uint32).reshape(-1, 625)
+
+    game_state = world.game_state
+    meta = {
+        "frame": world.frame,
+        "elapsed": world.elapsed,
+        "powerup_spawn_timer": world.powerup_spawn_timer,
+        "asteroid_spawn_timer": world.asteroid_field.spawn_timer,
+        "asteroid_population": world.asteroid_field.population.stats(),
+        "asteroids_destroyed": world.asteroids_destroyed,
+        "game_state": {"score": game_state.score, "combo_multiplier": game_state.combo_multiplier,
+                       "combo_timer": game_state.combo_timer, "lives": game_state.lives,
+                       "game_over": game_state.game_over},
+        "particles": {"dropped": particles.dropped, "peak": particles.peak},
+        "rng": {
+            "seed": rng["seed"],
+            "streams": [[name, rng["streams"][name][0], rng["streams"][name][2]] for name in names],
+            "numpy_streams": rng["numpy_streams"],
+        },
+    }
+    return meta, arrays
+
+
+def dumps(world, compress=True):
+    """The complete simulation state of world as bytes.
+
+    Every entity goes into packed NumPy columns, scalars into a small JSON
+    header. Restoring with loads() and stepping with the same Controls
+    continues bit-identically, so states also work as replay keyframes.
+    """
+    meta, arrays = _capture(world)
+    parts = []
+    meta_bytes = json.dumps(meta, separators=(",", ":")).encode()
+    parts.append(_META.pack(len(meta_bytes)))
+    parts.append(meta_bytes)
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        dtype = array.dtype.str.encode()
+        parts.append(_ARRAY.pack(len(name), len(dtype), array.ndim))
+        parts.append(name.encode())
+        parts.append(dtype)
+        parts.extend(_DIM.pack(size) for size in array.shape)
+        parts.append(array.tobytes())
+    body = b"".join(parts)
+    flags = 0
+    if compress:
+        body, flags = zlib.compress(body, 1), _COMPRESSED
+    return _HEADER.pack(_MAGIC, _VERSION, flags) + body
+
+
+def _parse(data):
+    magic, version, flags = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"not a version {_VERSION} save state")
+    body = memoryview(data)[_HEADER.size:]
+    if flags & _COMPRESSED:
+        body = memoryview(zlib.decompress(body))
+    (meta_size,) = _META.unpack_from(body)
+    offset = _META.size
+    meta = json.loads(bytes(body[offset:offset + meta_size]))
+    offset += meta_size
+    arrays = {}
+    while offset < len(body):
+        name_size, dtype_size, ndim = _ARRAY.unpack_from(body, offset)
+        offset += _ARRAY.size
+        name = bytes(body[offset:offset + name_size]).decode()
+        offset += name_size
+        dtype = np.dtype(bytes(body[offset:offset + dtype_size]).decode())
+        offset += dtype_size
+        shape = tuple(_DIM.unpack_from(body, offset + i * _DIM.size)[0] for i in range(ndim))
+        offset += ndim * _DIM.size
+        size = int(np.prod(shape)) * dtype.itemsize
+        arrays[name] = np.frombuffer(body[offset:offset + size], dtype=dtype).reshape(shape)
+        offset += size
+    return meta, arrays
+
+
+def _in_range(array, limit):
+    return bool(((array >= 0) & (array < limit)).all())
+
+
+def _validate(meta, arrays):
+    """Check that a parsed state is complete and consistent, so loads() can
+    build the world without failing halfway; returns the RNG state"""
+    rows = {}
+    for name, (group, shape) in _ARRAYS.items():
+        array = arrays[name]
+        if array.ndim != len(shape) + 1 or array.shape[1:] != shape or array.dtype.kind not in "biuf":
+            raise ValueError(f"bad {name} array {array.dtype}{array.shape}")
+        if rows.setdefault(group, len(array)) != len(array):
+            raise ValueError(f"{name} has {len(array)} rows, expected {rows[group]}")
+    if not (_in_range(arrays["asteroid_outlines"], len(OUTLINE_TEMPLATES))
+            and _in_range(arrays["free_asteroid_outlines"], len(OUTLINE_TEMPLATES))
+            and _in_range(arrays["powerup_kinds"], len(_POWERUP_KINDS))
+            and _in_range(arrays["player_ints"][:, _PLAYER_INTS.index("weapon_index")], len(WeaponType))):
+        raise ValueError("index out of range")
+    if rows["particles"] > PARTICLE_CAPACITY:
+        raise ValueError(f"{rows['particles']} particles exceed the capacity of {PARTICLE_CAPACITY}")
+
+    for key in _META_NUMBERS:
+        if not isinstance(meta[key], (int, float)):
+            raise ValueError(f"bad {key} {meta[key]!r}")
+    for key, names in _META_DICTS.items():
+        if set(meta[key]) != names:
+            raise ValueError(f"bad {key} fields {sorted(meta[key])}")
+
+    # Trial restores, so a bad stream state fails here rather than in set_state
+    rng = meta["rng"]
+    if rng["seed"] is not None and not isinstance(rng["seed"], int):
+        raise ValueError(f"bad RNG seed {rng['seed']!r}")
+    if len(rng["streams"]) != rows["rng_streams"]:
+        raise ValueError("RNG stream count does not match the stored words")
+    streams = {name: (version, tuple(words), gauss)
+               for (name, version, gauss), words in zip(rng["streams"], arrays["rng_words"].tolist())}
+    for state in streams.values():
+        random.Random().setstate(state)
+    for state in rng["numpy_streams"].values():
+        np.random.PCG64().state = state
+    return {"seed": rng["seed"], "streams": streams, "numpy_streams": rng["numpy_streams"]}
+
+
+def loads(data, profiler=None):
+    """A new GameWorld in the state dumps() captured.
+
+    Raises ValueError for a truncated or corrupt state. The whole state is
+    parsed and checked before the world is built, since GameWorld() swaps
+    the class-level stores the running game uses.
+    """
+    try:
+        meta, arrays = _parse(data)
+        rng = _validate(meta, arrays)
+    except _CORRUPT_ERRORS as error:
+        raise ValueError(f"corrupt save state: {error!r}") from error
+    world = GameWorld(profiler=profiler, players=0)
+
+    # Free asteroids first: each takes a store row and parks it on kill(),
+    # leaving the shared store empty for the live ones
+    for radius, outline in zip(arrays["free_asteroid_radii"].tolist(), arrays["free_asteroid_outlines"].tolist()):
+        asteroid = Asteroid.restored(outline)
+        asteroid.radius = radius
+        asteroid.kill()
+    collect_pools()
+
+    store = world.asteroid_store
+    outlines = arrays["asteroid_outlines"].tolist()
+    for outline in outlines:
+        Asteroid.restored(outline)
+    n = len(outlines)
+    for column in ("positions", "velocities", "radii", "rotations", "rotation_speeds", "ages"):
+        getattr(store, column)[:n] = arrays["asteroid_" + column]
+
+    for position, velocity, radius, color in zip(arrays["shot_positions"].tolist(), arrays["shot_velocities"].tolist(),
+                                                 arrays["shot_radii"].tolist(), arrays["shot_colors"].tolist()):
+        shot = Shot.acquire(position[0], position[1], radius, tuple(color))
+        shot.velocity = velocity
+
+    for position, velocity, fuse, exploded in zip(arrays["bomb_positions"].tolist(), arrays["bomb_velocities"].tolist(),
+                                                  arrays["bomb_fuse_timers"].tolist(), arrays["bomb_exploded"].tolist()):
+        bomb = Bomb(*position)
+        bomb.velocity.update(velocity)
+        bomb.fuse_timer = fuse
+        bomb.exploded = bool(exploded)
+
+    for kind, position, velocity, (lifetime, age) in zip(
+            arrays["powerup_kinds"].tolist(), arrays["powerup_positions"].tolist(),
+            arrays["powerup_velocities"].tolist(), arrays["powerup_timers"].tolist()):
+        powerup = _POWERUP_KINDS[kind](*position)
+        powerup.velocity.update(velocity)
+        powerup.lifetime = lifetime
+        powerup.age = age
+        powerup.animate(0)
+
+    for position, values in zip(arrays["explosion_positions"].tolist(), arrays["explosion_floats"].tolist()):
+        # Emits a burst, but the particle arrays and RNG are restored below
+        explosion = Explosion.acquire(position[0], position[1], values[1] / 1.5)
+        for name, value in zip(_EXPLOSION_FLOATS, values):
+            setattr(explosion, name, value)
+
+    for position, velocity, floats, ints in zip(arrays["player_positions"].tolist(), arrays["player_velocities"].tolist(),
+                                                arrays["player_floats"].tolist(), arrays["player_ints"].tolist()):
+        player = world.add_player(*position)
+        player.velocity.update(velocity)
+        for name, value in zip(_PLAYER_FLOATS, floats):
+            setattr(player, name, value)
+        for name, value in zip(_PLAYER_INTS, ints):
+            setattr(player, name, value if name in ("weapon_index", "bomb_count") else bool(value))
+        player.current_weapon = player.available_weapons[player.weapon_index]
+        laser = world.lasers[player]
+        laser.damage_timer = floats[-1]
+        laser.active = bool(ints[-1])
+        if laser.active:
+            laser.update(0)
+    world.player = world.players[0] if world.players else None
+    world.laser = world.lasers.get(world.player)
+
+    particles = world.particles
+    n = len(arrays["particle_lifetimes"])
+    for column in ("positions", "velocities", "lifetimes", "max_lifetimes", "sizes"):
+        getattr(particles, column)[:n] = arrays["particle_" + column]
+    particles.count = n
+    particles.dropped = meta["particles"]["dropped"]
+    particles.peak = meta["particles"]["peak"]
+
+    world.frame = meta["frame"]
+    world.elapsed = meta["elapsed"]
+    world.powerup_spawn_timer = meta["powerup_spawn_timer"]
+    world.asteroid_field.spawn_timer = meta["asteroid_spawn_timer"]
+    for name, value in meta["asteroid_population"].items():
+        setattr(world.asteroid_field.population, name, value)
+    world.asteroids_destroyed = meta["asteroids_destroyed"]
+    for name, value in meta["game_state"].items():
+        setattr(world.game_state, name, value)
+
+    set_state(rng)
+    return world
+
+
+def save(path, world, compress=True):
+    data = dumps(world, compress)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def load(path, profiler=None):
+    with open(path, "rb") as f:
+        return loads(f.read(), profiler)
@@ -0,0 +1,234 @@
+import argparse
+import socket
+import time
+from dataclasses import replace
+from constants import (FIXED_TIMESTEP, NET_PORT, NET_SNAPSHOT_RATE, NET_CLIENT_TIMEOUT,
+                       NET_RESTART_DELAY, SCREEN_WIDTH, SCREEN_HEIGHT)
+from controls import Controls
+from engine import GameWorld
+from profiler import FrameProfiler
+from netcode import (JOIN, INPUT, LEAVE, WELCOME, EntityIds, SnapshotHistory, capture,
+                     capture_game_state, encode_snapshot, pack, unpack)
+
+__all__ = ["GameServer", "RemoteClient"]
+
+_MAX_DATAGRAM = 65507
+_REPORT_SECONDS = 5.0
+
+
+class RemoteClient:
+    """Server-side record of one connected client and its ship"""
+
+    def __init__(self, address, player, now):
+        self.address = address
+        self.player = player
+        self.controls = Controls()
+        # Edge-triggered presses received since the last tick
+        self.pending_switch = False
+        self.pending_bomb = False
+        self.input_sequence = 0
+        self.last_heard = now
+        self.acked = 0  # Newest snapshot the client has confirmed
+        self.history = SnapshotHistory()
+        self.bytes_sent = 0
+        self.snapshots_sent = 0
+        self.dropped = 0  # Snapshots too large for one datagram
+
+
+class GameServer:
+    """Authoritative co-op server: one GameWorld, any number of UDP clients.
+
+    The world runs at the fixed FIXED_TIMESTEP rate with each client's
+    latest input. Every snapshot_rate-th of a second each client gets a
+    quantised snapshot, delta-compressed against the newest snapshot it
+    acknowledged; clients interpolate between them (see client.py).
+    """
+
+    def __init__(self, host="0.0.0.0", port=NET_PORT, seed=None, snapshot_rate=NET_SNAPSHOT_RATE):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.address = self.sock.getsockname()
+        self.seed = seed
+        self.round = 0
+        self.profiler = FrameProfiler(enabled=True)
+        self.ids = EntityIds()
+        self.clients = {}  # address -> RemoteClient
+        self.tick = 0
+        self.snapshot_id = 0
+        self.snapshot_interval = max(1, round(1 / (FIXED_TIMESTEP * snapshot_rate)))
+        self.game_over_timer = 0.0
+        self.world = self._new_world()
+
+    def _new_world(self):
+        seed = self.seed + self.round if self.seed is not None else None
+        return GameWorld(seed=seed, profiler=self.profiler, players=0)
+
+    def _welcome(self, client):
+        player_id = self.ids.id_of(client.player)
+        self.sock.sendto(pack(WELCOME, player_id, self.snapshot_interval, round(1 / FIXED_TIMESTEP)),
+                         client.address)
+
+    def receive(self, now):
+        """Handle every datagram waiting on the socket"""
+        while True:
+            try:
+                data, address = self.sock.recvfrom(_MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionResetError:
+                continue  # ICMP port unreachable from a client that went away
+            packet = unpack(data)
+            if packet is None:
+                continue
+            packet_type, fields, _ = packet
+            client = self.clients.get(address)
+            if packet_type == JOIN:
+                if client is None:
+                    player = self.world.add_player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+                    client = self.clients[address] = RemoteClient(address, player, now)
+                    print(f"Client {address[0]}:{address[1]} joined ({len(self.clients)} connected)")
+                client.last_heard = now
+                self._welcome(client)  # Again if the first WELCOME was lost
+            elif client is None:
+                continue
+            elif packet_type == INPUT:
+                sequence, ack, bits = fields
+                client.last_heard = now
+                if ack in client.history and ack > client.acked:
+                    client.acked = ack
+                if sequence <= client.input_sequence:
+                    continue  # Late or duplicated datagram
+                client.input_sequence = sequence
+                client.controls = Controls.from_bits(bits)
+                client.pending_switch |= client.controls.switch_weapon
+                client.pending_bomb |= client.controls.drop_bomb
+            elif packet_type == LEAVE:
+                self._drop(client, "left")
+
+    def _drop(self, client, reason):
+        del self.clients[client.address]
+        if client.player in self.world.players:
+            self.world.remove_player(client.player)
+        print(f"Client {client.address[0]}:{client.address[1]} {reason} ({len(self.clients)} connected)")
+
+    def step(self):
+        """One fixed simulation tick, plus snapshots when they are due"""
+        now = time.monotonic()
+        with self.profiler.phase("receive"):
+            self.receive(now)
+            for client in list(self.clients.values()):
+                if now - client.last_heard > NET_CLIENT_TIMEOUT:
+                    self._drop(client, "timed out")
+
+        controls = {}
+        for client in self.clients.values():
+            controls[client.player] = replace(client.controls, switch_weapon=client.pending_switch,
+                                              drop_bomb=client.pending_bomb)
+            client.pending_switch = client.pending_bomb = False
+        self.world.step(FIXED_TIMESTEP, controls)
+        self.tick += 1
+        self.ids.sync(self.world)
+
+        if self.world.game_state.game_over:
+            self.game_over_timer += FIXED_TIMESTEP
+            if self.game_over_timer >= NET_RESTART_DELAY:
+                self.restart()
+
+        if self.tick % self.snapshot_interval == 0:
+            with self.profiler.phase("snapshot"):
+                self.broadcast()
+
+    def restart(self):
+        """New round with every connected client given a fresh ship"""
+        self.round += 1
+        self.game_over_timer = 0.0
+        self.world = self._new_world()
+        self.ids.reset()
+        for client in self.clients.values():
+            client.player = self.world.add_player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+            self._welcome(client)
+        self.ids.sync(self.world)
+
+    def broadcast(self):
+        """Send every client a snapshot delta against its acknowledged one"""
+        if not self.clients:
+            return
+        state = capture(self.world, self.ids)
+        game_state = capture_game_state(self.world.game_state)
+        self.snapshot_id += 1
+        for client in self.clients.values():
+            baseline = client.history.get(client.acked)
+            baseline_id = client.acked if baseline is not None else 0
+            packet = encode_snapshot(self.snapshot_id, self.tick, game_state, state, baseline, baseline_id)
+            client.history.add(self.snapshot_id, state)
+            client.history.drop_before(client.acked)
+            if len(packet) > _MAX_DATAGRAM:
+                client.dropped += 1
+                continue
+            try:
+                self.sock.sendto(packet, client.address)
+            except OSError:
+                client.dropped += 1
+                continue
+            client.bytes_sent += len(packet)
+            client.snapshots_sent += 1
+
+    def stats(self, seconds):
+        """Tick time percentiles and per-client bandwidth since the last call"""
+        frame = self.profiler.percentiles().get("frame", (0.0, 0.0, 0.0))
+        clients = {}
+        for client in self.clients.values():
+            clients[f"{client.address[0]}:{client.address[1]}"] = {
+                "kbps": round(client.bytes_sent * 8 / 1000 / seconds, 1),
+                "snapshots": client.snapshots_sent,
+                "dropped": client.dropped,
+                "acked": client.acked,
+            }
+            client.bytes_sent = client.snapshots_sent = 0
+        return {
+            "tick": self.tick,
+            "tick_ms": [round(float(value), 3) for value in frame],
+            "entities": self.world.entity_counts(),
+            "clients": clients,
+        }
+
+    def run(self, seconds=None):
+        """Tick in real time until interrupted or seconds have passed"""
+        print(f"Serving on {self.address[0]}:{self.address[1]}")
+        start = next_tick = last_report = time.perf_counter()
+        try:
+            while seconds is None or time.perf_counter() - start < seconds:
+                now = time.perf_counter()
+                if now < next_tick:
+                    time.sleep(next_tick - now)
+                    continue
+                if now - next_tick > FIXED_TIMESTEP * 15:
+                    next_tick = now  # Fell far behind; drop the backlog instead of racing
+                self.profiler.begin_frame()
+                self.step()
+                self.profiler.end_frame(self.world.entity_counts())
+                next_tick += FIXED_TIMESTEP
+                if now - last_report >= _REPORT_SECONDS:
+                    stats = self.stats(now - last_report)
+                    print(f"tick {stats['tick']}: {stats['tick_ms']} ms p50/p95/p99, clients {stats['clients']}")
+                    last_report = now
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.sock.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Authoritative Asteroids co-op server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=NET_PORT)
+    parser.add_argument("--seed", type=int, help="seed for the first round (later rounds add the round number)")
+    parser.add_argument("--snapshot-rate", type=int, default=NET_SNAPSHOT_RATE, help="snapshots per second")
+    parser.add_argument("--seconds", type=float, help="stop after this long")
+    args = parser.parse_args(argv)
+    GameServer(args.host, args.port, args.seed, args.snapshot_rate).run(args.seconds)
+
+
+if __name__ == "__main__":
+    main()
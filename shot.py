@@ -1,20 +1,39 @@
 import pygame
 from circleshape import CircleShape
-from constants import SHOT_RADIUS, PLAYER_SHOOT_SPEED, SCREEN_WIDTH, SCREEN_HEIGHT
+from pool import Pooled
+from ecs import StoredEntity, vector_column, scalar_column
+from shot_store import ShotStore
+from constants import SHOT_RADIUS
+
+class Shot(StoredEntity, Pooled, CircleShape):
+    # Shared storage; GameWorld swaps in one registered with `updatable`
+    # and `drawable`, which moves, culls and draws every shot
+    store = ShotStore()
 
-class Shot(CircleShape):
     def __init__(self, x, y, radius=None, color=None):
+        self.index = self.store.allocate(self)
         super().__init__(x, y, radius if radius else SHOT_RADIUS)
+        self.previous_position = (x, y)
+        self.color = color if color else (255, 255, 255)
+
+    def reset(self, x, y, radius=None, color=None):
+        self._rejoin()
+        self.position = (x, y)
+        self.previous_position = (x, y)
+        self.velocity = (0, 0)
+        self.radius = radius if radius else SHOT_RADIUS
         self.color = color if color else (255, 255, 255)
 
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.position.x), int(self.position.y)), self.radius)
+    position = vector_column("positions")
+    # Where the last move started; equals position until the shot first moves
+    previous_position = vector_column("previous_positions")
+    velocity = vector_column("velocities")
+    radius = scalar_column("radii")
+
+    @property
+    def color(self):
+        return tuple(self.store.colors[self.index].tolist())
 
-    def update(self, dt):
-        self.position += self.velocity * dt
-        # Remove shot if off-screen
-        if (self.position.x < -self.radius or
-            self.position.x > SCREEN_WIDTH + self.radius or
-            self.position.y < -self.radius or
-            self.position.y > SCREEN_HEIGHT + self.radius):
-            self.kill()
\ No newline at end of file
+    @color.setter
+    def color(self, value):
+        self.store.colors[self.index] = pygame.Color(value)[:3]
@@ -0,0 +1,61 @@
+import numpy as np
+import pygame
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, LINE_WIDTH, SHOT_STORE_CAPACITY
+from ecs import ComponentStore
+
+
+class ShotStore(ComponentStore):
+    """Column storage for shots.
+
+    Added to `updatable` and `drawable`, the store moves every shot in one
+    vectorized step and draws them, so Shot handles need no per-object
+    update or draw. GameWorld calls cull() once collisions have been swept,
+    so a shot can still hit something on its way off the screen.
+    """
+
+    components = {
+        "positions": ((2,), np.float64),
+        "previous_positions": ((2,), np.float64),  # Start of the last move, for swept collisions
+        "velocities": ((2,), np.float64),
+        "radii": ((), np.float64),
+        "colors": ((3,), np.uint8),
+    }
+
+    def __init__(self, capacity=SHOT_STORE_CAPACITY):
+        super().__init__(capacity)
+
+    def update(self, dt):
+        n = self.count
+        if n == 0:
+            return
+        self.previous_positions[:n] = self.positions[:n]
+        self.positions[:n] += self.velocities[:n] * dt
+
+    def cull(self):
+        """Kill the shots that left the screen"""
+        n = self.count
+        x = self.positions[:n, 0]
+        y = self.positions[:n, 1]
+        r = self.radii[:n]
+        offscreen = (x < -r) | (x > SCREEN_WIDTH + r) | (y < -r) | (y > SCREEN_HEIGHT + r)
+        # Collect handles first: each kill moves another row into the gap
+        for shot in [self.handles[i] for i in np.flatnonzero(offscreen).tolist()]:
+            shot.kill()
+
+    def draw(self, screen):
+        n = self.count
+        points = self.positions[:n].astype(np.int32).tolist()
+        for color, point, radius in zip(self.colors[:n].tolist(), points, self.radii[:n].tolist()):
+            pygame.draw.circle(screen, color, point, radius)
+
+    def bounding_rect(self):
+        # Shots report their areas through rects() instead
+        return None
+
+    def rects(self):
+        """Screen areas touched by draw(), one per shot"""
+        n = self.count
+        corners = self.positions[:n].astype(np.int32)
+        extents = (self.radii[:n] + LINE_WIDTH).astype(np.int32) + 2
+        return [pygame.Rect(x - e, y - e, e * 2, e * 2)
+                for (x, y), e in zip(corners.tolist(), extents.tolist())]
@@ -0,0 +1,172 @@
+import math
+import numpy as np
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, SPATIAL_HASH_CELL_SIZE
+
+
+class SpatialHash:
+    """Uniform grid broadphase over the wrapping play field.
+
+    Cells are indexed modulo the grid size, so sprites sitting in the
+    off-screen wrap margin (see CircleShape.wrap_position) land in the cells
+    on the opposite edge. Queries return candidates only; callers still run
+    the exact collision test.
+    """
+
+    def __init__(self, cell_size=SPATIAL_HASH_CELL_SIZE,
+                 width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.cells = {}
+
+    def _span(self, low, high, count):
+        """Wrapped cell indices covering the interval [low, high]"""
+        first = math.floor(low / self.cell_size)
+        last = math.floor(high / self.cell_size)
+        if last - first >= count:
+            return range(count)
+        return [i % count for i in range(first, last + 1)]
+
+    def _keys(self, min_x, min_y, max_x, max_y):
+        rows = self._span(min_y, max_y, self.rows)
+        for cx in self._span(min_x, max_x, self.cols):
+            for cy in rows:
+                yield (cx, cy)
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, sprite):
+        """Add a sprite to every cell its bounding box touches"""
+        x, y, r = sprite.position.x, sprite.position.y, sprite.radius
+        for key in self._keys(x - r, y - r, x + r, y + r):
+            cell = self.cells.get(key)
+            if cell is None:
+                self.cells[key] = [sprite]
+            else:
+                cell.append(sprite)
+
+    def insert_all(self, sprites):
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def rebuild(self, sprites):
+        """Re-bucket all sprites from their current position/radius"""
+        self.cells.clear()
+        self.insert_all(sprites)
+
+    def _spans(self, low, high, count):
+        """Vectorized _span: first wrapped cell index and cell count for
+        each interval"""
+        first = np.floor(low / self.cell_size).astype(np.int64)
+        length = np.floor(high / self.cell_size).astype(np.int64) - first + 1
+        full = length > count
+        return np.where(full, 0, first), np.where(full, count, length)
+
+    def rebuild_columns(self, sprites, positions, radii):
+        """rebuild() from column arrays: positions (n, 2) and radii (n,)
+        belonging to sprites, in that order. Cells list their sprites in
+        the same order as rebuild() would."""
+        self.cells.clear()
+        n = len(sprites)
+        if n == 0:
+            return
+        x, y = positions[:, 0], positions[:, 1]
+        first_x, count_x = self._spans(x - radii, x + radii, self.cols)
+        first_y, count_y = self._spans(y - radii, y + radii, self.rows)
+        # One entry per (sprite, cell) pair
+        counts = count_x * count_y
+        owners = np.repeat(np.arange(n), counts)
+        starts = np.cumsum(counts) - counts
+        local = np.arange(len(owners)) - np.repeat(starts, counts)
+        cx = (first_x[owners] + local // count_y[owners]) % self.cols
+        cy = (first_y[owners] + local % count_y[owners]) % self.rows
+        keys = cx * self.rows + cy
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        ordered = [sprites[i] for i in owners[order].tolist()]
+        bounds = np.flatnonzero(np.diff(keys)) + 1
+        lows = [0] + bounds.tolist()
+        highs = bounds.tolist() + [len(ordered)]
+        for key, low, high in zip(keys[lows].tolist(), lows, highs):
+            self.cells[divmod(key, self.rows)] = ordered[low:high]
+
+    def _collect(self, keys):
+        # dict keeps first-seen order and removes duplicates across cells
+        found = {}
+        for key in keys:
+            cell = self.cells.get(key)
+            if cell:
+                for sprite in cell:
+                    found[sprite] = None
+        return list(found)
+
+    def query_circle(self, center, radius):
+        """Candidates that may overlap the circle at center with radius"""
+        x, y = center[0], center[1]
+        return self._collect(self._keys(x - radius, y - radius, x + radius, y + radius))
+
+    def query_segment(self, start, end, radius=0):
+        """Candidates that may touch the segment start-end thickened by radius"""
+        min_x = min(start[0], end[0]) - radius
+        max_x = max(start[0], end[0]) + radius
+        min_y = min(start[1], end[1]) - radius
+        max_y = max(start[1], end[1]) + radius
+        return self._collect(self._keys(min_x, min_y, max_x, max_y))
+
+    def _ray_cells(self, x0, y0, x1, y1):
+        """Wrapped keys of the cells a segment passes through, in order
+        from start to end (Amanatides-Woo grid traversal)"""
+        size = self.cell_size
+        cx, cy = math.floor(x0 / size), math.floor(y0 / size)
+        end_cx, end_cy = math.floor(x1 / size), math.floor(y1 / size)
+        dx, dy = x1 - x0, y1 - y0
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        # Ray parameter at the next vertical/horizontal cell boundary
+        t_max_x = ((cx + (dx > 0)) * size - x0) / dx if dx else math.inf
+        t_max_y = ((cy + (dy > 0)) * size - y0) / dy if dy else math.inf
+        t_delta_x = size / abs(dx) if dx else math.inf
+        t_delta_y = size / abs(dy) if dy else math.inf
+
+        yield (cx % self.cols, cy % self.rows)
+        for _ in range(abs(end_cx - cx) + abs(end_cy - cy)):
+            if t_max_x < t_max_y:
+                cx += step_x
+                t_max_x += t_delta_x
+            else:
+                cy += step_y
+                t_max_y += t_delta_y
+            yield (cx % self.cols, cy % self.rows)
+
+    def raycast(self, start, end):
+        """Sprites whose circle the segment start-end touches, as
+        (distance along the ray to the entry point, sprite) sorted nearest
+        first. Only the cells along the segment are visited."""
+        sx, sy = start[0], start[1]
+        dx, dy = end[0] - sx, end[1] - sy
+        length_sq = dx * dx + dy * dy
+        if length_sq == 0:
+            return []
+        length = math.sqrt(length_sq)
+
+        hits = []
+        for sprite in self._collect(self._ray_cells(sx, sy, end[0], end[1])):
+            position = sprite.position
+            fx = position.x - sx
+            fy = position.y - sy
+            r_sq = sprite.radius * sprite.radius
+            # Reject by distance from the centre to the nearest point on the segment
+            t = max(0.0, min(1.0, (fx * dx + fy * dy) / length_sq))
+            ox, oy = fx - dx * t, fy - dy * t
+            if ox * ox + oy * oy > r_sq:
+                continue
+            along = (fx * dx + fy * dy) / length
+            perp_sq = max(0.0, fx * fx + fy * fy - along * along)
+            entry = along - math.sqrt(max(0.0, r_sq - perp_sq))
+            hits.append((max(0.0, entry), sprite))
+        hits.sort(key=lambda hit: hit[0])
+        return hits
+
+    def __len__(self):
+        return len(self.cells)
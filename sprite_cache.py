@@ -0,0 +1,83 @@
+import math
+from collections import OrderedDict
+import pygame
+from constants import ROTATION_CACHE_STEPS, ROTATION_CACHE_MAX_BYTES
+from assets import to_display_format
+
+_COLORKEY = (255, 0, 255)
+
+
+class RotationCache:
+    """LRU cache of outline polygons pre-rendered at quantised rotations.
+
+    Each (shape key, rotation step) pair is rasterised once onto a
+    transparent surface. Drawing then blits the nearest step instead of
+    rotating vertices and filling a polygon every frame. Memory is bounded
+    by max_bytes of surface pixels; least recently used frames go first.
+    """
+
+    def __init__(self, steps=ROTATION_CACHE_STEPS, max_bytes=ROTATION_CACHE_MAX_BYTES):
+        self.steps = steps
+        self.max_bytes = max_bytes
+        self.frames = OrderedDict()
+        self.bytes = 0
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, shape_key, vertices, rotation, color, width):
+        """Surface for the outline of vertices (around (0, 0)) at rotation.
+
+        The outline's centre is the centre of the returned surface.
+        """
+        step = round(rotation * self.steps / 360) % self.steps
+        key = (shape_key, step)
+        frame = self.frames.get(key)
+        if frame is not None:
+            self.frames.move_to_end(key)
+            self.hits += 1
+            return frame
+
+        self.misses += 1
+        frame = self._render(vertices, step * 360 / self.steps, color, width)
+        self.frames[key] = frame
+        self.bytes += frame.get_width() * frame.get_height() * 4
+        while self.bytes > self.max_bytes and len(self.frames) > 1:
+            _, old = self.frames.popitem(last=False)
+            self.bytes -= old.get_width() * old.get_height() * 4
+            self.evictions += 1
+        return frame
+
+    def _render(self, vertices, angle, color, width):
+        extent = max(v.length() for v in vertices) + width
+        half = math.ceil(extent) + 1
+        # Hard-edged outlines need no per-pixel alpha: an RLE colorkey blit
+        # only touches the outline's pixels and is several times faster
+        surface = pygame.Surface((half * 2, half * 2))
+        surface.fill(_COLORKEY)
+        points = [(int(half + v.x), int(half + v.y))
+                  for v in (v.rotate(angle) for v in vertices)]
+        pygame.draw.polygon(surface, color, points, width)
+        surface = to_display_format(surface)
+        surface.set_colorkey(_COLORKEY, pygame.RLEACCEL)
+        return surface
+
+    def blit(self, screen, position, shape_key, vertices, rotation, color, width):
+        frame = self.get(shape_key, vertices, rotation, color, width)
+        half_w = frame.get_width() // 2
+        half_h = frame.get_height() // 2
+        return screen.blit(frame, (int(position.x) - half_w, int(position.y) - half_h))
+
+    def clear(self):
+        self.frames.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            "frames": len(self.frames),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
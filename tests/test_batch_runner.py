@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from batch_runner import apply_overrides, make_jobs, restore_overrides, run_batch
+from headless import PILOTS, run_headless
+from logger import configure_events
+
+
+class RunBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_workers_leave_the_event_log_alone(self):
+        with open("game_events.jsonl", "w") as f:
+            f.write("existing\n")
+        # Events on in this process and in freshly started workers
+        configure_events("info")
+        self.addCleanup(configure_events, "off")
+        self.enterContext(mock.patch.dict(os.environ, {"ASTEROIDS_LOG_LEVEL": "info"}))
+        # Idle ships get hit, which would log player_hit events
+        jobs = make_jobs({}, games=2, seconds=20.0, pilot="idle")
+        self.assertEqual(run_batch(jobs, "results.jsonl", workers=2), 2)
+        with open("game_events.jsonl") as f:
+            self.assertEqual(f.read(), "existing\n")
+        with open("results.jsonl") as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+
+class OverridesTest(unittest.TestCase):
+    def test_population_budget_override(self):
+        saved = apply_overrides({"ASTEROID_POPULATION_MAX": 5})
+        try:
+            summary = run_headless(60.0, pilot=PILOTS["idle"], seed=1)
+        finally:
+            restore_overrides(saved)
+        population = summary["asteroid_population"]
+        self.assertLessEqual(population["peak"], 5)
+        self.assertGreater(population["throttled"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
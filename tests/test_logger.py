@@ -0,0 +1,56 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import logger
+from logger import _QUEUE_SIZE, _LogWriter
+
+
+class LogWriterTest(unittest.TestCase):
+    def test_unwritable_path_drops_entries_without_blocking(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = _LogWriter(os.path.join(tmp, "missing", "log.jsonl"))
+            with contextlib.redirect_stderr(io.StringIO()):
+                for i in range(_QUEUE_SIZE + 10):
+                    writer.put({"i": i})
+                writer.close()
+        self.assertEqual(writer.written, 0)
+        self.assertEqual(writer.dropped, _QUEUE_SIZE + 10)
+
+    def test_unserialisable_entry_is_dropped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "log.jsonl")
+            writer = _LogWriter(path)
+            with contextlib.redirect_stderr(io.StringIO()):
+                for entry in ({"a": 1}, {"bad": object()}, {"b": 2}):
+                    writer.put(entry)
+                writer.close()
+            with open(path) as f:
+                self.assertEqual(f.read(), '{"a": 1}\n{"b": 2}\n')
+        self.assertEqual((writer.written, writer.dropped), (2, 1))
+
+
+class EnvironmentTest(unittest.TestCase):
+    def tearDown(self):
+        logger.configure_events(level=logger.OFF, enable=(), disable=(), sample={})
+
+    def test_invalid_settings_fall_back_to_defaults(self):
+        for environ in ({"ASTEROIDS_LOG_LEVEL": "verbose"},
+                        {"ASTEROIDS_LOG_LEVEL": "debug", "ASTEROIDS_LOG_SAMPLE": "asteroid_shot"}):
+            with mock.patch.dict(os.environ, environ), contextlib.redirect_stderr(io.StringIO()) as err:
+                logger._configure_from_environment()
+            self.assertIn("Ignoring", err.getvalue())
+            self.assertFalse(logger.enabled("player_hit"))
+
+    def test_valid_settings_apply(self):
+        with mock.patch.dict(os.environ, {"ASTEROIDS_LOG_LEVEL": "info"}):
+            logger._configure_from_environment()
+        self.assertTrue(logger.enabled("player_hit"))
+        self.assertFalse(logger.enabled("asteroid_shot"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+
+import rng
+
+
+class SeedTest(unittest.TestCase):
+    def tearDown(self):
+        rng.seed_all(None)
+
+    def test_negative_seed_is_reproducible(self):
+        draws = []
+        for _ in range(2):
+            rng.seed_all(-3)
+            draws.append((rng.stream("test").random(), rng.numpy_stream("test").random()))
+        self.assertEqual(draws[0], draws[1])
+        rng.seed_all(3)
+        self.assertNotEqual(rng.stream("test").random(), draws[0][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
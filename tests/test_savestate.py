@@ -0,0 +1,44 @@
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import savestate
+from asteroid import Asteroid
+from engine import GameWorld
+from headless import gunner_pilot
+from replay import world_digest
+
+
+def _play(world, steps):
+    for _ in range(steps):
+        world.step(1 / 60, gunner_pilot(world.frame, world))
+
+
+class SaveStateTest(unittest.TestCase):
+    def test_round_trip_continues_identically(self):
+        world = GameWorld(seed=11)
+        _play(world, 1200)
+        data = savestate.dumps(world)
+        saved = world_digest(world)
+        _play(world, 1200)
+        expected = world_digest(world)
+
+        restored = savestate.loads(data)
+        self.assertEqual(world_digest(restored), saved)
+        _play(restored, 1200)
+        self.assertEqual(world_digest(restored), expected)
+
+    def test_corrupt_state_leaves_the_running_world_alone(self):
+        world = GameWorld(seed=3)
+        _play(world, 300)
+        data = savestate.dumps(world)
+        store = Asteroid.store
+        for corrupt in (data[:len(data) // 2], data[:-1], data[:8] + b"\0" * 64):
+            with self.assertRaises(ValueError):
+                savestate.loads(corrupt)
+            self.assertIs(Asteroid.store, store)
+
+
+if __name__ == "__main__":
+    unittest.main()
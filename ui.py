@@ -1,69 +1,120 @@
 import pygame
+from collections import OrderedDict
 from constants import SCREEN_WIDTH, SCREEN_HEIGHT
 from weapons import WEAPON_NAMES
+from assets import AssetCache, to_display_format
 
 FONT_SIZE = 32
 FONT_COLOR = (255, 255, 255)  # White
+TEXT_CACHE_SIZE = 64  # Rendered strings kept before the least recent is dropped
 
 
 class UI:
-    def __init__(self, screen):
+    def __init__(self, screen, assets=None):
         self.screen = screen
+        self.assets = assets if assets is not None else AssetCache(persist=False)
         self.font = pygame.font.Font(None, FONT_SIZE)
         self.large_font = pygame.font.Font(None, 64)
+        self._font_sizes = {self.font: FONT_SIZE, self.large_font: 64}
+        self._game_over_overlay = None
+        # Rendered text surfaces keyed by (font, text, colour), in LRU order
+        self._text_cache = OrderedDict()
+        # Per-(font, colour) atlas of digit glyphs for fast-changing numbers
+        self._digit_atlases = {}
+
+    def _text(self, font, text, color):
+        """Rendered surface for text, reused while the text is unchanged"""
+        key = (font, text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = to_display_format(font.render(text, True, color), alpha=True)
+            self._text_cache[key] = surface
+            if len(self._text_cache) > TEXT_CACHE_SIZE:
+                self._text_cache.popitem(last=False)
+        else:
+            self._text_cache.move_to_end(key)
+        return surface
+
+    def _digits(self, font, color):
+        atlas = self._digit_atlases.get((font, color))
+        if atlas is None:
+            params = {"font_size": self._font_sizes[font], "color": list(color)}
+            atlas = self.assets.atlas(
+                "digits", params,
+                lambda: {digit: font.render(digit, True, color) for digit in "0123456789-"})
+            self._digit_atlases[(font, color)] = atlas
+        return atlas
+
+    def _blit_number(self, font, label, number, color, pos):
+        """Blit a cached label followed by number assembled from glyphs"""
+        x, y = pos
+        label_surface = self._text(font, label, color)
+        rect = self.screen.blit(label_surface, (x, y))
+        x += label_surface.get_width()
+        atlas = self._digits(font, color)
+        for digit in str(number):
+            glyph = atlas[digit]
+            rect.union_ip(self.screen.blit(glyph, (x, y)))
+            x += glyph.get_width()
+        return rect
 
     def draw(self, game_state, player=None):
-        """Draw all HUD elements"""
-        self._draw_score(game_state.score)
-        self._draw_combo(game_state.combo_multiplier)
-        self._draw_lives(game_state.lives)
+        """Draw all HUD elements; returns the rects drawn to"""
+        rects = [
+            self._draw_score(game_state.score),
+            self._draw_combo(game_state.combo_multiplier),
+            self._draw_lives(game_state.lives),
+        ]
         if player:
-            self._draw_weapon(player.current_weapon)
-            self._draw_bombs(player.bomb_count)
+            rects.append(self._draw_weapon(player.current_weapon))
+            rects.append(self._draw_bombs(player.bomb_count))
+        return [rect for rect in rects if rect is not None]
 
     def _draw_score(self, score):
         """Render score in top-left corner"""
-        score_text = self.font.render(f"Score: {score}", True, FONT_COLOR)
-        self.screen.blit(score_text, (10, 10))
+        return self._blit_number(self.font, "Score: ", score, FONT_COLOR, (10, 10))
 
     def _draw_combo(self, multiplier):
         """Render combo multiplier (only if > 1)"""
         if multiplier > 1:
-            combo_text = self.font.render(f"Combo: x{multiplier}", True, (255, 200, 0))
-            self.screen.blit(combo_text, (10, 45))
+            combo_text = self._text(self.font, f"Combo: x{multiplier}", (255, 200, 0))
+            return self.screen.blit(combo_text, (10, 45))
+        return None
 
     def _draw_lives(self, lives):
         """Render lives indicator in top-right corner"""
-        lives_text = self.font.render(f"Lives: {lives}", True, FONT_COLOR)
+        lives_text = self._text(self.font, f"Lives: {lives}", FONT_COLOR)
         text_rect = lives_text.get_rect()
         text_rect.topright = (SCREEN_WIDTH - 10, 10)
-        self.screen.blit(lives_text, text_rect)
+        return self.screen.blit(lives_text, text_rect)
 
     def _draw_weapon(self, weapon_type):
         """Render current weapon at bottom-left"""
         weapon_name = WEAPON_NAMES.get(weapon_type, "Unknown")
-        weapon_text = self.font.render(f"Weapon: {weapon_name} [Q]", True, (100, 200, 255))
-        self.screen.blit(weapon_text, (10, SCREEN_HEIGHT - 40))
+        weapon_text = self._text(self.font, f"Weapon: {weapon_name} [Q]", (100, 200, 255))
+        return self.screen.blit(weapon_text, (10, SCREEN_HEIGHT - 40))
 
     def _draw_bombs(self, bomb_count):
         """Render bomb count at bottom-left"""
-        bomb_text = self.font.render(f"Bombs: {bomb_count} [B]", True, (255, 165, 0))
-        self.screen.blit(bomb_text, (10, SCREEN_HEIGHT - 75))
+        bomb_text = self._text(self.font, f"Bombs: {bomb_count} [B]", (255, 165, 0))
+        return self.screen.blit(bomb_text, (10, SCREEN_HEIGHT - 75))
 
     def draw_game_over(self, final_score):
         """Render game over screen"""
-        # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(180)
-        self.screen.blit(overlay, (0, 0))
+        # Semi-transparent overlay, built once in display format
+        if self._game_over_overlay is None:
+            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            overlay.fill((0, 0, 0))
+            self._game_over_overlay = to_display_format(overlay)
+            self._game_over_overlay.set_alpha(180)
+        self.screen.blit(self._game_over_overlay, (0, 0))
 
         # Game Over text
-        game_over_text = self.large_font.render("GAME OVER", True, (255, 0, 0))
+        game_over_text = self._text(self.large_font, "GAME OVER", (255, 0, 0))
         text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 40))
         self.screen.blit(game_over_text, text_rect)
 
         # Final score
-        score_text = self.font.render(f"Final Score: {final_score}", True, FONT_COLOR)
+        score_text = self._text(self.font, f"Final Score: {final_score}", FONT_COLOR)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 20))
         self.screen.blit(score_text, score_rect)
@@ -0,0 +1,414 @@
+import numpy as np
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, FIXED_TIMESTEP, PLAYER_RADIUS,
+                       PLAYER_TURN_SPEED, PLAYER_ACCELERATION, PLAYER_MAX_SPEED,
+                       PLAYER_FRICTION, ASTEROID_MIN_RADIUS, ASTEROID_KINDS,
+                       ASTEROID_MAX_RADIUS, ASTEROID_SPAWN_RATE_SECONDS,
+                       ASTEROID_SPLIT_ANGLE_MIN, ASTEROID_SPLIT_ANGLE_MAX,
+                       ASTEROID_SPLIT_SPEEDUP, SCORE_LARGE, COMBO_TIMEOUT, COMBO_MAX, STARTING_LIVES,
+                       RESPAWN_INVINCIBILITY)
+from asteroid_store import wrap_positions
+from asteroidfield import AsteroidField
+from collision import circles_intersect_triangle, swept_circles_toi
+from controls import Controls
+from game_state import score_bands
+from weapons import WeaponType, WEAPON_CONFIGS
+from rng import numpy_stream
+
+__all__ = ["VectorEnv", "OBS_PLAYER_FEATURES", "OBS_ASTEROID_FEATURES"]
+
+# Per-env observation: player features, then the nearest asteroids
+OBS_PLAYER_FEATURES = ("x", "y", "vx", "vy", "sin_rotation", "cos_rotation",
+                       "can_fire", "invincible")
+OBS_ASTEROID_FEATURES = ("present", "dx", "dy", "vx", "vy", "radius")
+_ACTION_BITS = {name: 1 << i for i, name in enumerate(Controls.BITS)}
+# Player.triangle's rear corners are the furthest points from the ship's centre
+SHIP_BOUNDING_RADIUS = PLAYER_RADIUS * np.hypot(1, 1 / 1.5)
+
+
+def _forward(rotation):
+    """pygame.Vector2(0, 1).rotate(rotation) for an array of angles"""
+    radians = np.radians(rotation)
+    return np.stack((-np.sin(radians), np.cos(radians)), axis=-1)
+
+
+def _rotate(vectors, degrees):
+    """pygame.Vector2.rotate for arrays of vectors (..., 2) and angles (...)"""
+    radians = np.radians(degrees)
+    cos, sin = np.cos(radians), np.sin(radians)
+    x, y = vectors[..., 0], vectors[..., 1]
+    return np.stack((x * cos - y * sin, x * sin + y * cos), axis=-1)
+
+
+def _clamp_speed(velocity, max_speed):
+    speed = np.sqrt((velocity ** 2).sum(axis=-1))
+    over = speed > max_speed
+    velocity[over] *= (max_speed / speed[over])[:, None]
+
+
+def _first_free(alive):
+    """Index of the first free slot per row, and whether one exists"""
+    free = ~alive
+    return free.argmax(axis=1), free.any(axis=1)
+
+
+class VectorEnv:
+    """N independent games stepped in lockstep on batched arrays.
+
+    Gym-style API: reset() returns (observations, info) and step(actions)
+    returns (observations, rewards, terminated, truncated, info), all as
+    arrays with one row per env. Actions are Controls bit masks (see
+    Controls.to_bits); thrust, reverse, turning and fire are honoured.
+
+    The rules follow GameWorld.step for the ship, asteroids, shots and
+    scoring: Player.update/thrust, AsteroidField spawning (without its
+    population budget), Asteroid.split, GameState.add_score/increment_combo,
+    and the batched triangle test and swept shot hits from collision.py.
+    Only the standard weapon exists; power-ups, bombs and the laser are not
+    simulated. Each env holds up to max_asteroids asteroids and max_shots
+    shots; spawns beyond that are dropped.
+
+    Finished envs are reset automatically at the end of step(); info holds
+    their final score, lives and asteroids destroyed from before the reset.
+    """
+
+    def __init__(self, num_envs, max_asteroids=64, max_shots=16, nearest_asteroids=8,
+                 dt=FIXED_TIMESTEP, max_steps=None, seed=None):
+        self.num_envs = num_envs
+        self.max_asteroids = max_asteroids
+        self.max_shots = max_shots
+        self.nearest_asteroids = nearest_asteroids
+        self.dt = dt
+        self.max_steps = max_steps
+        self.weapon = WEAPON_CONFIGS[WeaponType.STANDARD]
+        self.rng = np.random.default_rng(seed) if seed is not None else numpy_stream("vector_env")
+        self.observation_size = (len(OBS_PLAYER_FEATURES)
+                                 + nearest_asteroids * len(OBS_ASTEROID_FEATURES))
+        # Spawns and shots lost to full slot arrays
+        self.dropped_asteroids = 0
+        self.dropped_shots = 0
+
+        n, a, s = num_envs, max_asteroids, max_shots
+        self.player_positions = np.zeros((n, 2))
+        self.player_velocities = np.zeros((n, 2))
+        self.player_rotations = np.zeros(n)
+        self.shot_cooldowns = np.zeros(n)
+        self.invincible = np.zeros(n, dtype=bool)
+        self.invincibility_timers = np.zeros(n)
+
+        self.asteroid_positions = np.zeros((n, a, 2))
+        self.asteroid_previous_positions = np.zeros((n, a, 2))
+        self.asteroid_velocities = np.zeros((n, a, 2))
+        self.asteroid_radii = np.zeros((n, a))
+        self.asteroid_alive = np.zeros((n, a), dtype=bool)
+
+        self.shot_positions = np.zeros((n, s, 2))
+        self.shot_previous_positions = np.zeros((n, s, 2))
+        self.shot_velocities = np.zeros((n, s, 2))
+        self.shot_alive = np.zeros((n, s), dtype=bool)
+
+        self.scores = np.zeros(n, dtype=np.int64)
+        self.lives = np.zeros(n, dtype=np.int64)
+        self.combos = np.zeros(n, dtype=np.int64)
+        self.combo_timers = np.zeros(n)
+        self.spawn_timers = np.zeros(n)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.asteroids_destroyed = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+
+    def reset(self):
+        self._reset(np.ones(self.num_envs, dtype=bool))
+        return self.observations(), {}
+
+    def _reset(self, mask):
+        """Put the envs in mask back to a new game, like GameWorld()"""
+        self.player_positions[mask] = (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        self.player_velocities[mask] = 0
+        self.player_rotations[mask] = 0
+        self.shot_cooldowns[mask] = 0
+        self.invincible[mask] = False
+        self.invincibility_timers[mask] = 0
+        self.asteroid_alive[mask] = False
+        self.shot_alive[mask] = False
+        self.scores[mask] = 0
+        self.lives[mask] = STARTING_LIVES
+        self.combos[mask] = 1
+        self.combo_timers[mask] = 0
+        self.spawn_timers[mask] = 0
+        self.steps[mask] = 0
+        self.asteroids_destroyed[mask] = 0
+        self.game_over[mask] = False
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int64)
+        dt = self.dt
+        previous_scores = self.scores.copy()
+        self.steps += 1
+
+        # GameState.update: combo timer
+        timing = self.combo_timers > 0
+        self.combo_timers[timing] -= dt
+        expired = timing & (self.combo_timers <= 0)
+        self.combos[expired] = 1
+        self.combo_timers[expired] = 0
+
+        self._update_shots(dt)
+        self._update_asteroids(dt)
+        self._spawn_asteroids(dt)
+        self._update_players(actions, dt)
+        self._collide_players()
+        self._collide_shots()
+        self._cull_shots()
+
+        rewards = (self.scores - previous_scores).astype(np.float32)
+        terminated = self.game_over.copy()
+        if self.max_steps is not None:
+            truncated = ~terminated & (self.steps >= self.max_steps)
+        else:
+            truncated = np.zeros(self.num_envs, dtype=bool)
+        info = {
+            "scores": self.scores.copy(),
+            "lives": self.lives.copy(),
+            "asteroids_destroyed": self.asteroids_destroyed.copy(),
+        }
+        finished = terminated | truncated
+        if finished.any():
+            self._reset(finished)
+        return self.observations(), rewards, terminated, truncated, info
+
+    def _update_shots(self, dt):
+        """ShotStore.update"""
+        self.shot_previous_positions[:] = self.shot_positions
+        self.shot_positions += self.shot_velocities * dt
+
+    def _cull_shots(self):
+        """ShotStore.cull: remove shots that left the screen"""
+        r = self.weapon.shot_radius
+        x, y = self.shot_positions[..., 0], self.shot_positions[..., 1]
+        offscreen = (x < -r) | (x > SCREEN_WIDTH + r) | (y < -r) | (y > SCREEN_HEIGHT + r)
+        self.shot_alive &= ~offscreen
+
+    def _update_asteroids(self, dt):
+        """AsteroidStore.update; wrapped asteroids have no sweep this step"""
+        self.asteroid_previous_positions[:] = self.asteroid_positions
+        self.asteroid_positions += self.asteroid_velocities * dt
+        wrapped = wrap_positions(self.asteroid_positions, self.asteroid_radii)
+        self.asteroid_previous_positions[wrapped] = self.asteroid_positions[wrapped]
+
+    def _spawn_asteroids(self, dt):
+        """AsteroidField.update, for every env whose spawn timer ran out"""
+        self.spawn_timers += dt
+        spawning = np.flatnonzero(self.spawn_timers > ASTEROID_SPAWN_RATE_SECONDS)
+        if not len(spawning):
+            return
+        self.spawn_timers[spawning] = 0
+        count = len(spawning)
+        edges = self.rng.integers(len(AsteroidField.edges), size=count)
+        speeds = self.rng.integers(40, 101, size=count)
+        angles = self.rng.integers(-30, 31, size=count)
+        offsets = self.rng.uniform(0, 1, size=count)
+        kinds = self.rng.integers(1, ASTEROID_KINDS + 1, size=count)
+
+        slots, has_free = _first_free(self.asteroid_alive[spawning])
+        self.dropped_asteroids += int((~has_free).sum())
+        for env, slot, free, edge, speed, angle, offset, kind in zip(
+                spawning, slots, has_free, edges, speeds, angles, offsets, kinds):
+            if not free:
+                continue
+            direction, place = AsteroidField.edges[edge]
+            position = place(offset)
+            velocity = (direction * int(speed)).rotate(int(angle))
+            self.asteroid_positions[env, slot] = (position.x, position.y)
+            self.asteroid_previous_positions[env, slot] = (position.x, position.y)
+            self.asteroid_velocities[env, slot] = (velocity.x, velocity.y)
+            self.asteroid_radii[env, slot] = ASTEROID_MIN_RADIUS * kind
+            self.asteroid_alive[env, slot] = True
+
+    def _update_players(self, actions, dt):
+        """Player.update with Player.thrust and Player.shoot"""
+        def held(name):
+            return (actions & _ACTION_BITS[name]) != 0
+
+        self.shot_cooldowns -= dt
+        timing = self.invincible
+        self.invincibility_timers[timing] -= dt
+        self.invincible &= ~(timing & (self.invincibility_timers <= 0))
+
+        turn = PLAYER_TURN_SPEED * dt
+        rotations = self.player_rotations
+        rotations[held("turn_left")] -= turn
+        rotations[held("turn_right")] += turn
+
+        velocities = self.player_velocities
+        forward = _forward(rotations)
+        for name, sign in (("thrust", 1), ("reverse", -1)):
+            pushing = held(name)
+            if pushing.any():
+                pushed = velocities[pushing] + forward[pushing] * PLAYER_ACCELERATION * sign * dt
+                _clamp_speed(pushed, PLAYER_MAX_SPEED)
+                velocities[pushing] = pushed
+
+        firing = held("fire")
+        shooting = np.flatnonzero(firing & (self.shot_cooldowns <= 0))
+        if len(shooting):
+            self.shot_cooldowns[shooting] = self.weapon.cooldown
+            slots, has_free = _first_free(self.shot_alive[shooting])
+            self.dropped_shots += int((~has_free).sum())
+            envs, slots = shooting[has_free], slots[has_free]
+            self.shot_positions[envs, slots] = self.player_positions[envs]
+            self.shot_previous_positions[envs, slots] = self.player_positions[envs]
+            self.shot_velocities[envs, slots] = forward[envs] * self.weapon.shot_speed
+            self.shot_alive[envs, slots] = True
+
+        # Like Player.update, a ship that fires skips friction and movement
+        moving = ~firing
+        velocities[moving] *= PLAYER_FRICTION
+        self.player_positions[moving] += velocities[moving] * dt
+        wrap_positions(self.player_positions, np.full(self.num_envs, float(PLAYER_RADIUS)))
+
+    def ship_triangles(self):
+        """Player.triangle for every env, as (N, 3, 2)"""
+        forward = _forward(self.player_rotations) * PLAYER_RADIUS
+        right = _forward(self.player_rotations + 90) * PLAYER_RADIUS / 1.5
+        position = self.player_positions
+        return np.stack((position + forward,
+                         position - forward - right,
+                         position - forward + right), axis=1)
+
+    def _collide_players(self):
+        """Ship-asteroid hits: lose a life and respawn, or end the game"""
+        # Only asteroids within the ship's bounding circle get the exact test
+        reach = SHIP_BOUNDING_RADIUS + self.asteroid_radii
+        offset = self.asteroid_positions - self.player_positions[:, None, :]
+        near = self.asteroid_alive & ((offset ** 2).sum(axis=-1) < reach * reach)
+        near &= ~self.invincible[:, None]
+        envs, slots = np.nonzero(near)
+        if not len(envs):
+            return
+        hits = circles_intersect_triangle(self.asteroid_positions[envs, slots],
+                                          self.asteroid_radii[envs, slots],
+                                          self.ship_triangles()[envs])
+        hit = np.unique(envs[hits])
+        if not len(hit):
+            return
+        self.lives[hit] -= 1
+        self.combos[hit] = 1
+        self.combo_timers[hit] = 0
+        self.game_over[hit] = self.lives[hit] <= 0
+        respawn = hit[~self.game_over[hit]]
+        self.player_positions[respawn] = (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        self.player_velocities[respawn] = 0
+        self.player_rotations[respawn] = 0
+        self.invincible[respawn] = True
+        self.invincibility_timers[respawn] = RESPAWN_INVINCIBILITY
+
+    def _collide_shots(self):
+        """Each shot destroys the first asteroid it touches during the step,
+        by swept time of impact as in GameWorld._shot_contacts. Fragments
+        from this phase cannot be hit until the next step, as in GameWorld."""
+        envs, shots = np.nonzero(self.shot_alive & ~self.game_over[:, None])
+        if not len(envs):
+            return
+        starts = (self.shot_previous_positions[envs, shots][:, None, :]
+                  - self.asteroid_previous_positions[envs])
+        ends = self.shot_positions[envs, shots][:, None, :] - self.asteroid_positions[envs]
+        tois = swept_circles_toi(starts, ends, self.weapon.shot_radius + self.asteroid_radii[envs])
+        overlap = self.asteroid_alive[envs] & ~np.isnan(tois)
+        touching = overlap.any(axis=1)
+        envs, shots = envs[touching], shots[touching]
+        overlap, tois = overlap[touching], tois[touching]
+        if not len(envs):
+            return
+        hittable = self.asteroid_alive.copy()
+        bands = score_bands()
+
+        # Shots resolve in slot order, so two shots on one asteroid only
+        # destroy it once; pairs within one pass are in distinct envs
+        for shot in np.unique(shots):
+            pairs = shots == shot
+            pair_envs = envs[pairs]
+            candidates = overlap[pairs] & hittable[pair_envs]
+            hitting = candidates.any(axis=1)
+            pair_envs = pair_envs[hitting]
+            if not len(pair_envs):
+                continue
+            # Earliest impact first; ties go to the lower slot
+            slots = np.where(candidates[hitting], tois[pairs][hitting], np.inf).argmin(axis=1)
+            self.shot_alive[pair_envs, shot] = False
+            hittable[pair_envs, slots] = False
+            self.asteroids_destroyed[pair_envs] += 1
+
+            # GameState.add_score, then increment_combo
+            radii = self.asteroid_radii[pair_envs, slots]
+            points = np.select([radii <= max_radius for max_radius, _ in bands],
+                               [points for _, points in bands], SCORE_LARGE)
+            self.scores[pair_envs] += points * self.combos[pair_envs]
+            self.combo_timers[pair_envs] = COMBO_TIMEOUT
+            self.combos[pair_envs] = np.minimum(self.combos[pair_envs] + 1, COMBO_MAX)
+
+            self._split(pair_envs, slots, radii)
+
+    def _split(self, envs, slots, radii):
+        """Asteroid.split: the first fragment reuses the parent's slot"""
+        splitting = radii > ASTEROID_MIN_RADIUS
+        self.asteroid_alive[envs[~splitting], slots[~splitting]] = False
+        envs, slots = envs[splitting], slots[splitting]
+        if not len(envs):
+            return
+        new_radii = radii[splitting] / 2
+        count = len(envs)
+        offsets = self.rng.uniform(-1, 1, size=(count, 2)) * new_radii[:, None]
+        turns = self.rng.uniform(ASTEROID_SPLIT_ANGLE_MIN, ASTEROID_SPLIT_ANGLE_MAX, size=(2, count))
+        positions = self.asteroid_positions[envs, slots]
+        velocities = self.asteroid_velocities[envs, slots]
+
+        free_slots, has_free = _first_free(self.asteroid_alive[envs])
+        self.dropped_asteroids += int((~has_free).sum())
+        second_envs, second_slots = envs[has_free], free_slots[has_free]
+        self.asteroid_positions[second_envs, second_slots] = (positions - offsets)[has_free]
+        self.asteroid_velocities[second_envs, second_slots] = (
+            _rotate(velocities, -turns[1]) * ASTEROID_SPLIT_SPEEDUP)[has_free]
+        self.asteroid_radii[second_envs, second_slots] = new_radii[has_free]
+        self.asteroid_alive[second_envs, second_slots] = True
+
+        self.asteroid_positions[envs, slots] = positions + offsets
+        self.asteroid_velocities[envs, slots] = _rotate(velocities, turns[0]) * ASTEROID_SPLIT_SPEEDUP
+        self.asteroid_radii[envs, slots] = new_radii
+
+    def observations(self):
+        """(N, observation_size) float32; asteroid features are relative to
+        the ship and nearest first, with absent slots zeroed"""
+        n, k = self.num_envs, self.nearest_asteroids
+        player = np.empty((n, len(OBS_PLAYER_FEATURES)), dtype=np.float32)
+        player[:, 0] = self.player_positions[:, 0] / SCREEN_WIDTH
+        player[:, 1] = self.player_positions[:, 1] / SCREEN_HEIGHT
+        player[:, 2:4] = self.player_velocities / PLAYER_MAX_SPEED
+        radians = np.radians(self.player_rotations)
+        player[:, 4] = np.sin(radians)
+        player[:, 5] = np.cos(radians)
+        player[:, 6] = self.shot_cooldowns <= 0
+        player[:, 7] = self.invincible
+
+        relative = self.asteroid_positions - self.player_positions[:, None, :]
+        distances = np.where(self.asteroid_alive, (relative ** 2).sum(axis=-1), np.inf)
+        if k < self.max_asteroids:
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        else:
+            nearest = np.broadcast_to(np.arange(self.max_asteroids), (n, self.max_asteroids))
+        order = np.argsort(np.take_along_axis(distances, nearest, axis=1), axis=1)
+        nearest = np.take_along_axis(nearest, order, axis=1)
+
+        asteroids = np.zeros((n, k, len(OBS_ASTEROID_FEATURES)), dtype=np.float32)
+        width = nearest.shape[1]
+        asteroids[:, :width, 0] = np.take_along_axis(self.asteroid_alive, nearest, axis=1)
+        asteroids[:, :width, 1] = np.take_along_axis(relative[..., 0], nearest, axis=1) / SCREEN_WIDTH
+        asteroids[:, :width, 2] = np.take_along_axis(relative[..., 1], nearest, axis=1) / SCREEN_HEIGHT
+        asteroids[:, :width, 3] = np.take_along_axis(self.asteroid_velocities[..., 0], nearest, axis=1) / PLAYER_MAX_SPEED
+        asteroids[:, :width, 4] = np.take_along_axis(self.asteroid_velocities[..., 1], nearest, axis=1) / PLAYER_MAX_SPEED
+        asteroids[:, :width, 5] = np.take_along_axis(self.asteroid_radii, nearest, axis=1) / ASTEROID_MAX_RADIUS
+        asteroids[:, :, 1:] *= asteroids[:, :, :1]
+        return np.concatenate((player, asteroids.reshape(n, -1)), axis=1)
+
+    @staticmethod
+    def actions_from_controls(controls):
+        """Action array for a list of Controls, one per env"""
+        return np.array([c.to_bits() for c in controls], dtype=np.int64)